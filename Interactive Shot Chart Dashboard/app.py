@@ -1,27 +1,188 @@
 import streamlit as st
 import pandas as pd
-from nba_api.stats.static import players
+from nba_api.stats.static import players, teams
 from nba_api.stats.endpoints import shotchartdetail, commonplayerinfo
 import plotly.graph_objects as go
 import numpy as np
-from cache_utils import get_player_headshot_url, get_player_list, get_player_position, get_shot_data, get_career_stats, get_zone_efficiency_cached, get_player_game_log
+from cache_utils import get_player_headshot_url, get_player_list, search_players, get_zone_efficiency_cached, get_scouting_report_cached, get_form_cached, get_shot_bins_cached, get_shot_filter_index, get_zone_matrix_cached, get_team_shot_data, get_team_aggregate_cached, get_league_baseline, get_career_stats, season_range, latest_played_season, FIRST_SHOT_SEASON
+from data_loader import load_player_data, load_players_shots
+from comparison import MIN_COMPARE_PLAYERS, MAX_COMPARE_PLAYERS
+from form import STREAK_Z
+from team_aggregate import TeamAggregate
+from instrumentation import start_trace, finish_trace, stage, render_debug_panel
 
 
 # Functions and Team Logo/Colors
-from shot_chart_utils import draw_half_court, calculate_zone_efficiency 
+from shot_chart_utils import draw_half_court, calculate_zone_efficiency, add_shot_layer, add_hexbin_layer
 from team_logos import get_team_logo_url, get_team_colors 
+from shot_filters import ShotFilter, CLOCK_MINUTES, VENUES
 
 
 # --- 1. CONFIGURATION---
 
 st.set_page_config(layout="wide", page_title="NBA Shot Chart Dashboard")
 
+# Per-rerun timings/cache results (debug panel at the bottom of the sidebar, $NBA_TRACE_LOG)
+trace = start_trace()
+
+def end_rerun():
+    # Closes this rerun's trace and shows it when the debug panel is on
+    finish_trace(trace)
+    if st.sidebar.toggle('Debug panel', help="Stage timings, cache hits and API calls for this rerun"):
+        render_debug_panel(trace)
+
+# Small-multiple court height in comparison mode
+COMPARE_CHART_HEIGHT = 420
+
 # --- 2. SIDEBAR FOR FILTERS ---
 
 st.sidebar.title("🏀 Player & Season Selection")
 
 player_names = get_player_list()
 
+view_mode = st.sidebar.radio('View:', ['Single Player', 'Compare Players', 'Team'], horizontal=True)
+
+# --- COMPARISON MODE (2-6 players, one season) ---
+if view_mode == 'Compare Players':
+    compare_names = st.sidebar.multiselect(
+        f'Players ({MIN_COMPARE_PLAYERS}-{MAX_COMPARE_PLAYERS}):',
+        player_names,
+        max_selections=MAX_COMPARE_PLAYERS
+    )
+    compare_seasons = season_range()
+    compare_season = st.sidebar.selectbox('Season:', compare_seasons, index=compare_seasons.index(latest_played_season()),
+                                          key='compare_season')
+    trace.label = f"compare: {', '.join(compare_names)} | {compare_season}"
+
+    st.title(f"Player Comparison: {compare_season}")
+
+    if len(compare_names) < MIN_COMPARE_PLAYERS:
+        st.info(f"Select at least {MIN_COMPARE_PLAYERS} players in the sidebar to compare.")
+    else:
+        # One fetch per player, concurrently, through the same caches as the single-player view
+        with stage('load_players_shots'), st.spinner("Fetching shot data from NBA API..."):
+            compare_frames, compare_errors = load_players_shots(compare_names, compare_season)
+        for name, error in compare_errors.items():
+            st.warning(f"Could not load {name}: {error}")
+
+        # Small multiples: every court is a copy of the one cached template at this height
+        per_row = 3
+        for start in range(0, len(compare_names), per_row):
+            for col, name in zip(st.columns(per_row), compare_names[start:start + per_row]):
+                with col:
+                    df_player = compare_frames[name]
+                    if df_player.empty:
+                        st.warning(f"No {compare_season} shots for {name}.")
+                        continue
+                    fig = draw_half_court(title=f"{name} ({len(df_player):,} FGA)", height=COMPARE_CHART_HEIGHT)
+                    add_shot_layer(fig, df_player)
+                    with stage('render:plotly_chart', traces=len(fig.data)):
+                        st.plotly_chart(fig, width='stretch', key=f'compare_chart_{name}')
+
+        st.header("Zone Efficiency Comparison")
+        matrix = get_zone_matrix_cached(compare_frames)
+        if not matrix.players:
+            st.warning("No shot data available for the selected players.")
+        else:
+            st.caption(f"Δ = FG% minus {matrix.players[0]}'s FG% in the same zone (percentage points).")
+            column_config = {}
+            for j, name in enumerate(matrix.players):
+                column_config[f'{name} FG%'] = st.column_config.NumberColumn(f'{name} FG%', format="%.1f%%")
+                if j:
+                    column_config[f'{name} Δ'] = st.column_config.NumberColumn(f'{name} Δ', format="%+.1f")
+            st.dataframe(matrix.to_frame(), width='stretch', hide_index=True, column_config=column_config)
+
+    end_rerun()
+    st.stop()
+
+# --- TEAM MODE (whole team season, streamed in monthly chunks) ---
+if view_mode == 'Team':
+    team_list = sorted(teams.get_teams(), key=lambda t: t['full_name'])
+    team_names = [t['full_name'] for t in team_list]
+    team_name = st.sidebar.selectbox('Team:', team_names,
+                                     index=team_names.index('Denver Nuggets') if 'Denver Nuggets' in team_names else 0)
+    team_id = team_list[team_names.index(team_name)]['id']
+    team_seasons = season_range()
+    team_season = st.sidebar.selectbox('Season:', team_seasons, index=team_seasons.index(latest_played_season()),
+                                       key='team_season')
+    trace.label = f"team: {team_name} | {team_season}"
+
+    st.title(f"{team_name}: {team_season} Shot Profile")
+
+    # Counts are folded in per chunk, so the progress bar reflects work already done
+    streamed = TeamAggregate()
+    progress = st.empty()
+
+    def on_chunk(chunk, done, total):
+        streamed.add(chunk)
+        progress.progress(done / total, text=f"Loading shots: {streamed.rows:,} so far ({done}/{total} months)")
+
+    with stage('load_team_shots'):
+        df_team = get_team_shot_data(team_id, team_season, on_chunk=on_chunk)
+    progress.empty()
+
+    if df_team.empty:
+        st.warning(f"No shot data found for {team_name} in {team_season}.")
+    else:
+        with stage('team_aggregate'):
+            team_agg = get_team_aggregate_cached(df_team, streamed=streamed)
+        player_table = team_agg.player_frame()
+
+        # Any group of players (a lineup, the starters, the bench) sums their columns
+        group = st.sidebar.multiselect('Players (empty = whole team):', list(player_table['PLAYER_NAME']))
+        group_ids = [int(pid) for pid, name in zip(player_table['PLAYER_ID'], player_table['PLAYER_NAME'])
+                     if name in group] or None
+        group_label = ', '.join(group) if group else team_name
+
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Shots", f"{team_agg.rows:,}")
+        c2.metric("Games", f"{len(team_agg.games):,}")
+        c3.metric("Players", f"{len(team_agg.player_ids):,}")
+        c4.metric("Team FG%", f"{player_table['FGM'].sum() / max(player_table['FGA'].sum(), 1):.1%}")
+
+        col_chart, col_zones = st.columns([3, 2])
+        with col_chart:
+            color_by = st.radio('Color by:', ['FG%', 'Points per Shot'], horizontal=True, key='team_color')
+            fig = draw_half_court(title=f"{group_label} ({team_season})")
+            add_hexbin_layer(fig, team_agg.bins(group_ids), color_by='pps' if color_by == 'Points per Shot' else 'fg_pct')
+            with stage('render:plotly_chart', traces=len(fig.data)):
+                st.plotly_chart(fig, width='stretch')
+        with col_zones:
+            st.subheader("Zone Efficiency")
+            st.dataframe(team_agg.zone_frame(group_ids), width='stretch', hide_index=True, column_config={
+                'FG_PCT': st.column_config.NumberColumn('FG%', format="%.3f"),
+            })
+
+        st.header("Player Breakdown")
+        st.dataframe(player_table.drop(columns=['PLAYER_ID']), width='stretch', hide_index=True, column_config={
+            'FG_PCT': st.column_config.NumberColumn('FG%', format="%.3f"),
+            '3P_PCT': st.column_config.NumberColumn('3P%', format="%.3f"),
+            'PPS': st.column_config.NumberColumn('PPS', format="%.2f"),
+            'SHARE': st.column_config.ProgressColumn('Share of FGA', format="%.2f", min_value=0, max_value=1),
+        })
+
+        st.header("Zone Efficiency by Player")
+        matrix = team_agg.zone_matrix(group_ids)
+        st.caption(f"Δ = FG% minus {matrix.players[0]}'s FG% in the same zone (percentage points).")
+        column_config = {}
+        for j, name in enumerate(matrix.players):
+            column_config[f'{name} FG%'] = st.column_config.NumberColumn(f'{name} FG%', format="%.1f%%")
+            if j:
+                column_config[f'{name} Δ'] = st.column_config.NumberColumn(f'{name} Δ', format="%+.1f")
+        st.dataframe(matrix.to_frame(), width='stretch', hide_index=True, column_config=column_config)
+
+    end_rerun()
+    st.stop()
+
+# Narrow the dropdown by first/last name prefix (accent-insensitive)
+player_query = st.sidebar.text_input('Search Player:', placeholder='e.g. jokic, luka, sga')
+if player_query:
+    matches = search_players(player_query)
+    if matches:
+        player_names = matches
+    else:
+        st.sidebar.caption(f"No active players match '{player_query}'.")
+
 selected_player = st.sidebar.selectbox(
     'Select Player:',
     player_names,
@@ -29,21 +190,91 @@ selected_player = st.sidebar.selectbox(
     index=player_names.index('Alex Sarr') if 'Alex Sarr' in player_names else 0 
 )
 
-selected_season = st.sidebar.selectbox(
-    'Select Season:',
-    ['2025-26', '2024-25', '2023-24', '2022-23', '2021-22', '2020-21', '2019-20'],
-    index=0
+season_mode = st.sidebar.radio(
+    'Season Mode:',
+    ['Single Season', 'Season Range', 'All Seasons'],
+    horizontal=True
 )
 
+available_seasons = season_range()  # most recent first
+# The current season is listed but not the default until its games have started
+default_season = available_seasons.index(latest_played_season())
+
+if season_mode == 'Single Season':
+    selected_seasons = [st.sidebar.selectbox(
+        'Select Season:',
+        available_seasons,
+        index=default_season
+    )]
+elif season_mode == 'Season Range':
+    oldest, newest = st.sidebar.select_slider(
+        'Select Seasons:',
+        options=available_seasons[::-1],
+        value=(available_seasons[default_season + 6], available_seasons[default_season])
+    )
+    selected_seasons = season_range(first=oldest, last=newest)
+else:
+    # Every season of the player's career that has shot tracking
+    with st.spinner("Fetching career stats..."):
+        career_seasons = get_career_stats(selected_player)
+    selected_seasons = sorted(
+        {s for s in career_seasons.get('SEASON_ID', []) if s >= FIRST_SHOT_SEASON},
+        reverse=True
+    ) or available_seasons[:1]
+
+# Label used in headers and as the cache key for derived results
+if len(selected_seasons) == 1:
+    selected_season = selected_seasons[0]
+else:
+    selected_season = f"{selected_seasons[-1]} to {selected_seasons[0]}"
+
+
+trace.label = f"{selected_player} | {selected_season}"
+
+# Fetch the data based on selection (upstream calls run concurrently, one per season).
+# st.spinner only appears after half a second, so cache hits don't flash it.
+with stage('load_player_data'), st.spinner("Fetching shot data from NBA API..."):
+    player_data = load_player_data(selected_player, selected_seasons)
 
-# Fetch the data based on selection
-df_shots, team_id = get_shot_data(selected_player, selected_season)
+df_shots, team_id = player_data.shots, player_data.team_id
 
-df_career_totals = get_career_stats(selected_player)
+df_career_totals = player_data.career
 
-player_position = get_player_position(selected_player) 
+player_position = player_data.position
 
-game_log = get_player_game_log(selected_player, selected_season)
+game_log = player_data.game_log
+
+# --- SHOT FILTERS (shot chart + efficiency table) ---
+# Widgets only build a ShotFilter; matching rows come from the cached bitset index
+df_filtered = df_shots
+if df_shots is not None and not df_shots.empty:
+    filter_index = get_shot_filter_index(df_shots)
+    first_date, last_date = filter_index.first_date, filter_index.last_date
+
+    with st.sidebar.expander("🎯 Shot Filters"):
+        periods = st.multiselect('Period:', filter_index.options('period'))
+        minutes = st.slider('Minutes left in period:', 0, CLOCK_MINUTES - 1, (0, CLOCK_MINUTES - 1),
+                            help="Whole minutes on the clock (MINUTES_REMAINING): 0 is the last minute, both ends included")
+        action_types = st.multiselect('Action Type:', filter_index.options('action_type'))
+        distance_bands = st.multiselect('Shot Distance:', filter_index.options('distance_band'))
+        venue = st.radio('Venue:', ['All'] + VENUES, horizontal=True)
+        opponents = st.multiselect('Opponent:', filter_index.options('opponent'))
+        dates = st.date_input('Game Dates:', value=(first_date, last_date), min_value=first_date, max_value=last_date)
+
+    shot_filter = ShotFilter(
+        periods=tuple(periods),
+        minutes_remaining=None if tuple(minutes) == (0, CLOCK_MINUTES - 1) else tuple(minutes),
+        action_types=tuple(action_types),
+        distance_bands=tuple(distance_bands),
+        venue=None if venue == 'All' else venue,
+        opponents=tuple(opponents),
+        # A half-picked range (one date) leaves dates unfiltered until the second click
+        date_range=tuple(dates) if len(dates) == 2 and tuple(dates) != (first_date, last_date) else None,
+    )
+    with stage('filter_shots'):
+        df_filtered = filter_index.apply(df_shots, shot_filter)
+    if df_filtered.empty:
+        st.sidebar.warning("No shots match the shot filters.")
 
 
 
@@ -102,7 +333,7 @@ with col_title:
     # We use HTML here to force the Secondary Color ONLY for this title
     st.markdown(f"""
         <h1 style='color: {secondary_color}; margin-bottom: 0px;'>{selected_player} - {player_position}</h1>
-        <h3 style='color: {secondary_color}; margin-top: 0px;'>{selected_season} Season</h3>
+        <h3 style='color: {secondary_color}; margin-top: 0px;'>{selected_season} {'Season' if len(selected_seasons) == 1 else 'Seasons'}</h3>
     """, unsafe_allow_html=True)
 
 with col_logo:
@@ -113,8 +344,8 @@ with col_logo:
 # -----------------------------
 # --- STATS METRIC DISPLAY  ---
 if not df_career_totals.empty:
-    # Filter to get stats for the currently selected season
-    current_season_stats = df_career_totals[df_career_totals['SEASON_ID'] == selected_season]
+    # Filter to get stats for the currently selected season (most recent one in a range)
+    current_season_stats = df_career_totals[df_career_totals['SEASON_ID'] == selected_seasons[0]]
     
     if not current_season_stats.empty:
         stats = current_season_stats.iloc[0]
@@ -157,54 +388,87 @@ if not df_career_totals.empty:
 if df_shots is None or df_shots.empty:
     st.warning("No shot data available for the selected criteria.")
 else:
-    # --- TABS: CHART vs. EFFICIENCY TABLE ---
-    tab1, tab2, tab3, tab4, tab5 = st.tabs(["📋 Scouting Report", "📊 Interactive Shot Chart", "📈 Efficiency Report", "⭐ Career Averages", "📅 Regular Season Game Log"])
-
-    with tab2:
+    # League baseline lookups for player-vs-league deltas
+    league_baseline = get_league_baseline()
+    league_zone_pct = league_baseline.zone_fg_pct(selected_seasons) if league_baseline else {}
+
+    def league_delta(zone):
+        # "+4.2 vs league" for a zone row, or None without a baseline
+        league_pct = league_zone_pct.get(zone['ZONE_NAME'])
+        if league_pct is None:
+            return None
+        return f"{(zone['FG_PCT'] - league_pct) * 100:+.1f} vs league"
+
+    # --- VIEWS: only the selected one runs (st.tabs would execute all five every rerun) ---
+    # Each view's data comes from caches keyed by the player/season frame versions,
+    # so switching back to a view re-renders it without recomputing anything.
+
+    def render_shot_chart():
         st.header("Shot Location & Efficiency")
         
         # Base Court Figure
         fig = draw_half_court(title=f"Shot Chart for {selected_player}")
 
-        # Plot Shots
-        fig.add_trace(go.Scatter(
-            x=df_shots['LOC_X'], 
-            y=df_shots['LOC_Y'], 
-            mode='markers',
-            marker=dict(
-                # Green for made, Red for missed
-                color=df_shots['SHOT_RESULT'].map({'Made': 'lightgreen', 'Missed': 'red'}),
-                size=8,
-                opacity=0.7,
-                line=dict(width=1, color='rgba(0,0,0,0.5)')
-            ),
-            # Interactive hover text
-            hovertemplate=
-                '<b>Result:</b> %{customdata[0]}<br>' +
-                '<b>Type:</b> %{customdata[1]}<br>' +
-                '<b>Distance:</b> %{customdata[2]} ft<br>' +
-                '<extra></extra>', # Removes the default trace name
-            customdata=df_shots[['SHOT_RESULT', 'ACTION_TYPE', 'SHOT_DISTANCE']]
-        ))
+        # Streamlit drops a widget's state in runs that don't render it, so the choice is kept
+        # under its own key and passed back as the default when the view is shown again
+        chart_types = ['Shots', 'Hexbin (FG%)', 'Hexbin (Points per Shot)', 'Hexbin (vs League)']
+        chart_type = st.radio(
+            'Chart Type:',
+            chart_types,
+            index=chart_types.index(st.session_state.get('chart_type', chart_types[0])),
+            horizontal=True,
+            key='chart_type_widget'
+        )
+        st.session_state['chart_type'] = chart_type
+
+        if df_filtered is not df_shots:
+            st.caption(f"{len(df_filtered):,} of {len(df_shots):,} shots match the sidebar filters.")
+
+        if chart_type == 'Shots':
+            # Plot Shots (SVG, WebGL or binned density depending on volume)
+            render_mode = add_shot_layer(fig, df_filtered)
+            if render_mode != 'svg':
+                st.caption(f"{len(df_filtered):,} shots rendered in **{render_mode}** mode.")
+        else:
+            # Hexagon size = volume, color = efficiency
+            shot_bins = get_shot_bins_cached(df_filtered)
+            if chart_type == 'Hexbin (vs League)':
+                league_bins = league_baseline.bin_fg_pct(selected_seasons) if league_baseline else None
+                if league_bins is None:
+                    st.info("League baseline not built for this season yet (run `python league_baseline.py`). Showing raw FG%.")
+                add_hexbin_layer(fig, shot_bins, color_by='vs_league', league_fg_pct=league_bins)
+            else:
+                add_hexbin_layer(fig, shot_bins, color_by='pps' if 'Points' in chart_type else 'fg_pct')
         
-        # Display the figure
-        st.plotly_chart(fig, width='stretch')
+        # Display the figure (Plotly JSON serialization happens here)
+        with stage('render:plotly_chart', traces=len(fig.data)):
+            st.plotly_chart(fig, width='stretch')
         
-    with tab3:
+    def render_efficiency():
         st.header("Zone Efficiency Breakdown")
         
         # Calculate the zone stats using the utility function
-        df_efficiency = get_zone_efficiency_cached(selected_player, selected_season, df_shots)
+        df_efficiency = get_zone_efficiency_cached(df_filtered)
         
-        #Formatted column 
-        df_efficiency['FG_PCT'] = df_efficiency['FG_PCT'] * 100.0
-
+        #Formatted column (assign builds a new frame; the cached result stays untouched)
+        df_efficiency = df_efficiency.assign(FG_PCT=df_efficiency['FG_PCT'] * 100.0)
+
+        # League context from the precomputed baseline (lookup, no league re-aggregation)
+        display_columns = ['Zone Name', 'Made (FGM)', 'Attempts (FGA)', 'FG Percentage']
+        if league_zone_pct:
+            league_pct = df_efficiency['ZONE_NAME'].map(league_zone_pct) * 100.0
+            df_efficiency = df_efficiency.assign(LEAGUE_FG_PCT=league_pct, VS_LEAGUE=df_efficiency['FG_PCT'] - league_pct)
+            display_columns += ['League FG%', 'vs League']
         
         # Column Renaming for Clarity
-        df_efficiency.columns = ['Zone Name', 
-                                 'Attempts (FGA)', 
-                                 'Made (FGM)', 
-                                 'FG Percentage']
+        df_efficiency = df_efficiency.rename(columns={
+            'ZONE_NAME': 'Zone Name',
+            'FGA': 'Attempts (FGA)',
+            'FGM': 'Made (FGM)',
+            'FG_PCT': 'FG Percentage',
+            'LEAGUE_FG_PCT': 'League FG%',
+            'VS_LEAGUE': 'vs League'
+        })
 
         
 
@@ -212,10 +476,16 @@ else:
         
         # Display the efficiency table
         st.dataframe(
-        df_efficiency[['Zone Name', 'Made (FGM)', 'Attempts (FGA)', 'FG Percentage']], 
+        df_efficiency[display_columns], 
         width='stretch', 
         hide_index=True,
         column_config={
+            "League FG%": st.column_config.NumberColumn("League FG%", format="%.1f%%"),
+            "vs League": st.column_config.NumberColumn(
+                "vs League",
+                help="Player FG% minus league FG% in the same zone (percentage points)",
+                format="%+.1f"
+            ),
             
             "FG Percentage": st.column_config.ProgressColumn(
                 "FG Percentage",
@@ -229,10 +499,10 @@ else:
             )
         }
     )      
-        st.markdown(f"***\nTotal shots analyzed: **{len(df_shots)}**")
+        st.markdown(f"***\nTotal shots analyzed: **{len(df_filtered)}**")
     
 
-    with tab4:
+    def render_career():
         st.header(f"Career Regular Season Averages by Season")
         
         if df_career_totals.empty:
@@ -273,7 +543,7 @@ else:
                 hide_index=True
             )
 
-    with tab5:
+    def render_game_log():
 
 
         st.header(f"Game Log for {selected_season} Regular Season")
@@ -281,7 +551,7 @@ else:
         if game_log is None or game_log.empty:
             st.warning("Game log data is not available for this player/season.")
         else:
-            columns_to_keep = [
+            columns_to_keep = (['SEASON'] if 'SEASON' in game_log.columns else []) + [
                 'GAME_DATE', 
                 'MATCHUP', 
                 'WL', 
@@ -310,6 +580,7 @@ else:
             df_display = game_log[columns_to_keep]
 
             df_display = df_display.rename(columns={
+                'SEASON': 'Season',
                 'GAME_DATE': 'Date',
                 'WL': 'W/L',
                 'FGM': 'FG Made',
@@ -341,95 +612,15 @@ else:
                 }
             )
 
-    with tab1:
+    def render_scouting_report():
         st.header("📋 Scouting Report")
         st.markdown("*> Generated based on spatial data and game logs.*")
 
         if df_shots.empty or game_log.empty:
             st.warning("Insufficient data to generate analysis.")
         else:
-            # A. OFFENSIVE AUDIT LOGIC
-            zone_stats = df_shots.groupby(['SHOT_ZONE_BASIC', 'SHOT_ZONE_AREA']).apply(
-                lambda x: pd.Series({
-                    'FGA': len(x),
-                    'FGM': x['SHOT_MADE_FLAG'].sum(),
-                    'FG_PCT': x['SHOT_MADE_FLAG'].mean()
-                })
-            ).reset_index()
-            
-            # Create combined name like in your efficiency table
-            zone_stats['ZONE_NAME'] = zone_stats['SHOT_ZONE_BASIC'] + ' - ' + zone_stats['SHOT_ZONE_AREA']
-            
-            # Filter for zones with at least 5 attempts 
-            qualified_zones = zone_stats[zone_stats['FGA'] > 5].copy()
-            
-            if not qualified_zones.empty:
-                # Sort by FG% first (descending), then by FGA (descending) for tiebreaker
-                qualified_zones_sorted_best = qualified_zones.sort_values(
-                    by=['FG_PCT', 'FGA'], 
-                    ascending=[False, False]
-                )
-                
-                # Sort by FG% first (ascending), then by FGA (descending) for worst
-                qualified_zones_sorted_worst = qualified_zones.sort_values(
-                    by=['FG_PCT', 'FGA'], 
-                    ascending=[True, False]
-                )
-                
-                # Get top 3
-                top_3_best = qualified_zones_sorted_best.head(3)
-                top_3_worst = qualified_zones_sorted_worst.head(3)
-            else:
-                top_3_best = pd.DataFrame()
-                top_3_worst = pd.DataFrame()
-
-            # B. DEFENSIVE SCOUTING LOGIC (Left vs Right Splits)
-            # LOC_X < 0 is Left Side (Stage Left/Court Right), LOC_X > 0 is Right Side
-            left_side = df_shots[df_shots['LOC_X'] < 0].copy()
-            right_side = df_shots[df_shots['LOC_X'] > 0].copy()
-            
-            # Add minimum sample size
-            min_attempts = 10
-            if len(left_side) >= min_attempts and len(right_side) >= min_attempts:
-                left_pct = left_side['SHOT_MADE_FLAG'].mean()
-                right_pct = right_side['SHOT_MADE_FLAG'].mean()
-                
-                # Determine strong hand
-                if left_pct > (right_pct + 0.05):
-                    hand_bias = "LEFT"
-                    defensive_strategy = "FORCE RIGHT"
-                elif right_pct > (left_pct + 0.05):
-                    hand_bias = "RIGHT"
-                    defensive_strategy = "FORCE LEFT"
-                else:
-                    hand_bias = "BALANCED"
-                    defensive_strategy = "PLAY STRAIGHT UP"
-            else:
-                hand_bias = "INSUFFICIENT DATA"
-                defensive_strategy = "NEED MORE SHOT VOLUME"
-                left_pct = right_pct = 0
-            
-            # C. RELIABILITY LOGIC (Consistency)
-            if not game_log.empty and len(game_log) > 1:
-                avg_pts = game_log['PTS'].mean()
-                std_dev_pts = game_log['PTS'].std()
-                
-                # Coefficient of Variation (CV) - Lower is more consistent
-                cv = std_dev_pts / avg_pts if avg_pts > 0 else 0
-                
-                if cv < 0.2:
-                    consistency_grade = "High Reliability (Consistent)"
-                    consistency_description = "This player delivers predictable scoring output game-to-game. Defenses can't rely on off-nights, and offenses can count on steady production."
-                elif cv < 0.4:
-                    consistency_grade = "Moderate Variance (Normal)"
-                    consistency_description = "Standard NBA variability. The player has occasional hot and cold streaks, but performance stays within a reasonable range."
-                else:
-                    consistency_grade = "High Variance (Volatile)"
-                    consistency_description = "Boom-or-bust player. Expect significant swings between dominant performances and quiet nights. Game plan accordingly based on matchups and recent form."
-            else:
-                consistency_grade = "Insufficient Games Played"
-                consistency_description = "Need more game data to assess scoring consistency patterns."
-                cv = 0
+            # Zone audit, directional splits, layer PPS and consistency in one vectorized pass
+            report = get_scouting_report_cached(df_shots, game_log)
 
             # --- UI DISPLAY ---
 
@@ -438,15 +629,15 @@ else:
             
             with col1:
                 st.subheader("🚀 Offensive Optimization")
-                if not top_3_best.empty:
+                if not report.best_zones.empty:
                     st.success("**🟢 Green Light Zones** (Highest Value)")
                     st.write("Most efficient zones weighted by volume and shot value:")
                     
-                    for idx, zone in top_3_best.iterrows():
+                    for idx, zone in report.best_zones.iterrows():
                         with st.container():
                             st.markdown(f"**{zone['ZONE_NAME']}**")
                             col_a, col_b, col_c = st.columns(3)
-                            col_a.metric("FG%", f"{zone['FG_PCT']*100:.1f}%")
+                            col_a.metric("FG%", f"{zone['FG_PCT']*100:.1f}%", delta=league_delta(zone))
                             col_b.metric("Makes", f"{int(zone['FGM'])}")
                             col_c.metric("Attempts", f"{int(zone['FGA'])}")
                             st.markdown("---")
@@ -454,11 +645,11 @@ else:
                     st.error("**🔴 Red Light Zones** (Lowest Value)")
                     st.write("The player struggles here. Defenses should invite these shots:")
                     
-                    for idx, zone in top_3_worst.iterrows():
+                    for idx, zone in report.worst_zones.iterrows():
                         with st.container():
                             st.markdown(f"**{zone['ZONE_NAME']}**")
                             col_a, col_b, col_c = st.columns(3)
-                            col_a.metric("FG%", f"{zone['FG_PCT']*100:.1f}%")
+                            col_a.metric("FG%", f"{zone['FG_PCT']*100:.1f}%", delta=league_delta(zone))
                             col_b.metric("Makes", f"{int(zone['FGM'])}")
                             col_c.metric("Attempts", f"{int(zone['FGA'])}")
                             st.markdown("---")
@@ -470,16 +661,16 @@ else:
                 st.subheader("🛡️ Defensive Strategy")
                 
                 # --- 1. DIRECTIONAL BIAS ---
-                if hand_bias != "INSUFFICIENT DATA":
-                    st.info(f"**Directive:** {defensive_strategy}")
+                if report.hand_bias != "INSUFFICIENT DATA":
+                    st.info(f"**Directive:** {report.defensive_strategy}")
                     
                     st.write("### Directional Splits")
                     c1, c2 = st.columns(2)
-                    c1.metric("Left Side FG%", f"{left_pct*100:.1f}%")
-                    c2.metric("Right Side FG%", f"{right_pct*100:.1f}%")
+                    c1.metric("Left Side FG%", f"{report.left_pct*100:.1f}%")
+                    c2.metric("Right Side FG%", f"{report.right_pct*100:.1f}%")
                     
-                    if hand_bias != "BALANCED":
-                        st.caption(f"Player shoots significantly better from the **{hand_bias}** side.")
+                    if report.hand_bias != "BALANCED":
+                        st.caption(f"Player shoots significantly better from the **{report.hand_bias}** side.")
                     else:
                         st.caption("Player is ambidextrous/balanced.")
                 else:
@@ -491,47 +682,9 @@ else:
                 st.write("### 🧪 Defensive Coverage Scheme")
                 st.caption("Which defensive layer should we concede to minimize expected points?")
                 
-                # Helper function to categorize shots into defensive layers
-                def get_defensive_layer(row):
-                    zone = row['SHOT_ZONE_BASIC']
-                    if 'Restricted Area' in zone:
-                        return 'Rim (Protect)'
-                    elif 'Mid-Range' in zone or 'In The Paint (Non-RA)' in zone:
-                        return 'Mid-Range (Force)'
-                    elif 'Above the Break 3' in zone or 'Corner 3' in zone or 'Backcourt' in zone:
-                        return 'Perimeter (Chase)'
-                    return 'Other'
-                
-                # Create distinct copy for layer analysis
-                layer_df = df_shots.copy()
-                layer_df['DEF_LAYER'] = layer_df.apply(get_defensive_layer, axis=1)
-                
-                # Calculate PPS (Points Per Shot) by layer
-                def calculate_pps(group):
-                    total_points = 0
-                    for _, shot in group.iterrows():
-                        if shot['SHOT_MADE_FLAG'] == 1:
-                            # Check actual shot type for correct point value
-                            points = 3 if shot['SHOT_TYPE'] == '3PT Field Goal' else 2
-                            total_points += points
-                    return total_points / len(group) if len(group) > 0 else 0
-                
-                layer_stats = layer_df.groupby('DEF_LAYER').apply(
-                    lambda x: pd.Series({
-                        'FGA': len(x),
-                        'FG_PCT': x['SHOT_MADE_FLAG'].mean(),
-                        'PPS': calculate_pps(x)
-                    })
-                ).reset_index()
-                
-                # Filter valid layers with sufficient volume
-                layer_stats = layer_stats[layer_stats['DEF_LAYER'] != 'Other']
-                layer_stats = layer_stats[layer_stats['FGA'] > 5]
-                
-                if not layer_stats.empty:
-                    # Find lowest and highest PPS layers
-                    force_layer = layer_stats.loc[layer_stats['PPS'].idxmin()]
-                    deny_layer = layer_stats.loc[layer_stats['PPS'].idxmax()]
+                if report.force_layer is not None:
+                    force_layer = report.force_layer
+                    deny_layer = report.deny_layer
                     
                     # Display strategy
                     st.success(f"**✅ FORCE: {force_layer['DEF_LAYER']}**")
@@ -541,7 +694,7 @@ else:
                     st.write(f"Do not allow attempts here (**{deny_layer['PPS']:.2f} PPS**).")
                     
                     # Visualization
-                    st.bar_chart(layer_stats.set_index('DEF_LAYER')['PPS'])
+                    st.bar_chart(report.layer_stats.set_index('DEF_LAYER')['PPS'])
                     st.caption("Points Per Shot (PPS) by Defensive Layer")
                 else:
                     st.info("Insufficient volume to determine coverage scheme.")
@@ -550,16 +703,18 @@ else:
 
             # SECTION 3: CONSISTENCY REPORT
             st.subheader("📉 Reliability & Context")
-            st.write(f"**Grading:** {consistency_grade}")
-            st.write(f"*{consistency_description}*")
+            st.write(f"**Grading:** {report.consistency_grade}")
+            st.write(f"*{report.consistency_description}*")
             
-            if not game_log.empty and len(game_log) > 1:
+            if report.games > 1:
+                avg_pts, std_dev_pts = report.avg_pts, report.std_dev_pts
+
                 # Show key stats
                 col_stat1, col_stat2, col_stat3 = st.columns(3)
                 col_stat1.metric("Average PPG", f"{avg_pts:.1f}")
                 col_stat2.metric("Std Deviation", f"{std_dev_pts:.1f}", 
                             help="Measures game-to-game variation. Lower = more predictable scoring.")
-                col_stat3.metric("Coeff. of Variation", f"{cv:.2f}", 
+                col_stat3.metric("Coeff. of Variation", f"{report.cv:.2f}", 
                             help="Consistency metric (Std Dev ÷ Average). Under 0.2 = very consistent, over 0.4 = volatile.")
                 
                 # Add interpretive context
@@ -568,5 +723,60 @@ else:
                 # Visualization of Variance
                 st.bar_chart(game_log.set_index('GAME_DATE')[['PTS']])
                 st.caption("Game-by-Game Scoring Output showing variance.")
+
+                # Recent form: rolling windows, EWMA and streaks from the same game log
+                form = get_form_cached(game_log)
+                short, long = form.windows[0], form.windows[1]
+                last = int(form.games[0]) - 1
+                st.write("### 🔥 Recent Form")
+                col_f1, col_f2, col_f3, col_f4 = st.columns(4)
+                recent_pts = form.rolling_pts[0, 0, last]
+                col_f1.metric(f"Last {short} PPG", f"{recent_pts:.1f}" if np.isfinite(recent_pts) else "—",
+                              delta=f"{recent_pts - avg_pts:+.1f} vs avg" if np.isfinite(recent_pts) else None)
+                col_f2.metric(f"EWMA PTS ({form.spans[-1]} games)", f"{form.ewma_pts[-1, 0, last]:.1f}",
+                              help="Exponentially weighted average: recent games count the most.")
+                recent_ts = form.rolling_ts_pct[1, 0, last]
+                col_f3.metric(f"Last {long} TS%", f"{recent_ts * 100:.1f}%" if np.isfinite(recent_ts) else "—",
+                              delta=(f"{(recent_ts - form.season_ts_pct[0]) * 100:+.1f} vs season"
+                                     if np.isfinite(recent_ts) else None))
+                streak = int(form.current_streak[0])
+                col_f4.metric("Current Streak",
+                              f"{abs(streak)} {'hot' if streak > 0 else 'cold'}" if streak else "Neutral",
+                              help=f"Consecutive games scoring more than {STREAK_Z} std dev above (hot) "
+                                   f"or below (cold) the player's average.")
+                st.caption(f"Longest hot streak: **{int(form.longest_hot[0])}** games · "
+                           f"longest cold streak: **{int(form.longest_cold[0])}** games")
+
+                # Plotly rather than st.line_chart: building the Altair spec for a wide frame cost ~100 ms a rerun
+                form_frame = form.player_frame('player')
+                form_fig = go.Figure([
+                    go.Scatter(x=form_frame['GAME_DATE'], y=form_frame[column], name=label, mode=mode)
+                    for column, label, mode in [
+                        ('PTS', 'PTS', 'markers'),
+                        (f'PTS_L{short}', f'Last {short}', 'lines'),
+                        (f'PTS_L{long}', f'Last {long}', 'lines'),
+                        (f'PTS_EWMA{form.spans[-1]}', f'EWMA ({form.spans[-1]})', 'lines'),
+                    ]
+                ])
+                form_fig.update_layout(height=320, margin=dict(l=10, r=10, t=10, b=10), legend=dict(orientation='h'))
+                st.plotly_chart(form_fig, width='stretch')
+                st.caption(f"Points per game with {short}- and {long}-game rolling averages and the EWMA trend.")
             else:
-                st.info("Need multiple games to assess consistency.")
\ No newline at end of file
+                st.info("Need multiple games to assess consistency.")
+
+    # label -> (stage name, view)
+    VIEWS = {
+        "📋 Scouting Report": ('scouting_report', render_scouting_report),
+        "📊 Interactive Shot Chart": ('shot_chart', render_shot_chart),
+        "📈 Efficiency Report": ('efficiency', render_efficiency),
+        "⭐ Career Averages": ('career', render_career),
+        "📅 Regular Season Game Log": ('game_log', render_game_log),
+    }
+
+    view_label = st.radio('View:', list(VIEWS), horizontal=True, key='view', label_visibility='collapsed')
+    view_name, render_view = VIEWS[view_label]
+    trace.label += f" | {view_name}"
+    with stage(f'tab:{view_name}'):
+        render_view()
+
+end_rerun()
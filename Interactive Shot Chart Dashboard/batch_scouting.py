@@ -0,0 +1,243 @@
+"""
+Headless scouting packets: renders the dashboard's scouting report for a list
+of players (or a team's whole roster) to static HTML, plus PNG shot charts when
+kaleido is installed.
+
+Reports are built with the same pieces as the Scouting Report tab
+(cache_utils.fetch_* for the data, build_scouting_report, draw_half_court,
+calculate_zone_efficiency) and spread over a process pool, one player per
+task. With a warm local shot store a roster needs no API calls at all; warm
+it first with ingest.py. Each worker process has its own rate limiter, so the
+configured rate and burst (NBA_API_RATE / NBA_API_BURST) are split evenly
+between the workers to keep the pool as a whole within them.
+
+Usage:
+    python batch_scouting.py --team DEN --season 2024-25 --out packets/den
+    python batch_scouting.py --players "Nikola Jokić" "Jamal Murray" --season 2024-25 --workers 4
+    python batch_scouting.py --team BOS --png   # needs `pip install kaleido`
+"""
+import argparse
+import html
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from plotly.offline import get_plotlyjs
+from nba_api.stats.static import teams
+from streamlit.logger import set_log_level
+
+from cache_utils import (fetch_shot_frame, fetch_game_log_frame, fetch_team_shots, get_player_registry,
+                         latest_played_season)
+from data_source import make_data_source, set_data_source, DATA_SOURCES
+from upstream import get_rate_limiter
+from scouting import build_scouting_report
+from form import form_report
+from shot_chart_utils import draw_half_court, calculate_zone_efficiency, add_shot_layer
+
+try:
+    import kaleido  # noqa: F401  (plotly's static image backend)
+except ImportError:
+    kaleido = None
+
+PLOTLY_JS_FILE = 'plotly.min.js'
+DEFAULT_WORKERS = 4
+
+PAGE_STYLE = """
+body { font-family: -apple-system, Segoe UI, Helvetica, Arial, sans-serif; margin: 2em auto; max-width: 1100px; color: #222; }
+h1 { margin-bottom: 0; } .sub { color: #666; margin-top: 0.2em; }
+.grid { display: grid; grid-template-columns: 1fr 1fr; gap: 1.5em; }
+.good { border-left: 4px solid #2e7d32; padding-left: 0.8em; } .bad { border-left: 4px solid #c62828; padding-left: 0.8em; }
+table { border-collapse: collapse; font-size: 0.9em; } td, th { padding: 0.25em 0.7em; border-bottom: 1px solid #ddd; text-align: right; }
+td:first-child, th:first-child { text-align: left; }
+"""
+
+
+def _init_worker(source, log_level, workers):
+    # Spawned workers don't inherit the parent's data source selection
+    set_log_level(log_level)
+    if source:
+        set_data_source(make_data_source(source))
+    # The limiter is per process: give each worker its share of the rate and burst
+    limiter = get_rate_limiter()
+    if limiter.rate > 0:
+        limiter.configure(limiter.rate / workers, burst=max(1, limiter.capacity // workers))
+
+
+def _table(df, percent=()):
+    formatters = {c: (lambda v: f"{v * 100:.1f}%") for c in percent if c in df.columns}
+    return df.to_html(index=False, border=0, formatters=formatters, float_format=lambda v: f"{v:.2f}")
+
+
+def _zone_list(zones):
+    return ''.join(f"<li><b>{html.escape(z['ZONE_NAME'])}</b>: {z['FG_PCT'] * 100:.1f}% "
+                   f"({int(z['FGM'])}/{int(z['FGA'])})</li>" for _, z in zones.iterrows())
+
+
+def report_html(player_name, season, df_shots, game_log, chart_html):
+    """Static scouting page for one player (the Scouting Report tab's content)."""
+    report = build_scouting_report(df_shots, game_log)
+    fg_pct = (df_shots['SHOT_MADE_FLAG'] == 1).mean() if len(df_shots) else 0.0
+    parts = [
+        f"<h1>{html.escape(player_name)}</h1>",
+        f"<p class='sub'>{season} · {len(df_shots):,} FGA · {fg_pct * 100:.1f}% FG · {report.games} games</p>",
+        chart_html,
+        "<div class='grid'><div>",
+        "<h2>Offensive Optimization</h2>",
+    ]
+    if not report.best_zones.empty:
+        parts += ["<div class='good'><h3>Green Light Zones</h3><ul>", _zone_list(report.best_zones), "</ul></div>",
+                  "<div class='bad'><h3>Red Light Zones</h3><ul>", _zone_list(report.worst_zones), "</ul></div>"]
+    else:
+        parts.append("<p>Not enough shot attempts per zone (need >5) to generate recommendations.</p>")
+
+    parts.append("</div><div><h2>Defensive Strategy</h2>")
+    if report.hand_bias != "INSUFFICIENT DATA":
+        parts.append(f"<p><b>Directive:</b> {report.defensive_strategy}<br>"
+                     f"Left side {report.left_pct * 100:.1f}% · Right side {report.right_pct * 100:.1f}%</p>")
+    else:
+        parts.append("<p>Need at least 10 attempts per side for directional analysis.</p>")
+    if report.force_layer is not None:
+        parts += [f"<p class='good'><b>FORCE: {report.force_layer['DEF_LAYER']}</b> "
+                  f"({report.force_layer['PPS']:.2f} PPS)</p>",
+                  f"<p class='bad'><b>DENY: {report.deny_layer['DEF_LAYER']}</b> "
+                  f"({report.deny_layer['PPS']:.2f} PPS)</p>",
+                  _table(report.layer_stats, percent=['FG_PCT'])]
+    else:
+        parts.append("<p>Insufficient volume to determine coverage scheme.</p>")
+    parts.append("</div></div>")
+
+    parts += ["<h2>Reliability &amp; Context</h2>",
+              f"<p><b>Grading:</b> {report.consistency_grade}<br><i>{report.consistency_description}</i></p>"]
+    if report.games > 1:
+        parts.append(f"<p>{report.avg_pts:.1f} PPG · std dev {report.std_dev_pts:.1f} · CV {report.cv:.2f} · "
+                     f"typical range {report.avg_pts - report.std_dev_pts:.1f} to "
+                     f"{report.avg_pts + report.std_dev_pts:.1f} points</p>")
+
+    parts += ["<h2>Zone Efficiency</h2>", _table(calculate_zone_efficiency(df_shots), percent=['FG_PCT'])]
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(player_name)} {season}</title>"
+            f"<script src='{PLOTLY_JS_FILE}'></script><style>{PAGE_STYLE}</style></head>"
+            f"<body>{''.join(parts)}</body></html>")
+
+
+def render_player(player_id, player_name, season, out_dir, png):
+    """
+    Worker task: writes <out_dir>/<player_id>.html (and .png). Returns a summary
+    dict, with the game log for the roster's form table.
+    """
+    t0 = time.perf_counter()
+    df_shots = fetch_shot_frame(player_id, season)
+    game_log = fetch_game_log_frame(player_id, season)
+    if df_shots.empty:
+        return {'player': player_name, 'file': None, 'shots': 0, 'seconds': time.perf_counter() - t0,
+                'game_log': game_log}
+
+    fig = draw_half_court(title=f"Shot Chart for {player_name}")
+    add_shot_layer(fig, df_shots)
+    chart_html = fig.to_html(full_html=False, include_plotlyjs=False)
+
+    path = os.path.join(out_dir, f"{player_id}.html")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(report_html(player_name, season, df_shots, game_log, chart_html))
+    if png:
+        fig.write_image(os.path.join(out_dir, f"{player_id}.png"))
+    return {'player': player_name, 'file': os.path.basename(path), 'shots': len(df_shots),
+            'seconds': time.perf_counter() - t0, 'game_log': game_log}
+
+
+def resolve_players(names, team, season):
+    """[(player_id, name)] for explicit names, or every player with a shot for the team that season."""
+    if team:
+        found = teams.find_team_by_abbreviation(team.upper()) or next(
+            (t for t in teams.get_teams() if t['full_name'].lower() == team.lower()), None)
+        if found is None:
+            raise SystemExit(f"Unknown team: {team}")
+        roster = fetch_team_shots(found['id'], season)
+        if roster.empty:
+            return []
+        counts = roster.groupby(['PLAYER_ID', 'PLAYER_NAME'], observed=True).size().sort_values(ascending=False)
+        return [(int(pid), str(name)) for pid, name in counts.index]
+
+    registry = get_player_registry()
+    resolved = []
+    for name in names:
+        player_id = registry.get_id(name)
+        if player_id is None:
+            print(f"Unknown player: {name}")
+            continue
+        resolved.append((player_id, name))
+    return resolved
+
+
+def roster_form(player_list, game_logs):
+    """Form summary for the whole roster in one batch, from the game logs the workers fetched."""
+    return form_report({name: game_logs[name] for _, name in player_list if name in game_logs}).summary_frame()
+
+
+def write_index(out_dir, team, season, results, form):
+    rows = ''.join(f"<tr><td><a href='{r['file']}'>{html.escape(r['player'])}</a></td><td>{r['shots']:,}</td></tr>"
+                   for r in results if r['file'])
+    title = f"{team or 'Scouting'} packet · {season}"
+    with open(os.path.join(out_dir, 'index.html'), 'w', encoding='utf-8') as f:
+        f.write(f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>"
+                f"<style>{PAGE_STYLE}</style></head><body><h1>{html.escape(title)}</h1>"
+                f"<table><tr><th>Player</th><th>FGA</th></tr>{rows}</table>"
+                f"<h2>Recent Form</h2>{_table(form, percent=[c for c in form.columns if c.endswith('TS%')])}"
+                f"</body></html>")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    who = parser.add_mutually_exclusive_group(required=True)
+    who.add_argument('--players', nargs='+', help="player names")
+    who.add_argument('--team', help="team abbreviation or full name: every player with a shot that season")
+    parser.add_argument('--season', default=None, help="defaults to the newest season with games")
+    parser.add_argument('--out', default='scouting_packets', help="output directory")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="worker processes (each gets an equal share of the API rate limit)")
+    parser.add_argument('--png', action='store_true', help="also write PNG shot charts (needs kaleido)")
+    parser.add_argument('--source', choices=DATA_SOURCES, default=None, help="data source (default $NBA_DATA_SOURCE or live)")
+    args = parser.parse_args()
+
+    # st.cache_* functions warn about the missing Streamlit runtime when used headless
+    set_log_level('error')
+    if args.source:
+        set_data_source(make_data_source(args.source))
+    if args.png and kaleido is None:
+        print("kaleido is not installed; writing HTML only (pip install kaleido for PNGs)")
+        args.png = False
+
+    season = args.season or latest_played_season()
+    os.makedirs(args.out, exist_ok=True)
+    # One shared copy of plotly.js instead of ~3.5 MB inlined into every report
+    with open(os.path.join(args.out, PLOTLY_JS_FILE), 'w', encoding='utf-8') as f:
+        f.write(get_plotlyjs())
+
+    player_list = resolve_players(args.players, args.team, season)
+    print(f"{len(player_list)} players, {season}, {args.workers} workers -> {args.out}")
+
+    t0 = time.perf_counter()
+    results, game_logs = [], {}
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                             initargs=(args.source, 'error', args.workers)) as pool:
+        futures = {pool.submit(render_player, player_id, name, season, args.out, args.png): name
+                   for player_id, name in player_list}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"FAILED {name}: {e}")
+                continue
+            game_logs[name] = result.pop('game_log')
+            results.append(result)
+            status = result['file'] or 'no shots'
+            print(f"{name}: {result['shots']:,} shots, {result['seconds']:.2f}s -> {status}")
+
+    results.sort(key=lambda r: -r['shots'])
+    write_index(args.out, args.team, season, results, roster_form(player_list, game_logs))
+    print(f"{sum(1 for r in results if r['file'])} reports in {time.perf_counter() - t0:.1f}s "
+          f"({os.path.join(args.out, 'index.html')})")
+
+
+if __name__ == '__main__':
+    main()
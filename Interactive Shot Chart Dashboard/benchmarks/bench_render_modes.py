@@ -0,0 +1,65 @@
+"""
+Benchmarks the shot chart render modes (svg / webgl / density) across shot
+volumes. Measures server-side figure build time, JSON serialization time and
+payload size, which is what Streamlit ships to the browser on every rerun.
+
+Usage:
+    python benchmarks/bench_render_modes.py --sizes 1000 5000 20000 100000 500000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shot_chart_utils import draw_half_court, add_shot_layer, SCATTERGL_THRESHOLD, DENSITY_THRESHOLD
+
+
+def random_shots(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'LOC_X': rng.integers(-250, 251, n).astype('int16'),
+        'LOC_Y': rng.integers(-47, 420, n).astype('int16'),
+        'SHOT_MADE_FLAG': (rng.random(n) < 0.46).astype('int8'),
+        'ACTION_TYPE': pd.Categorical(rng.choice(['Jump Shot', 'Layup Shot', 'Dunk Shot'], n)),
+        'SHOT_TYPE': pd.Categorical(rng.choice(['2PT Field Goal', '3PT Field Goal'], n, p=[0.6, 0.4])),
+        'SHOT_DISTANCE': rng.integers(0, 35, n).astype('int16'),
+    })
+
+
+def bench(df, mode, repeat):
+    build_times, json_times, payload = [], [], 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fig = draw_half_court()
+        add_shot_layer(fig, df, mode=mode)
+        t1 = time.perf_counter()
+        payload = len(fig.to_json())
+        t2 = time.perf_counter()
+        build_times.append(t1 - t0)
+        json_times.append(t2 - t1)
+    return min(build_times), min(json_times), payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 5_000, 20_000, 100_000, 500_000])
+    parser.add_argument('--modes', nargs='+', default=['svg', 'webgl', 'density'])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"current thresholds: webgl > {SCATTERGL_THRESHOLD:,}, density > {DENSITY_THRESHOLD:,}")
+    print(f"{'shots':>10} {'mode':>8} {'build ms':>10} {'json ms':>10} {'payload KB':>12}")
+    for n in args.sizes:
+        df = random_shots(n)
+        for mode in args.modes:
+            build_s, json_s, payload = bench(df, mode, args.repeat)
+            print(f"{n:>10,} {mode:>8} {build_s * 1e3:>10.1f} {json_s * 1e3:>10.1f} {payload / 1024:>12,.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Measures the per-rerun CPU cost of each single-player view, to compare
+rendering only the selected view against st.tabs, which ran every view on
+every rerun.
+
+Runs app.py headless (Streamlit's AppTest) on the synthetic source with a
+fresh shot store, warms every view once, then reruns each view --repeat
+times and reads the `tab:<view>` stage and whole-rerun CPU from the trace
+log. The st.tabs cost of a rerun is the sum of the view stages plus the
+shared part of the rerun (the rerun minus its view).
+
+Usage:
+    python benchmarks/bench_views.py --repeat 5
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'app.py')
+
+
+def read_traces(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def view_cpu(trace):
+    # (view name, view stage CPU ms, whole rerun CPU ms)
+    for event in trace['events']:
+        if event['kind'] == 'stage' and event['name'].startswith('tab:'):
+            return event['name'][4:], event['cpu_ms'], trace['summary']['cpu_ms']
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    work = tempfile.mkdtemp(prefix='bench_views_')
+    trace_log = os.path.join(work, 'trace.jsonl')
+    os.environ.update(NBA_DATA_SOURCE='synthetic', NBA_SHOT_STORE_DIR=os.path.join(work, 'store'),
+                      NBA_TRACE_LOG=trace_log)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=300).run()
+    views = at.radio(key='view').options
+    for label in views:  # warm every cache the views read
+        at.radio(key='view').set_value(label).run()
+
+    open(trace_log, 'w').close()
+    for label in views:
+        at.radio(key='view').set_value(label).run()
+        for _ in range(args.repeat):
+            at.run()
+
+    samples = {}
+    for trace in read_traces(trace_log):
+        measured = view_cpu(trace)
+        if measured:
+            samples.setdefault(measured[0], []).append(measured[1:])
+
+    print(f"{'view':>16} {'view cpu ms':>12} {'rerun cpu ms':>13}")
+    views_ms, reruns_ms = [], []
+    for name, rows in samples.items():
+        views_ms.append(statistics.median(v for v, _ in rows))
+        reruns_ms.append(statistics.median(r for _, r in rows))
+        print(f"{name:>16} {views_ms[-1]:>12.1f} {reruns_ms[-1]:>13.1f}")
+    shared_ms = statistics.median(r - v for r, v in zip(reruns_ms, views_ms))
+    print(f"\nselected view only: {min(reruns_ms):.0f}-{max(reruns_ms):.0f} ms CPU per rerun "
+          f"(median {statistics.median(reruns_ms):.0f} ms)")
+    print(f"every view (st.tabs): ~{shared_ms + sum(views_ms):.0f} ms CPU per rerun")
+
+
+if __name__ == '__main__':
+    main()
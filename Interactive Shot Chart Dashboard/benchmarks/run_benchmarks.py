@@ -0,0 +1,190 @@
+"""
+Benchmarks every per-rerun hot path on synthetic shot frames and saves the
+results as JSON, so runs can be compared between commits.
+
+Each stage is timed (best and median of --repeat runs) and then run once more
+under tracemalloc for its peak allocation. Stages that need the raw API frame
+(normalize) or ship a figure (render) are capped by --max-raw-rows, since a
+10^7-row object-dtype frame alone needs several GB. The default run stops at
+10^6 rows; --full adds 10^7 for every stage, raw ones included (about 8 GB of RAM).
+
+Usage:
+    python benchmarks/run_benchmarks.py                                 # writes benchmarks/results/<commit>.json
+    python benchmarks/run_benchmarks.py --full --repeat 3               # 10^3 .. 10^7 rows, no caps
+    python benchmarks/run_benchmarks.py --sizes 1000 100000 10000000 --stages zone_efficiency hexbin
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/abc1234.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shot_chart_utils import (draw_half_court, calculate_zone_efficiency, add_shot_layer, select_render_mode,
+                              ShotBinGrid, _court_template)
+from shot_schema import normalize_shot_frame
+from scouting import zone_report, side_splits, layer_report, consistency_report, build_scouting_report
+from synthetic import synthetic_shots, synthetic_game_log
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+FULL_SIZES = DEFAULT_SIZES + [10_000_000]
+DEFAULT_MAX_RAW_ROWS = 1_000_000
+
+# Differences below this are timer noise, never a regression
+NOISE_FLOOR_MS = 0.5
+
+
+def _render(df):
+    fig = draw_half_court()
+    add_shot_layer(fig, df)
+    return fig.to_json()
+
+
+# name -> (fn(inputs), needs raw frame / capped by --max-raw-rows, depends on size)
+STAGES = {
+    'normalize_shot_frame': (lambda i: normalize_shot_frame(i['raw']), True, True),
+    'zone_efficiency': (lambda i: calculate_zone_efficiency(i['shots']), False, True),
+    'zone_report': (lambda i: zone_report(i['shots']), False, True),
+    'side_splits': (lambda i: side_splits(i['shots']), False, True),
+    'layer_report': (lambda i: layer_report(i['shots']), False, True),
+    'consistency_report': (lambda i: consistency_report(i['game_log']), False, False),
+    'scouting_report': (lambda i: build_scouting_report(i['shots'], i['game_log']), False, True),
+    'hexbin': (lambda i: ShotBinGrid().update(i['shots']), False, True),
+    'draw_half_court': (lambda i: draw_half_court(), False, False),
+    # Uncached build of the same court, the baseline the cached clone above is measured against
+    'build_half_court': (lambda i: _court_template.__wrapped__(), False, False),
+    'render': (lambda i: _render(i['shots']), True, True),
+}
+
+
+def time_stage(fn, inputs, repeat):
+    fn(inputs)  # warm-up: imports, lru caches, first-call allocations
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(inputs)
+        times.append((time.perf_counter() - t0) * 1e3)
+
+    tracemalloc.start()
+    fn(inputs)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), statistics.median(times), peak
+
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def run(sizes, stages, repeat, max_raw_rows, seed):
+    results = []
+    game_log = synthetic_game_log(seed=seed)
+    unsized_done = set()
+    for n in sizes:
+        shots = synthetic_shots(n, seed=seed)
+        raw = synthetic_shots(n, seed=seed, compact=False) if any(STAGES[s][1] for s in stages) and n <= max_raw_rows else None
+        inputs = {'shots': shots, 'raw': raw, 'game_log': game_log}
+
+        for name in stages:
+            fn, needs_cap, sized = STAGES[name]
+            if needs_cap and n > max_raw_rows:
+                continue
+            if not sized:
+                if name in unsized_done:
+                    continue
+                unsized_done.add(name)
+            best, median, peak = time_stage(fn, inputs, repeat)
+            row = {'stage': name, 'rows': n if sized else 0, 'best_ms': round(best, 3),
+                   'median_ms': round(median, 3), 'peak_kb': round(peak / 1024, 1)}
+            if name == 'render':
+                row['mode'] = select_render_mode(n)
+            results.append(row)
+            print(f"{name:>22} {row['rows']:>12,} {best:>12.2f} {median:>12.2f} {peak / 1024:>12,.0f}", flush=True)
+        del inputs, shots, raw
+    return results
+
+
+def compare(current, baseline, threshold):
+    """Prints per-stage ratios against a saved run; returns the regressions."""
+    previous = {(r['stage'], r['rows']): r for r in baseline['results']}
+    regressions = []
+    print(f"\nvs {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')}), threshold +{threshold:.0%}")
+    print(f"{'stage':>22} {'rows':>12} {'before ms':>12} {'after ms':>12} {'change':>9}")
+    for row in current:
+        before = previous.get((row['stage'], row['rows']))
+        if before is None:
+            continue
+        change = row['best_ms'] / before['best_ms'] - 1 if before['best_ms'] else 0.0
+        regressed = change > threshold and row['best_ms'] - before['best_ms'] > NOISE_FLOOR_MS
+        if regressed:
+            regressions.append((row, before, change))
+        print(f"{row['stage']:>22} {row['rows']:>12,} {before['best_ms']:>12.2f} {row['best_ms']:>12.2f} "
+              f"{change:>+8.0%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=None, help="row counts (default 10^3 .. 10^6)")
+    parser.add_argument('--full', action='store_true',
+                        help="10^3 .. 10^7 rows with raw stages uncapped (unless --sizes/--max-raw-rows are given)")
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--max-raw-rows', type=int, default=None,
+                        help="largest size for normalize_shot_frame and render")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="results file (default benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', default=None, help="earlier results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.15, help="relative slowdown that counts as a regression")
+    args = parser.parse_args()
+    sizes = args.sizes or (FULL_SIZES if args.full else DEFAULT_SIZES)
+    max_raw_rows = args.max_raw_rows if args.max_raw_rows is not None else (
+        max(sizes) if args.full else DEFAULT_MAX_RAW_ROWS)
+
+    meta = {
+        'commit': git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'max_raw_rows': max_raw_rows,
+    }
+    print(f"{'stage':>22} {'rows':>12} {'best ms':>12} {'median ms':>12} {'peak KB':>12}")
+    results = run(sizes, args.stages, args.repeat, max_raw_rows, args.seed)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{meta['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=1)
+    print(f"\nsaved {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} stage(s) regressed by more than {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
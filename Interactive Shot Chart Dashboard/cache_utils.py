@@ -1,85 +1,325 @@
 import streamlit as st
 from nba_api.stats.static import players
-from nba_api.stats.endpoints import shotchartdetail, commonplayerinfo, playergamelog
-from shot_chart_utils import calculate_zone_efficiency
+from shot_chart_utils import calculate_zone_efficiency, ShotBinGrid
+from scouting import zone_report, side_splits, layer_report, consistency_report, assemble_scouting_report
+from player_registry import PlayerRegistry
+from shot_store import get_shot_store
+from data_source import get_data_source
+from instrumentation import traced_cache, note_miss, record
+from frame_cache import get_frame_cache
+from derived_cache import get_derived_cache, combine_stamps
+from shot_filters import ShotFilterIndex
+from comparison import zone_efficiency_matrix
+from team_aggregate import TeamAggregate
+from form import form_report
+from league_baseline import LeagueBaseline, baseline_dir, BASELINE_FILE
+from shot_schema import normalize_shot_frame, append_shot_frame, concat_shot_chunks, isolated_copy, SHOT_SCHEMA_VERSION
 import pandas as pd
+import hashlib
+import os
+import time
+from datetime import date, datetime, timedelta
 
-@st.cache_data(ttl=604800)
-def get_players():
-    #Fetch NBA players
-    return players.get_players()
+# Earliest season with ShotChartDetail coverage
+FIRST_SHOT_SEASON = '1996-97'
+# (month, day) by which every normally scheduled season has tipped off, and the exceptions
+SEASON_PLAYED_FROM = (11, 1)
+LATE_SEASON_OPENERS = {'2011-12': date(2011, 12, 25), '2020-21': date(2020, 12, 22)}
 
-@st.cache_data
+def season_string(start_year):
+    #2024 -> '2024-25'
+    return f"{start_year}-{str(start_year + 1)[-2:]}"
+
+def current_season(today=None):
+    #NBA seasons start in October
+    today = today or date.today()
+    return season_string(today.year if today.month >= 10 else today.year - 1)
+
+def season_started(season, today=None):
+    #Whether the regular season has had games yet. The calendar season rolls over on Oct 1, but
+    #openers come in the second half of October (late December in 2011-12 and 2020-21)
+    today = today or date.today()
+    return today >= LATE_SEASON_OPENERS.get(season, date(int(season[:4]), *SEASON_PLAYED_FROM))
+
+def latest_played_season(today=None):
+    #Newest season with games: the default for the season selectors, so the first screen isn't empty
+    season = current_season(today)
+    return season if season_started(season, today) else season_string(int(season[:4]) - 1)
+
+def season_range(first=FIRST_SHOT_SEASON, last=None):
+    #Seasons from `first` to `last` (default: current), most recent first
+    last = last or current_season()
+    return [season_string(y) for y in range(int(last[:4]), int(first[:4]) - 1, -1)]
+
+def season_windows(season, since=None, today=None):
+    #Calendar-month (first, last) date windows covering a season from `since` (inclusive). The final
+    #window is open-ended (last=None): regular seasons have run into May (1998-99, 2020-21) and
+    #August (2019-20), and the season parameter already bounds the request.
+    today = today or date.today()
+    first = date(int(season[:4]), 10, 1)
+    final_start = min(date(int(season[:4]) + 1, 4, 1), today)
+    if since is not None:
+        first = max(first, since)
+    windows = []
+    while True:
+        next_month = date(first.year + first.month // 12, first.month % 12 + 1, 1)
+        if next_month > final_start:
+            windows.append((first, None))
+            return windows
+        windows.append((first, next_month - timedelta(days=1)))
+        first = next_month
+
+# Entry lifetimes (seconds) in the shot store and the in-process frame tier
+SHOT_DATA_TTL = 21600
+CAREER_STATS_TTL = 21600
+GAME_LOG_TTL = 21600
+
+# Entry bounds for the small st.cache_data lookups (fetched frames live in the size-bounded frame_cache tier)
+PLAYER_LOOKUP_MAX_ENTRIES = 2048
+SEARCH_MAX_ENTRIES = 1024
+
+@st.cache_resource(ttl=604800)
+def get_player_registry():
+    #Indexed player lookups, built once and shared across sessions
+    return PlayerRegistry(players.get_players())
+
+def get_player_id(player_name):
+    #O(1) name -> ID resolution (exact, then accent/case-insensitive)
+    return get_player_registry().get_id(player_name)
+
+@st.cache_data(max_entries=PLAYER_LOOKUP_MAX_ENTRIES)
 def get_player_headshot_url(player_name):
     #Player headshot URL
-    nba_players = get_players()
-    player_info = [p for p in nba_players if p['full_name'] == player_name]
+    player_id = get_player_id(player_name)
     
-    if not player_info:
+    if player_id is None:
         return None
-    
-    player_id = player_info[0]['id']
 
     return f"https://cdn.nba.com/headshots/nba/latest/1040x760/{player_id}.png"
 
-@st.cache_data(ttl=604800)
+@st.cache_data(ttl=604800, max_entries=1)
 def get_player_list():
     #Active NBA player list
-    return sorted([p['full_name'] for p in get_players() if p['is_active']])
+    return list(get_player_registry().active_names())
+
+@st.cache_data(ttl=604800, max_entries=SEARCH_MAX_ENTRIES)
+def search_players(query):
+    #Active players whose first, last or full name starts with the query
+    return get_player_registry().search(query)
 
-@st.cache_data(ttl=604800)
+@traced_cache('position')
+@st.cache_data(ttl=604800, max_entries=PLAYER_LOOKUP_MAX_ENTRIES)
 def get_player_position(player_name):
     #Player position retrieval
-    nba_players = get_players()
-    player_info = [p for p in nba_players if p['full_name'] == player_name]
+    note_miss()
+    player_id = get_player_id(player_name)
     
-    if not player_info:
+    if player_id is None:
         return None
     
-    player_id = player_info[0]['id']
-    
     try:
-        player_details = commonplayerinfo.CommonPlayerInfo(player_id=player_id)
-        player_data = player_details.get_normalized_dict()
-        position = player_data['CommonPlayerInfo'][0]['POSITION']
-        return position
+        return get_data_source().player_info(player_id).get('POSITION')
     except Exception as e:
         print(f"Error fetching position for {player_name}: {e}")
         return None
 
-@st.cache_data(show_spinner="Fetching shot data from NBA API...", ttl=21600)
+def is_past_season(season, today=None):
+    #Completed seasons never change
+    return season < current_season(today)
+
+def season_ttl(season, ttl):
+    #Store lifetime for a season's entry: past seasons are immutable (never expire)
+    return None if is_past_season(season) else ttl
+
+def read_store(kind, *key, schema=None):
+    #(frame, meta, result) for a store entry; result is hit, miss or stale (expired or old schema)
+    store = get_shot_store()
+    t0 = time.perf_counter()
+    cached = store.read(kind, *key, allow_stale=True)
+    if cached is None:
+        result = 'miss'
+    elif not store.is_fresh(cached[1]) or (schema is not None and cached[1].get('schema') != schema):
+        result = 'stale'
+    else:
+        result = 'hit'
+    record('cache', layer='store', name=kind, key='/'.join(map(str, key)), result=result,
+           ms=round((time.perf_counter() - t0) * 1e3, 2))
+    frame, meta = cached if cached is not None else (None, None)
+    return frame, meta, result
+
+def with_version(df, kind, player_id, season, meta):
+    #Tags a frame with its store version. `appended_from` is the row count of the previous
+    #version when this one only appended rows, so derived results can update from the tail.
+    df.attrs.update(data_key=(kind, player_id, season), data_version=meta['version'],
+                    appended_from=meta.get('appended_from'))
+    return df
+
+def fetch_shot_frame(player_id, season):
+    #Shot frame for (player_id, season): local store first, ShotChartDetail on miss/expiry.
+    #An expired in-season entry is refreshed incrementally: only games from the newest
+    #GAME_DATE already held are requested and the new shots are appended.
+    store = get_shot_store()
+    cached, meta, result = read_store('shots', player_id, season, schema=SHOT_SCHEMA_VERSION)
+    if result == 'hit':
+        return with_version(cached, 'shots', player_id, season, meta)
+
+    ttl = season_ttl(season, SHOT_DATA_TTL)
+    if result == 'stale' and meta.get('schema') == SHOT_SCHEMA_VERSION and meta.get('last_game_date'):
+        since = datetime.strptime(meta['last_game_date'], '%Y-%m-%d')
+        new, _ = normalize_shot_frame(get_data_source().shot_chart(player_id, season, date_from=since))
+        df, added = append_shot_frame(cached, new)
+        record('refresh', name='shots', key=f"{player_id}/{season}", mode='incremental', rows=len(df),
+               added=added, since=meta['last_game_date'])
+        if added:
+            meta = store.write('shots', player_id, season, frame=df, ttl=ttl, schema=SHOT_SCHEMA_VERSION,
+                               appended_from=len(cached), **_last_game(df))
+        else:
+            # Nothing new: renew the entry but keep its version so derived results stay valid
+            meta = store.write('shots', player_id, season, frame=df, ttl=ttl, schema=SHOT_SCHEMA_VERSION,
+                               version=meta['version'], appended_from=meta.get('appended_from'),
+                               **_last_game(df))
+        return with_version(df, 'shots', player_id, season, meta)
+
+    raw = get_data_source().shot_chart(player_id, season)
+
+    # Compact dtypes + vectorized SHOT_RESULT/SHOT_POINTS (returns a new frame)
+    df, stats = normalize_shot_frame(raw)
+    record('refresh', name='shots', key=f"{player_id}/{season}", mode='full', rows=len(df),
+           bytes_before=stats['bytes_before'], bytes_after=stats['bytes_after'])
+
+    meta = store.write('shots', player_id, season, frame=df, ttl=ttl,
+                       schema=SHOT_SCHEMA_VERSION, **stats, **_last_game(df))
+    return with_version(df, 'shots', player_id, season, meta)
+
+def _last_game(df):
+    #Newest game held in a shot frame, for the next incremental refresh
+    if df.empty:
+        return {'last_game_date': None, 'last_game_id': None}
+    newest = df['GAME_DATE'].max()
+    return {'last_game_date': newest.strftime('%Y-%m-%d'),
+            'last_game_id': str(df.loc[df['GAME_DATE'] == newest, 'GAME_ID'].astype(str).max())}
+
+def fetch_team_shots(team_id, season, on_chunk=None):
+    #Every shot a team took in a season: local store first, otherwise ShotChartDetail
+    #(team_id, player_id=0) one month at a time. on_chunk(chunk, done, total) sees each
+    #normalized window as it arrives; the chunks are concatenated once at the end.
+    #Expired in-season entries only request windows from the newest game held.
+    store = get_shot_store()
+    cached, meta, result = read_store('team_shots', team_id, season, schema=SHOT_SCHEMA_VERSION)
+    if result == 'hit':
+        return with_version(cached, 'team_shots', team_id, season, meta)
+
+    incremental = result == 'stale' and meta.get('schema') == SHOT_SCHEMA_VERSION and meta.get('last_game_date')
+    since = datetime.strptime(meta['last_game_date'], '%Y-%m-%d').date() if incremental else None
+    windows = season_windows(season, since=since)
+    chunks = []
+    for done, (first, last) in enumerate(windows, 1):
+        raw = get_data_source().shot_chart(0, season, team_id=team_id, date_from=first, date_to=last)
+        chunk, _ = normalize_shot_frame(raw)
+        chunks.append(chunk)
+        if on_chunk is not None:
+            on_chunk(chunk, done, len(windows))
+    new = concat_shot_chunks(chunks)
+
+    ttl = season_ttl(season, SHOT_DATA_TTL)
+    if incremental:
+        df, added = append_shot_frame(cached, new)
+        record('refresh', name='team_shots', key=f"{team_id}/{season}", mode='incremental', rows=len(df),
+               added=added, since=meta['last_game_date'], windows=len(windows))
+        extra = {'appended_from': len(cached)} if added else {'version': meta['version'],
+                                                              'appended_from': meta.get('appended_from')}
+    else:
+        df, extra = new, {}
+        record('refresh', name='team_shots', key=f"{team_id}/{season}", mode='full', rows=len(df),
+               windows=len(windows))
+
+    meta = store.write('team_shots', team_id, season, frame=df, ttl=ttl, schema=SHOT_SCHEMA_VERSION,
+                       **extra, **_last_game(df))
+    return with_version(df, 'team_shots', team_id, season, meta)
+
+def fetch_career_frame(player_id):
+    #Career per-game averages: local store first, PlayerCareerStats on miss/expiry
+    store = get_shot_store()
+    cached, _, result = read_store('career', player_id)
+    if result == 'hit':
+        return cached
+
+    # Regular season averages
+    df_season_averages = get_data_source().career_stats(player_id).sort_values(by='SEASON_ID', ascending=False)
+    
+    # Drop irrelevant columns 
+    df_season_averages = df_season_averages.drop(columns=['PLAYER_ID', 'LEAGUE_ID'])
+
+    store.write('career', player_id, frame=df_season_averages, ttl=CAREER_STATS_TTL)
+    return df_season_averages.reset_index(drop=True)
+
+def fetch_game_log_frame(player_id, season):
+    #Regular season game log: local store first, PlayerGameLog on miss/expiry.
+    #Expired in-season logs only request games from the newest date held (most recent first).
+    store = get_shot_store()
+    cached, meta, result = read_store('game_log', player_id, season)
+    if result == 'hit':
+        return with_version(cached, 'game_log', player_id, season, meta)
+
+    ttl = season_ttl(season, GAME_LOG_TTL)
+    if result == 'stale' and not cached.empty and 'Game_ID' in cached.columns:
+        since = pd.to_datetime(cached['GAME_DATE'], format='%b %d, %Y').max()
+        new = get_data_source().game_log(player_id, season, date_from=since)
+        new = new[~new['Game_ID'].isin(cached['Game_ID'])]
+        df_game_log = pd.concat([new, cached], ignore_index=True) if not new.empty else cached
+        meta = store.write('game_log', player_id, season, frame=df_game_log, ttl=ttl,
+                           **({'version': meta['version']} if new.empty else {}))
+        return with_version(df_game_log, 'game_log', player_id, season, meta)
+
+    df_game_log = get_data_source().game_log(player_id, season)
+
+    meta = store.write('game_log', player_id, season, frame=df_game_log, ttl=ttl)
+    return with_version(df_game_log, 'game_log', player_id, season, meta)
+
+def cached_frame(name, key, load, ttl, persisted=True):
+    #Frame from the size-bounded in-process tier (frame_cache), else load() and keep it there.
+    #`persisted` frames were already written to the shot store by load(), so eviction just
+    #releases them; others spill to disk. Errors propagate and are not cached.
+    cache = get_frame_cache()
+    t0 = time.perf_counter()
+    df = cache.get(key)
+    result = 'hit' if df is not None else 'miss'
+    if df is None:
+        df = load()
+        cache.put(key, df, ttl=ttl, persisted=persisted)
+        df = isolated_copy(df)
+    record('cache', layer='memory', name=name, key='/'.join(map(str, key[1:])), result=result,
+           ms=round((time.perf_counter() - t0) * 1e3, 2))
+    return df
+
+def get_merged_frame_cached(name, frames_by_season, merge):
+    #Multi-season frame merged from per-season frames, stamped with their versions. It isn't in
+    #the shot store, so the frame tier spills it when evicted. Keyed by the stamps: a refreshed
+    #season makes a new entry and the old one ages out.
+    stamps = combine_stamps([df for df in frames_by_season.values() if not df.empty])
+    if not stamps:
+        return merge(frames_by_season)
+
+    def load():
+        df = merge(frames_by_season)
+        df.attrs = stamps
+        return df
+
+    digest = hashlib.sha1(repr(stamps).encode()).hexdigest()[:20]
+    return cached_frame(f'merged_{name}', (f'merged_{name}', digest), load, ttl=None, persisted=False)
+
 def get_shot_data(player_name, season):
     #Shot chart data retrieval    
-    nba_players = get_players()
-    player_info = [p for p in nba_players if p['full_name'] == player_name]
-    if not player_info:
+    player_id = get_player_id(player_name)
+    if player_id is None:
         return pd.DataFrame(), None # Return empty data if not found
-        
-    player_id = player_info[0]['id']
-
 
-
-    # Shot chart data fetch
     try:
-        shot_chart = shotchartdetail.ShotChartDetail(
-            team_id=0,
-            player_id=player_id,
-            context_measure_simple='FGA',
-            season_nullable=season
-            
-        )
-        
-        df = shot_chart.get_data_frames()[0]
-
-        #copy dataframe to prevent in-place modification issues
-        df = df.copy()
+        df = cached_frame('shots', ('shots', player_id, season), lambda: fetch_shot_frame(player_id, season),
+                          ttl=season_ttl(season, SHOT_DATA_TTL))
         
         # Determine the player's team ID for the selected season
         team_id = df['TEAM_ID'].iloc[0] if not df.empty else None
-
-
-        # Prepare columns for visualization and analysis
-        df['SHOT_RESULT'] = df.apply(lambda row: 'Made' if row['SHOT_MADE_FLAG'] == 1 else 'Missed', axis=1)
         
         # Return the DataFrame and Team ID
         return df, team_id
@@ -87,70 +327,108 @@ def get_shot_data(player_name, season):
         st.error(f"Error fetching data for {player_name}: {e}")
         return pd.DataFrame(), None
 
-@st.cache_data
-def get_zone_efficiency_cached(player_name, season, df):
-    return calculate_zone_efficiency(df)
+def get_team_shot_data(team_id, season, on_chunk=None):
+    #Team season shots. Not st.cache_data: chunks report progress while they arrive. A frame
+    #tier hit skips on_chunk, and the streamed aggregate (empty) is then ignored.
+    try:
+        return cached_frame('team_shots', ('team_shots', team_id, season),
+                            lambda: fetch_team_shots(team_id, season, on_chunk=on_chunk),
+                            ttl=season_ttl(season, SHOT_DATA_TTL))
+    except Exception as e:
+        st.error(f"Error fetching team shot data: {e}")
+        return pd.DataFrame()
+
+# Derived results: keyed by the frames' (data_key, data_version) stamps via DerivedCache,
+# so a lookup never hashes the shot frame. Results are read-only; copy before modifying.
+
+def get_zone_efficiency_cached(df):
+    return get_derived_cache().get('zone_efficiency', calculate_zone_efficiency, df)
+
+def get_shot_bins_cached(df):
+    #Hex-bin counts; an append-only refresh adds just the new shots to the previous counts
+    return get_derived_cache().get('shot_bins', lambda d: ShotBinGrid().update(d), df,
+                                   update=lambda bins, tail: ShotBinGrid(grid=bins.grid).merge(bins).update(tail))
+
+def get_shot_filter_index(df):
+    #Per-dimension bitsets for the sidebar shot filters, built once per shot frame version
+    return get_derived_cache().get('filter_index', ShotFilterIndex, df)
+
+def get_zone_matrix_cached(frames_by_player):
+    #Aligned zone x player matrix, cached on the players' frame versions
+    names = tuple(frames_by_player)
+    return get_derived_cache().get('zone_matrix', lambda *frames: zone_efficiency_matrix(dict(zip(names, frames))),
+                                   *frames_by_player.values(), params=names)
+
+def get_team_aggregate_cached(df, streamed=None):
+    #Team zone/bin/player counts. `streamed` is an aggregate built while the frame's chunks
+    #arrived; when it covers the whole frame it is stored as is instead of being rebuilt.
+    cache = get_derived_cache()
+    if streamed is not None and streamed.rows == len(df):
+        cache.put('team_aggregate', streamed, df)
+    return cache.get('team_aggregate', TeamAggregate.from_frame, df,
+                     update=lambda agg, tail: agg.copy().add(tail))
+
+def get_zone_report_cached(df):
+    return get_derived_cache().get('zone_report', zone_report, df)
+
+def get_side_splits_cached(df):
+    return get_derived_cache().get('side_splits', side_splits, df)
+
+def get_layer_report_cached(df):
+    return get_derived_cache().get('layer_report', layer_report, df)
+
+def get_consistency_cached(game_log):
+    return get_derived_cache().get('consistency', consistency_report, game_log)
+
+def get_form_cached(game_log):
+    #Rolling/EWMA/streak analytics for one player's game log (FormReport with a single player)
+    return get_derived_cache().get('form', lambda log: form_report({'player': log}), game_log)
+
+def get_scouting_report_cached(df, game_log):
+    #Each part is cached on its own input, so a new game log doesn't recompute the shot parts
+    return assemble_scouting_report(get_zone_report_cached(df), get_side_splits_cached(df),
+                                    get_layer_report_cached(df), get_consistency_cached(game_log))
+
+def get_league_baseline():
+    #League baseline arrays (None until league_baseline.py has run); reloaded when the job rewrites them
+    path = os.path.join(baseline_dir(), BASELINE_FILE)
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    return _load_league_baseline(mtime)
+
+@st.cache_resource(max_entries=1)
+def _load_league_baseline(mtime):
+    return LeagueBaseline.load() if mtime is not None else None
 
 
 
-@st.cache_data(show_spinner="Fetching career stats...", ttl=21600)
 def get_career_stats(player_name):
     #Career per-game averages broken down by season
     
     # 1. Get Player ID
-    nba_players = get_players()
-    player_info = [p for p in nba_players if p['full_name'] == player_name]
-    if not player_info:
+    player_id = get_player_id(player_name)
+    if player_id is None:
         return pd.DataFrame() 
-        
-    player_id = player_info[0]['id']
-
-
 
     try:
-        from nba_api.stats.endpoints import playercareerstats
-        
-        career_stats = playercareerstats.PlayerCareerStats(
-            player_id=player_id,
-            per_mode36='PerGame' 
-        )
-        
-        # Regular season averages
-        df_season_averages = career_stats.get_data_frames()[0].sort_values(by='SEASON_ID', ascending=False)     
-        
-        
-        # Drop irrelevant columns 
-        df_season_averages = df_season_averages.drop(columns=['PLAYER_ID', 'LEAGUE_ID'])
-        
-        return df_season_averages
+        return cached_frame('career', ('career', player_id), lambda: fetch_career_frame(player_id),
+                            ttl=CAREER_STATS_TTL)
     except Exception as e:
         st.error(f"Error fetching career data: {e}")
         return pd.DataFrame()
     
 
 #Game Log
-@st.cache_data(show_spinner="Fetching game log data...", ttl=21600)
 def get_player_game_log(player_name, season):
     #Fetch player's game log for a specific season
     
     # 1. Get Player ID
-    nba_players = get_players()
-    player_info = [p for p in nba_players if p['full_name'] == player_name]
-    if not player_info:
+    player_id = get_player_id(player_name)
+    if player_id is None:
         return pd.DataFrame() 
-        
-    player_id = player_info[0]['id']
     
     try:
-        game_log = playergamelog.PlayerGameLog(
-            player_id=player_id,
-            season=season,
-            season_type_all_star='Regular Season'
-        )
-        
-        df_game_log = game_log.get_data_frames()[0]
-        
-        return df_game_log
+        return cached_frame('game_log', ('game_log', player_id, season),
+                            lambda: fetch_game_log_frame(player_id, season), ttl=season_ttl(season, GAME_LOG_TTL))
     except Exception as e:
         st.error(f"Error fetching game log data: {e}")
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
@@ -0,0 +1,82 @@
+"""
+Multi-player comparison: one aligned zone x player efficiency matrix.
+
+All players' zone columns are stacked once (categoricals unioned, no string
+work per shot) and counted with a single bincount over
+(player, zone basic, zone area), instead of running calculate_zone_efficiency
+per player and joining the results on ZONE_NAME.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from league_baseline import ZONE_INDEX
+
+MIN_COMPARE_PLAYERS = 2
+MAX_COMPARE_PLAYERS = 6
+
+
+class ZoneMatrix:
+    """
+    fga/fgm are int64 [zone, player] arrays over `zones` (ZONE_NAME strings,
+    in the league baseline's zone order) and `players` (in selection order).
+    Deltas are FG% minus the reference (first) player's FG%.
+    """
+
+    def __init__(self, zones, players, fga, fgm):
+        self.zones = zones
+        self.players = players
+        self.fga = fga
+        self.fgm = fgm
+
+    @property
+    def fg_pct(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.fga > 0, self.fgm / self.fga, np.nan)
+
+    @property
+    def delta(self):
+        pct = self.fg_pct
+        return pct - pct[:, :1]
+
+    def to_frame(self):
+        """Display table: ZONE_NAME, then FGA / FG% (and Δ vs the reference) per player, in percent."""
+        pct, delta = self.fg_pct * 100.0, self.delta * 100.0
+        columns = {'ZONE_NAME': self.zones}
+        for j, player in enumerate(self.players):
+            columns[f'{player} FGA'] = self.fga[:, j]
+            columns[f'{player} FG%'] = pct[:, j]
+            if j:
+                columns[f'{player} Δ'] = delta[:, j]
+        return pd.DataFrame(columns)
+
+
+def zone_efficiency_matrix(frames_by_player):
+    """
+    ZoneMatrix for {player_name: shot frame}. Players without shots are
+    dropped; zones nobody attempted are omitted.
+    """
+    players = [name for name, df in frames_by_player.items() if not df.empty]
+    frames = [frames_by_player[name] for name in players]
+    if not frames:
+        return ZoneMatrix([], [], np.zeros((0, 0), dtype=np.int64), np.zeros((0, 0), dtype=np.int64))
+
+    basic = union_categoricals([df['SHOT_ZONE_BASIC'].astype('category') for df in frames], ignore_order=True)
+    area = union_categoricals([df['SHOT_ZONE_AREA'].astype('category') for df in frames], ignore_order=True)
+    made = np.concatenate([df['SHOT_MADE_FLAG'].to_numpy() == 1 for df in frames])
+    player = np.repeat(np.arange(len(frames)), [len(df) for df in frames])
+
+    n_basic, n_area, n_players = len(basic.categories), len(area.categories), len(frames)
+    combo = basic.codes.astype(np.int64) * n_area + area.codes
+    valid = (basic.codes >= 0) & (area.codes >= 0)
+    flat = player[valid] * (n_basic * n_area) + combo[valid]
+    size = n_players * n_basic * n_area
+    fga = np.bincount(flat, minlength=size).reshape(n_players, n_basic * n_area).T
+    fgm = np.bincount(flat, weights=made[valid], minlength=size).reshape(n_players, n_basic * n_area).T.astype(np.int64)
+
+    # Keep attempted zones, in the fixed league zone order (unknown zones last, alphabetically)
+    attempted = np.flatnonzero(fga.sum(axis=1))
+    names = [f'{basic.categories[i // n_area]} - {area.categories[i % n_area]}' for i in attempted]
+    order = sorted(range(len(names)), key=lambda k: (ZONE_INDEX.get(names[k], len(ZONE_INDEX)), names[k]))
+    rows = attempted[order]
+    return ZoneMatrix([names[k] for k in order], players, fga[rows], fgm[rows])
@@ -0,0 +1,127 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import NamedTuple
+
+import pandas as pd
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+from cache_utils import (get_shot_data, get_career_stats, get_player_position, get_player_game_log,
+                         get_merged_frame_cached)
+from shot_schema import concat_shot_frames
+from instrumentation import record, frame_stats
+
+# Shared, bounded pool for upstream fetches. Sized for one rerun's fan-out
+# across a handful of concurrent sessions without flooding the stats API.
+FETCH_WORKERS = 8
+_fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix='nba-fetch')
+
+# Position only feeds the page title, so it never holds up the rest of the page.
+# A late result still lands in the st.cache_data entry for the next rerun.
+POSITION_TIMEOUT = 3.0
+
+
+class PlayerData(NamedTuple):
+    shots: pd.DataFrame
+    team_id: object
+    career: pd.DataFrame
+    position: object
+    game_log: pd.DataFrame
+    errors: dict
+
+
+def submit(fn, *args):
+    """
+    Runs fn(*args) on the shared fetch pool. The caller's Streamlit script
+    context is attached to the worker so st.cache_data spinners and st.error
+    calls inside cached functions still reach the page, and the caller's
+    contextvars (the rerun's trace) are copied so timings land in it.
+    """
+    ctx = get_script_run_ctx()
+    context = contextvars.copy_context()
+
+    def run():
+        if ctx is not None:
+            add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+
+    return _fetch_pool.submit(context.run, run)
+
+
+def _result_or_default(future, default, name, errors):
+    # Isolate failures: one broken endpoint degrades its own section only
+    if not future.done():
+        errors[name] = 'timed out'
+        return default
+    try:
+        return future.result()
+    except Exception as e:
+        errors[name] = str(e)
+        return default
+
+
+def load_player_data(player_name, seasons):
+    """
+    Issues the independent per-rerun fetches concurrently and joins them.
+    Cold-load latency is roughly the slowest required call.
+
+    `seasons` is one season string or a list (most recent first). Each season's
+    shots and game log is its own cached fetch, so widening a range only
+    requests the seasons not already cached (in-process or in the shot store);
+    the results are merged into one frame with a SEASON column.
+    """
+    seasons = [seasons] if isinstance(seasons, str) else list(seasons)
+
+    shot_fs = {season: submit(get_shot_data, player_name, season) for season in seasons}
+    log_fs = {season: submit(get_player_game_log, player_name, season) for season in seasons}
+    career_f = submit(get_career_stats, player_name)
+    position_f = submit(get_player_position, player_name)
+
+    wait([*shot_fs.values(), *log_fs.values(), career_f])
+    wait([position_f], timeout=POSITION_TIMEOUT)
+
+    errors = {}
+    shots_by_season, logs_by_season, team_id = {}, {}, None
+    for season in seasons:
+        shots, season_team_id = _result_or_default(shot_fs[season], (pd.DataFrame(), None), f'shots {season}', errors)
+        shots_by_season[season] = shots
+        logs_by_season[season] = _result_or_default(log_fs[season], pd.DataFrame(), f'game_log {season}', errors)
+        # Theme follows the most recent season the player has shots in
+        if team_id is None:
+            team_id = season_team_id
+    career = _result_or_default(career_f, pd.DataFrame(), 'career', errors)
+    position = _result_or_default(position_f, None, 'position', errors)
+
+    if len(seasons) == 1:
+        shots, game_log = shots_by_season[seasons[0]], logs_by_season[seasons[0]]
+    else:
+        # Stamped with the per-season versions (for derived-result caching) and kept in the frame tier
+        shots = get_merged_frame_cached('shots', shots_by_season, concat_shot_frames)
+        game_log = get_merged_frame_cached('game_log', logs_by_season, concat_game_logs)
+
+    record('frame', name='shots', **frame_stats(shots))
+    record('frame', name='game_log', **frame_stats(game_log))
+    return PlayerData(shots, team_id, career, position, game_log, errors)
+
+
+def load_players_shots(player_names, season):
+    """
+    Shot frames for several players in one season, fetched concurrently on
+    the shared pool through the same cached path as the single-player view.
+    Returns ({player_name: shots}, errors); a failed player gets an empty frame.
+    """
+    futures = {name: submit(get_shot_data, name, season) for name in player_names}
+    wait(futures.values())
+
+    errors = {}
+    frames = {name: _result_or_default(future, (pd.DataFrame(), None), name, errors)[0]
+              for name, future in futures.items()}
+    return frames, errors
+
+
+def concat_game_logs(logs_by_season):
+    """Stacks per-season game logs (most recent first) with a SEASON column."""
+    frames = [log.assign(SEASON=season) for season, log in logs_by_season.items() if not log.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
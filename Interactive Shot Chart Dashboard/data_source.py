@@ -0,0 +1,352 @@
+"""
+Pluggable source for the four stats endpoints the dashboard uses.
+
+Every upstream call (shots, career, game log, player info, league shots) goes
+through get_data_source(), so the same code path can run against:
+
+    live       nba_api against stats.nba.com (default)
+    record     live, and every response is also saved to NBA_DATA_DIR
+    replay     serves responses saved by `record`; no network
+    synthetic  generated data with realistic shapes (see synthetic.py)
+
+Selected with environment variables:
+
+    NBA_DATA_SOURCE      live | record | replay | synthetic
+    NBA_DATA_DIR         recordings directory (default <store root>/recordings)
+    NBA_REPLAY_MISSING   error | synthetic: what replay does for an unrecorded request
+    NBA_FAKE_LATENCY_MS  mean injected latency per call (replay/synthetic)
+    NBA_FAKE_JITTER_MS   uniform +/- jitter around that mean
+    NBA_FAKE_ERROR_RATE  probability in [0, 1] that a call raises InjectedError
+    NBA_FAKE_SEED        seed for latency/error injection and synthetic data
+
+Every fetch goes through upstream.py: identical concurrent requests share one
+call, transient failures are retried with backoff, and network sources (live,
+record) share the process-wide rate limit (NBA_API_RATE).
+
+The shot store still sits in front of the source, so benchmarks that want
+every request to reach the source should point NBA_SHOT_STORE_DIR at an
+empty directory.
+"""
+import hashlib
+import itertools
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import zlib
+from datetime import date
+
+import pandas as pd
+from nba_api.stats.endpoints import shotchartdetail, commonplayerinfo, playergamelog, playercareerstats
+from nba_api.stats.static import players, teams
+
+from shot_store import get_shot_store
+from shot_schema import isolated_copy
+from instrumentation import record, frame_stats
+from upstream import get_single_flight, get_rate_limiter, request_key, with_retries
+from transport import install_transport, endpoint_timeout, request_headers, get_latency_stats
+from synthetic import synthetic_shots, synthetic_game_log, synthetic_career
+
+DATA_SOURCES = ('live', 'record', 'replay', 'synthetic')
+RECORDINGS_DIR = 'recordings'
+
+# endpoint name -> nba_api class; the first result set is the one every caller uses
+ENDPOINTS = {
+    'shotchartdetail': shotchartdetail.ShotChartDetail,
+    'commonplayerinfo': commonplayerinfo.CommonPlayerInfo,
+    'playercareerstats': playercareerstats.PlayerCareerStats,
+    'playergamelog': playergamelog.PlayerGameLog,
+}
+
+
+class InjectedError(ConnectionError):
+    """Simulated upstream failure (NBA_FAKE_ERROR_RATE)."""
+
+
+class MissingRecording(LookupError):
+    """Replay was asked for a request that was never recorded."""
+
+
+class DataSource:
+    """
+    Base class: subclasses implement _fetch(endpoint, params) returning the
+    endpoint's first result set as a DataFrame. The typed helpers below build
+    the exact parameters the dashboard sends, so recordings key consistently.
+    """
+    name = 'base'
+    # Network sources draw from the process-wide rate limiter
+    throttled = False
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    def fetch(self, endpoint, **params):
+        """
+        The endpoint's first result set. Concurrent identical requests share one
+        call (waiters get a shallow copy of its frame), and transient errors are
+        retried before anything is raised.
+        """
+        t0 = time.perf_counter()
+        attempts = itertools.count(1)
+        df, shared = get_single_flight().do(
+            request_key(self.name, endpoint, params),
+            lambda: with_retries(lambda: self._attempt(endpoint, params, next(attempts))))
+        if shared:
+            record('cache', layer='inflight', name=endpoint, result='shared',
+                   ms=round((time.perf_counter() - t0) * 1e3, 2))
+            return isolated_copy(df)
+        return df
+
+    def _attempt(self, endpoint, params, attempt):
+        # One try at the endpoint, recorded as an upstream event (rate-limit wait included in ms).
+        # The latency histogram measures the endpoint, so it excludes the rate-limit wait,
+        # for failed attempts as well as successful ones.
+        t0 = time.perf_counter()
+        waited = 0.0
+        try:
+            if self.throttled:
+                waited = get_rate_limiter().acquire()
+            self._inject()
+            df = self._fetch(endpoint, params)
+        except Exception as e:
+            ms = round((time.perf_counter() - t0) * 1e3, 2)
+            get_latency_stats().observe(endpoint, ms - waited * 1e3, error=True)
+            record('upstream', source=self.name, endpoint=endpoint, attempt=attempt, ms=ms,
+                   throttled_ms=round(waited * 1e3, 2), error=f'{type(e).__name__}: {e}')
+            raise
+        ms = round((time.perf_counter() - t0) * 1e3, 2)
+        get_latency_stats().observe(endpoint, ms - waited * 1e3)
+        record('upstream', source=self.name, endpoint=endpoint, attempt=attempt, ms=ms,
+               throttled_ms=round(waited * 1e3, 2), **frame_stats(df))
+        return df
+
+    def _fetch(self, endpoint, params):
+        raise NotImplementedError
+
+    def _inject(self):
+        if not (self.latency_ms or self.jitter_ms or self.error_rate):
+            return
+        with self._rng_lock:
+            delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            fail = self._rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay / 1000)
+        if fail:
+            raise InjectedError(f"injected failure ({self.name} source, error rate {self.error_rate:g})")
+
+    def shot_chart(self, player_id, season, team_id=0, date_from=None, date_to=None):
+        """
+        Raw ShotChartDetail frame; player_id=0 means every player (of team_id,
+        or of the league with team_id=0). Dates are inclusive.
+        """
+        params = dict(team_id=team_id, player_id=player_id, context_measure_simple='FGA', season_nullable=season)
+        if date_from is not None:
+            params['date_from_nullable'] = date_from.strftime('%m/%d/%Y')
+        if date_to is not None:
+            params['date_to_nullable'] = date_to.strftime('%m/%d/%Y')
+        return self.fetch('shotchartdetail', **params)
+
+    def player_info(self, player_id):
+        """CommonPlayerInfo row as a dict."""
+        df = self.fetch('commonplayerinfo', player_id=player_id)
+        return df.iloc[0].to_dict() if not df.empty else {}
+
+    def career_stats(self, player_id):
+        """PlayerCareerStats per-game regular season totals."""
+        return self.fetch('playercareerstats', player_id=player_id, per_mode36='PerGame')
+
+    def game_log(self, player_id, season, date_from=None):
+        """PlayerGameLog for the regular season (most recent game first), optionally from `date_from` on."""
+        params = dict(player_id=player_id, season=season, season_type_all_star='Regular Season')
+        if date_from is not None:
+            params['date_from_nullable'] = date_from.strftime('%m/%d/%Y')
+        return self.fetch('playergamelog', **params)
+
+
+class NbaApiSource(DataSource):
+    name = 'live'
+    throttled = True
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Pooled keep-alive session for every nba_api request in the process
+        install_transport()
+
+    def _fetch(self, endpoint, params):
+        response = ENDPOINTS[endpoint](**params, headers=request_headers(), timeout=endpoint_timeout(endpoint))
+        return response.get_data_frames()[0]
+
+
+def recording_path(directory, endpoint, params):
+    # One JSON file per (endpoint, params); params are hashed in canonical form
+    digest = hashlib.sha1(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()[:16]
+    return os.path.join(directory, endpoint, f'{digest}.json')
+
+
+class RecordingSource(DataSource):
+    """Passes calls to `inner` and saves each response as {endpoint, params, headers, rowSet}."""
+    name = 'record'
+    throttled = True
+
+    def __init__(self, inner, directory):
+        super().__init__()
+        self.inner = inner
+        self.directory = directory
+
+    def _fetch(self, endpoint, params):
+        df = self.inner._fetch(endpoint, params)
+        path = recording_path(self.directory, endpoint, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        payload = {
+            'endpoint': endpoint,
+            'params': params,
+            'recorded_at': time.time(),
+            'headers': list(df.columns),
+            'rowSet': json.loads(df.to_json(orient='values')),
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        with os.fdopen(fd, 'w') as sink:
+            json.dump(payload, sink)
+        os.replace(tmp_path, path)
+        return df
+
+
+class ReplaySource(DataSource):
+    """Serves recorded responses; unrecorded requests raise MissingRecording or go to `fallback`."""
+    name = 'replay'
+
+    def __init__(self, directory, fallback=None, **injection):
+        super().__init__(**injection)
+        self.directory = directory
+        self.fallback = fallback
+
+    def _fetch(self, endpoint, params):
+        path = recording_path(self.directory, endpoint, params)
+        if not os.path.exists(path):
+            if self.fallback is not None:
+                return self.fallback._fetch(endpoint, params)
+            raise MissingRecording(f"no recording for {endpoint} {params} ({path})")
+        with open(path) as f:
+            payload = json.load(f)
+        return pd.DataFrame(payload['rowSet'], columns=payload['headers'])
+
+
+class SyntheticSource(DataSource):
+    """
+    Generated responses, deterministic per request: the same params always
+    produce the same frame, and a date filter returns a slice of the same
+    season. Games after `today` (default: the real date) have not happened
+    yet, so the current season grows as time passes. Shot volume per
+    player-season is drawn around `shots_per_season`; league requests
+    (player_id=0) return `league_shots`.
+    """
+    name = 'synthetic'
+    POSITIONS = ['Guard', 'Forward', 'Center', 'Guard-Forward', 'Forward-Center']
+
+    def __init__(self, seed=0, shots_per_season=1200, team_shots=7000, league_shots=200_000, today=None, **injection):
+        super().__init__(seed=seed, **injection)
+        self.seed = seed
+        self.shots_per_season = shots_per_season
+        self.team_shots = team_shots
+        self.league_shots = league_shots
+        self.today = today
+
+    def _seed(self, endpoint, params):
+        # Date filters select from the same generated season rather than reseeding it
+        params = {k: v for k, v in params.items() if not k.startswith('date_')}
+        return zlib.crc32(json.dumps([endpoint, params, self.seed], sort_keys=True, default=str).encode())
+
+    def _played(self, game_dates, params):
+        # Mask of games in [date_from, min(date_to, today)]
+        dates = pd.Series(game_dates)
+        mask = dates <= pd.Timestamp(self.today or date.today())
+        date_from, date_to = params.get('date_from_nullable'), params.get('date_to_nullable')
+        if date_from:
+            mask &= dates >= pd.to_datetime(date_from, format='%m/%d/%Y')
+        if date_to:
+            mask &= dates <= pd.to_datetime(date_to, format='%m/%d/%Y')
+        return mask.to_numpy()
+
+    def _fetch(self, endpoint, params):
+        seed = self._seed(endpoint, params)
+        player_id = params.get('player_id', 0)
+        player = players.find_player_by_id(player_id) if player_id else None
+        name = player['full_name'] if player else 'Synthetic Player'
+
+        if endpoint == 'shotchartdetail':
+            season = params['season_nullable']
+            team_id = params.get('team_id', 0)
+            if player_id:
+                n = int(self.shots_per_season * (0.5 + (seed % 100) / 100))
+                df = synthetic_shots(n, seed=seed, player_id=player_id, player_name=name, season=season, compact=False)
+            elif team_id:
+                team = teams.find_team_name_by_id(team_id)
+                abbreviation = team['abbreviation'] if team else 'DEN'
+                roster = [((team_id % 1000) * 100 + k, f"{abbreviation} Player {k + 1}") for k in range(13)]
+                df = synthetic_shots(self.team_shots, seed=seed, team_id=team_id, team=abbreviation, season=season,
+                                     compact=False, roster=roster)
+            else:
+                df = synthetic_shots(self.league_shots, seed=seed, player_id=0, season=season, compact=False)
+            return df[self._played(pd.to_datetime(df['GAME_DATE'], format='%Y%m%d'), params)].reset_index(drop=True)
+        if endpoint == 'playergamelog':
+            df = synthetic_game_log(player_id, params['season'], seed=seed)
+            return df[self._played(pd.to_datetime(df['GAME_DATE'], format='%b %d, %Y'), params)].reset_index(drop=True)
+        if endpoint == 'playercareerstats':
+            return synthetic_career(player_id, seed=seed)
+        if endpoint == 'commonplayerinfo':
+            return pd.DataFrame([{'PERSON_ID': player_id, 'DISPLAY_FIRST_LAST': name,
+                                  'POSITION': self.POSITIONS[seed % len(self.POSITIONS)]}])
+        raise KeyError(f"unknown endpoint {endpoint!r}")
+
+
+def _env_float(name, default=0.0):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def make_data_source(kind=None, directory=None):
+    """Builds a source from arguments, falling back to the NBA_* environment variables."""
+    kind = kind or os.environ.get('NBA_DATA_SOURCE', 'live')
+    directory = directory or os.environ.get('NBA_DATA_DIR') or os.path.join(get_shot_store().root, RECORDINGS_DIR)
+    seed = os.environ.get('NBA_FAKE_SEED')
+    injection = dict(latency_ms=_env_float('NBA_FAKE_LATENCY_MS'), jitter_ms=_env_float('NBA_FAKE_JITTER_MS'),
+                     error_rate=_env_float('NBA_FAKE_ERROR_RATE'))
+
+    if kind == 'live':
+        return NbaApiSource()
+    if kind == 'record':
+        return RecordingSource(NbaApiSource(), directory)
+    if kind == 'synthetic':
+        return SyntheticSource(seed=int(seed) if seed else 0, **injection)
+    if kind == 'replay':
+        fallback = SyntheticSource(seed=int(seed) if seed else 0) \
+            if os.environ.get('NBA_REPLAY_MISSING') == 'synthetic' else None
+        return ReplaySource(directory, fallback=fallback, seed=seed, **injection)
+    raise ValueError(f"NBA_DATA_SOURCE must be one of {', '.join(DATA_SOURCES)}, got {kind!r}")
+
+
+_source = None
+_source_lock = threading.Lock()
+
+
+def get_data_source():
+    """Process-wide source, built from the environment on first use."""
+    global _source
+    with _source_lock:
+        if _source is None:
+            _source = make_data_source()
+        return _source
+
+
+def set_data_source(source):
+    """Replaces the process-wide source (benchmarks, ingest --source). Returns the previous one."""
+    global _source
+    with _source_lock:
+        previous, _source = _source, source
+        return previous
@@ -0,0 +1,178 @@
+"""
+Derived-result cache keyed by dataset version instead of frame contents.
+
+Fetched frames carry `data_key` (what the data is, e.g. ('shots', player_id,
+season)) and `data_version` (the store version) in df.attrs, so looking up a
+derived result is a dict access rather than hashing the whole frame the way
+st.cache_data does for DataFrame arguments.
+
+Results are cached frozen and handed out as copies nothing can write through:
+numpy arrays anywhere in a result are marked non-writeable; DataFrames are
+copied with shot_schema.isolated_copy (shallow under copy-on-write); and
+dataclasses and result objects (TeamAggregate, ZoneMatrix, ShotFilterIndex, ...)
+are re-created around copies of their lists, dicts and sets, so mutating a
+handed-out result never changes what the next caller gets.
+"""
+import copy
+import dataclasses
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from instrumentation import record
+from shot_schema import isolated_copy
+
+DERIVED_CACHE_ENTRIES = 1024
+
+
+def data_stamp(df):
+    """(data_key, data_version, rows) for a versioned frame, else None."""
+    key, version = df.attrs.get('data_key'), df.attrs.get('data_version')
+    if key is None or version is None:
+        return None
+    return key, version, len(df)
+
+
+def combine_stamps(frames):
+    """attrs for a frame built from several versioned frames (None if any is unversioned)."""
+    stamps = [data_stamp(df) for df in frames]
+    if not stamps or any(s is None for s in stamps):
+        return {}
+    return {'data_key': tuple(s[0] for s in stamps), 'data_version': tuple(s[1] for s in stamps)}
+
+
+def _is_result_object(value):
+    # Instances of the app's result classes (not pandas/numpy objects, which are handled directly)
+    return hasattr(value, '__dict__') and not isinstance(value, (type, pd.DataFrame, pd.Series, pd.Index, np.ndarray))
+
+
+def _freeze(value):
+    """Marks every numpy array reachable from a result non-writeable (in place)."""
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list, set, frozenset)):
+        for item in value:
+            _freeze(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            _freeze(item)
+    elif _is_result_object(value):
+        for item in vars(value).values():
+            _freeze(item)
+    return value
+
+
+def _hand_out(value):
+    """
+    A copy of a cached (frozen) result that shares only read-only data with it:
+    frames are isolated copies, containers are copied, arrays (non-writeable) are shared.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return isolated_copy(value)
+    if isinstance(value, tuple):
+        items = [_hand_out(item) for item in value]
+        return type(value)(*items) if hasattr(value, '_fields') else tuple(items)
+    if isinstance(value, (list, set)):
+        return type(value)(_hand_out(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _hand_out(item) for key, item in value.items()}
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.replace(value, **{f.name: _hand_out(getattr(value, f.name))
+                                             for f in dataclasses.fields(value) if f.init})
+    if _is_result_object(value):
+        out = copy.copy(value)
+        vars(out).update({name: _hand_out(item) for name, item in vars(value).items()})
+        return out
+    return value
+
+
+class DerivedCache:
+    """
+    Bounded LRU of derived results. One entry per (kind, data keys, params)
+    holding the latest version's result; a newer version replaces it.
+
+    get(kind, compute, *frames, update=None, params=()):
+        compute(*frames) builds the result from scratch. For a single frame
+        that only appended rows to the cached version (attrs 'appended_from'),
+        update(previous_result, tail) builds the new result from the new rows
+        instead, and must not modify previous_result.
+
+    put(kind, result, *frames, params=()):
+        stores a result computed outside get() under the frames' versions.
+    """
+
+    def __init__(self, max_entries=DERIVED_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.updates = 0
+
+    def get(self, kind, compute, *frames, update=None, params=()):
+        stamps = [data_stamp(df) for df in frames]
+        if any(s is None for s in stamps):
+            # Unversioned input: nothing cheap to key on, compute without caching
+            record('cache', layer='derived', name=kind, result='uncached')
+            return compute(*frames)
+
+        key = (kind, tuple(s[0] for s in stamps), params)
+        version = tuple((s[1], s[2]) for s in stamps)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                record('cache', layer='derived', name=kind, result='hit')
+                return _hand_out(entry[1])
+
+        result = None
+        if update is not None and entry is not None and len(frames) == 1:
+            previous_rows = entry[0][0][1]
+            if frames[0].attrs.get('appended_from') == previous_rows:
+                result = update(entry[1], frames[0].iloc[previous_rows:])
+                self.updates += 1
+                record('cache', layer='derived', name=kind, result='update',
+                       rows=len(frames[0]) - previous_rows)
+        if result is None:
+            result = compute(*frames)
+            self.misses += 1
+            record('cache', layer='derived', name=kind, result='miss')
+
+        _freeze(result)
+        with self._lock:
+            self._entries[key] = (version, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return _hand_out(result)
+
+    def put(self, kind, result, *frames, params=()):
+        """
+        Seeds the entry for these frames' versions with a result built elsewhere
+        (e.g. accumulated while the data streamed in). Unversioned frames are ignored.
+        """
+        stamps = [data_stamp(df) for df in frames]
+        if any(s is None for s in stamps):
+            return
+        key = (kind, tuple(s[0] for s in stamps), params)
+        _freeze(result)
+        with self._lock:
+            self._entries[key] = (tuple((s[1], s[2]) for s in stamps), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+@lru_cache(maxsize=None)
+def get_derived_cache():
+    """Process-wide cache shared by every session."""
+    return DerivedCache()
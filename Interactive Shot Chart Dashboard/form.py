@@ -0,0 +1,203 @@
+"""
+Form analytics over game logs: rolling and EWMA scoring, rolling shooting
+percentages and hot/cold streaks.
+
+Every statistic works on a padded [player, game] matrix (games oldest first,
+left-aligned, zeros past each player's last game), so one call covers a whole
+roster and every window at once:
+
+- rolling sums are differences of one cumulative sum, gathered for all
+  windows with a single fancy index ([window, player, game]);
+- rolling FG% / 3P% / TS% are ratios of rolling makes and attempts, so a
+  window's percentage weights games by volume instead of averaging per-game
+  percentages;
+- EWMA is pandas' ewm down the game axis of the padded matrix, every player
+  at once (padding only follows a player's last game, so it never reaches a
+  valid position);
+- streak lengths come from a running maximum over the positions where a run
+  breaks, with no per-game Python logic.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+ROLLING_WINDOWS = (5, 10, 20)
+EWMA_SPANS = (5, 10)
+# A game is hot (cold) when PTS is this many standard deviations above (below) the player's average
+STREAK_Z = 0.5
+# Free throws that end a possession, in the true-shooting denominator
+TS_FTA_WEIGHT = 0.44
+
+GAME_LOG_STATS = ['PTS', 'FGM', 'FGA', 'FG3M', 'FG3A', 'FTM', 'FTA']
+
+
+@dataclass(frozen=True)
+class FormReport:
+    """
+    Form analytics for several players. Arrays are indexed [player, game]
+    (oldest game first) or [window/span, player, game]; positions past a
+    player's last game (valid == False) are NaN.
+    """
+    players: list
+    dates: np.ndarray             # datetime64[D], [player, game]
+    valid: np.ndarray             # bool, [player, game]
+    games: np.ndarray             # games played, [player]
+    pts: np.ndarray               # [player, game]
+    windows: tuple
+    rolling_pts: np.ndarray       # mean PTS over the last w games, [window, player, game]
+    rolling_fg_pct: np.ndarray
+    rolling_fg3_pct: np.ndarray
+    rolling_ts_pct: np.ndarray
+    spans: tuple
+    ewma_pts: np.ndarray          # [span, player, game]
+    season_pts: np.ndarray        # average PTS, [player]
+    season_ts_pct: np.ndarray     # [player]
+    longest_hot: np.ndarray       # [player]
+    longest_cold: np.ndarray      # [player]
+    current_streak: np.ndarray    # games in the current run, + hot / - cold / 0 neither, [player]
+
+    def player_frame(self, player):
+        """One player's games (oldest first) with the rolling, EWMA and hot/cold columns, for charts."""
+        i = self.players.index(player)
+        n = int(self.games[i])
+        out = {'GAME_DATE': self.dates[i, :n], 'PTS': self.pts[i, :n]}
+        for k, w in enumerate(self.windows):
+            out[f'PTS_L{w}'] = self.rolling_pts[k, i, :n]
+            out[f'TS_PCT_L{w}'] = self.rolling_ts_pct[k, i, :n]
+        for k, span in enumerate(self.spans):
+            out[f'PTS_EWMA{span}'] = self.ewma_pts[k, i, :n]
+        return pd.DataFrame(out)
+
+    def summary_frame(self):
+        """One row per player: season vs recent scoring, TS% and streaks."""
+        last = np.maximum(self.games - 1, 0)
+        rows = np.arange(len(self.players))
+        out = {'PLAYER': self.players, 'GP': self.games, 'PPG': self.season_pts}
+        for k, w in enumerate(self.windows):
+            out[f'L{w} PPG'] = self.rolling_pts[k, rows, last]
+        for k, span in enumerate(self.spans):
+            out[f'EWMA{span} PTS'] = self.ewma_pts[k, rows, last]
+        out['TS%'] = self.season_ts_pct
+        out[f'L{self.windows[-1]} TS%'] = self.rolling_ts_pct[-1, rows, last]
+        out['LONGEST HOT'] = self.longest_hot
+        out['LONGEST COLD'] = self.longest_cold
+        out['STREAK'] = self.current_streak
+        return pd.DataFrame(out)
+
+
+def game_log_matrix(game_logs):
+    """
+    Stacks {player: game_log} (PlayerGameLog frames, any order, any number of
+    seasons) into ([players], dates, valid, {stat: [player, game] float array}).
+    """
+    players = [name for name, log in game_logs.items() if log is not None and not log.empty]
+    logs = [game_logs[name] for name in players]
+    lengths = np.array([len(log) for log in logs], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+
+    # Flat position of every game in the padded matrix, after sorting each log oldest first
+    dates = [pd.to_datetime(log['GAME_DATE'], format='%b %d, %Y').to_numpy() for log in logs]
+    order = [np.argsort(d, kind='stable') for d in dates]
+    flat = np.concatenate([i * width + np.arange(n) for i, n in enumerate(lengths)]) if logs else np.empty(0, np.int64)
+
+    def stack(values, fill, dtype):
+        out = np.full(len(players) * width, fill, dtype=dtype)
+        if logs:
+            out[flat] = np.concatenate([v[o] for v, o in zip(values, order)])
+        return out.reshape(len(players), width)
+
+    stats = {stat: stack([log[stat].to_numpy(dtype=float) for log in logs], 0.0, np.float64)
+             for stat in GAME_LOG_STATS}
+    day = stack([d.astype('datetime64[D]') for d in dates], np.datetime64('NaT'), 'datetime64[D]')
+    valid = np.arange(width) < lengths[:, None]
+    return players, day, valid, stats
+
+
+def rolling_sums(values, windows):
+    """Trailing sums over each window: [window, player, game] from one cumulative sum."""
+    csum = np.concatenate([np.zeros((values.shape[0], 1)), np.cumsum(values, axis=1)], axis=1)
+    end = np.arange(1, values.shape[1] + 1)
+    start = np.maximum(end[None, :] - np.asarray(windows)[:, None], 0)   # [window, game]
+    return csum[:, end][None, :, :] - csum[:, start].transpose(1, 0, 2)
+
+
+def _full_windows(valid, windows):
+    # True where the window is fully inside the player's games (earlier games would be a partial window)
+    position = np.arange(valid.shape[1])
+    return valid[None, :, :] & (position[None, None, :] >= np.asarray(windows)[:, None, None] - 1)
+
+
+def ewma(values, valid, spans):
+    """
+    Exponentially weighted mean over games (pandas' adjust=True weights),
+    [span, player, game]. One ewm call per span covers every player.
+    """
+    out = np.full((len(spans), *values.shape), np.nan)
+    games = pd.DataFrame(values.T)   # [game, player]
+    for k, span in enumerate(spans):
+        out[k] = games.ewm(span=span, adjust=True).mean().to_numpy().T
+    out[:, ~valid] = np.nan
+    return out
+
+
+def run_lengths(flags):
+    """Length of the run of True ending at each game, [player, game]."""
+    position = np.arange(flags.shape[1])
+    last_break = np.maximum.accumulate(np.where(flags, -1, position), axis=1)
+    return np.where(flags, position - last_break, 0)
+
+
+def _ratio(num, den):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(den > 0, num / den, np.nan)
+
+
+def form_report(game_logs, windows=ROLLING_WINDOWS, spans=EWMA_SPANS, streak_z=STREAK_Z):
+    """FormReport for {player: game_log}; players without games are dropped."""
+    windows, spans = tuple(windows), tuple(spans)
+    players, dates, valid, stats = game_log_matrix(game_logs)
+    games = valid.sum(axis=1)
+    pts = stats['PTS']
+
+    sums = {stat: rolling_sums(stats[stat], windows) for stat in GAME_LOG_STATS}
+    full = _full_windows(valid, windows)
+    rolling_pts = np.where(full, sums['PTS'] / np.asarray(windows)[:, None, None], np.nan)
+    ts_attempts = 2.0 * (sums['FGA'] + TS_FTA_WEIGHT * sums['FTA'])
+    rolling_fg_pct = np.where(full, _ratio(sums['FGM'], sums['FGA']), np.nan)
+    rolling_fg3_pct = np.where(full, _ratio(sums['FG3M'], sums['FG3A']), np.nan)
+    rolling_ts_pct = np.where(full, _ratio(sums['PTS'], ts_attempts), np.nan)
+
+    season_pts = _ratio(pts.sum(axis=1), games)
+    season_ts_pct = _ratio(pts.sum(axis=1), 2.0 * (stats['FGA'].sum(axis=1) + TS_FTA_WEIGHT * stats['FTA'].sum(axis=1)))
+
+    # Hot/cold relative to each player's own scoring spread (padding is masked out of both)
+    mean = np.nan_to_num(season_pts)[:, None]
+    std = np.sqrt(_ratio((((pts - mean) * valid) ** 2).sum(axis=1), np.maximum(games - 1, 0)))
+    std = np.nan_to_num(std)[:, None]
+    hot = valid & (pts > mean + streak_z * std)
+    cold = valid & (pts < mean - streak_z * std)
+    hot_runs, cold_runs = run_lengths(hot), run_lengths(cold)
+    last = np.maximum(games - 1, 0)
+    rows = np.arange(len(players))
+    has_games = games > 0
+
+    return FormReport(
+        players=players,
+        dates=dates,
+        valid=valid,
+        games=games,
+        pts=np.where(valid, pts, np.nan),
+        windows=windows,
+        rolling_pts=rolling_pts,
+        rolling_fg_pct=rolling_fg_pct,
+        rolling_fg3_pct=rolling_fg3_pct,
+        rolling_ts_pct=rolling_ts_pct,
+        spans=spans,
+        ewma_pts=ewma(pts, valid, spans),
+        season_pts=season_pts,
+        season_ts_pct=season_ts_pct,
+        longest_hot=hot_runs.max(axis=1, initial=0),
+        longest_cold=cold_runs.max(axis=1, initial=0),
+        current_streak=np.where(has_games, hot_runs[rows, last] - cold_runs[rows, last], 0),
+    )
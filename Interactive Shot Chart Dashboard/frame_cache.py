@@ -0,0 +1,211 @@
+"""
+Size-bounded in-process tier for fetched frames (shots, game logs, career).
+
+st.cache_data can only bound its entry count, and it keeps pickled copies
+that are unpickled again on every hit. SizedFrameCache holds the frames
+themselves, charges each entry its deep byte size against one process-wide
+budget, and evicts least recently (LRU) or least frequently (LFU) used
+entries when an insert would exceed it. Hits are handed out as
+shot_schema.isolated_copy copies, so a caller modifying one never reaches
+the cached frame.
+
+Evicted entries go to a disk tier instead of being dropped. Frames that
+the shot store already holds (everything cache_utils.fetch_* returns) are
+just released, because the store is their disk copy. Any other frame (the
+merged multi-season frames) is written to `<store root>/spill/` with its
+df.attrs, so its version stamp survives, and read back on its next lookup.
+
+Configured with environment variables:
+
+    NBA_FRAME_CACHE_MB      memory budget (default 512)
+    NBA_FRAME_CACHE_POLICY  lru | lfu (default lru)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from shot_schema import frame_nbytes, isolated_copy
+from shot_store import get_shot_store
+
+DEFAULT_BUDGET_MB = 512
+EVICTION_POLICIES = ('lru', 'lfu')
+SPILL_KIND = 'spill'
+
+
+def _attrs_to_json(value):
+    # df.attrs hold nested tuples (version stamps); JSON would turn them into lists
+    if isinstance(value, tuple):
+        return {'__tuple__': [_attrs_to_json(v) for v in value]}
+    if isinstance(value, list):
+        return [_attrs_to_json(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _attrs_to_json(v) for k, v in value.items()}
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _attrs_from_json(value):
+    if isinstance(value, dict):
+        if set(value) == {'__tuple__'}:
+            return tuple(_attrs_from_json(v) for v in value['__tuple__'])
+        return {k: _attrs_from_json(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_attrs_from_json(v) for v in value]
+    return value
+
+
+class _Entry:
+    __slots__ = ('frame', 'nbytes', 'expires_at', 'persisted', 'hits', 'last_used')
+
+    def __init__(self, frame, nbytes, expires_at, persisted):
+        self.frame = frame
+        self.nbytes = nbytes
+        self.expires_at = expires_at
+        self.persisted = persisted
+        self.hits = 0
+        self.last_used = time.monotonic()
+
+
+class SizedFrameCache:
+    """
+    get(key) / put(key, frame, ttl=None, persisted=False) over tuple keys such
+    as ('shots', player_id, season). `ttl` is in seconds (None = until evicted).
+    `persisted` marks frames that already live in the shot store, so eviction
+    doesn't write them again.
+    """
+
+    def __init__(self, budget_bytes, policy='lru', spill_store=None):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"policy must be one of {', '.join(EVICTION_POLICIES)}, got {policy!r}")
+        self.budget_bytes = budget_bytes
+        self.policy = policy
+        self.spill_store = spill_store
+        self._entries = OrderedDict()
+        self._spilled = {}            # key -> expires_at, for entries written to the spill tier
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = self.misses = self.spill_hits = 0
+        self.evictions = self.evicted_bytes = self.spill_writes = 0
+
+    def get(self, key):
+        """An isolated copy of the cached frame, or None (absent or expired)."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry.expires_at is None or entry.expires_at > now):
+                entry.hits += 1
+                entry.last_used = time.monotonic()
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return isolated_copy(entry.frame)
+            if entry is not None:
+                self._drop(key)
+            spilled = self._spilled.pop(key, None)
+            self.misses += 1
+
+        if spilled is None or self.spill_store is None:
+            return None
+        cached = self.spill_store.read(SPILL_KIND, *key)
+        if cached is None:
+            return None
+        frame, meta = cached
+        frame.attrs = _attrs_from_json(meta.get('attrs') or {})
+        with self._lock:
+            self.spill_hits += 1
+            if frame_nbytes(frame) > self.budget_bytes:
+                # Too large to hold: leave it on disk rather than rewriting it on every read
+                self._spilled[key] = spilled
+                return frame
+        self.put(key, frame, ttl=None if spilled is False else spilled - now)
+        return isolated_copy(frame)
+
+    def put(self, key, frame, ttl=None, persisted=False):
+        """
+        Caches `frame` (the caller must not modify it afterwards). A frame larger
+        than the whole budget is not held in memory; it goes straight to the disk tier.
+        """
+        entry = _Entry(frame, frame_nbytes(frame), None if ttl is None else time.time() + ttl, persisted)
+        to_spill = []
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._spilled.pop(key, None)
+            self._entries[key] = entry
+            self.bytes += entry.nbytes
+            while self.bytes > self.budget_bytes:
+                victim_key = key if entry.nbytes > self.budget_bytes else self._victim(protect=key)
+                victim = self._drop(victim_key)
+                self.evictions += 1
+                self.evicted_bytes += victim.nbytes
+                if not victim.persisted and self.spill_store is not None:
+                    to_spill.append((victim_key, victim))
+                    self._spilled[victim_key] = False if victim.expires_at is None else victim.expires_at
+
+        # Disk writes outside the lock
+        for victim_key, victim in to_spill:
+            ttl = None if victim.expires_at is None else max(victim.expires_at - time.time(), 0)
+            self.spill_store.write(SPILL_KIND, *victim_key, frame=victim.frame, ttl=ttl,
+                                   attrs=_attrs_to_json(victim.frame.attrs))
+            with self._lock:
+                self.spill_writes += 1
+
+    def _victim(self, protect):
+        # Never the entry being inserted: under LFU it would always have the fewest hits
+        candidates = (k for k in self._entries if k != protect)
+        if self.policy == 'lru':
+            return next(candidates)
+        # LFU: fewest hits, least recently used among those
+        return min(candidates, key=lambda k: (self._entries[k].hits, self._entries[k].last_used))
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        self.bytes -= entry.nbytes
+        return entry
+
+    def invalidate(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._spilled.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._spilled.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def metrics(self):
+        """Occupancy and hit/eviction counters since startup."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'policy': self.policy,
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'budget_bytes': self.budget_bytes,
+                'occupancy': self.bytes / self.budget_bytes if self.budget_bytes else 0.0,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else None,
+                'evictions': self.evictions,
+                'evicted_bytes': self.evicted_bytes,
+                'spilled_entries': len(self._spilled),
+                'spill_writes': self.spill_writes,
+                'spill_hits': self.spill_hits,
+            }
+
+
+@lru_cache(maxsize=None)
+def get_frame_cache():
+    """Process-wide frame tier shared by every session, configured from the environment."""
+    budget_mb = float(os.environ.get('NBA_FRAME_CACHE_MB') or DEFAULT_BUDGET_MB)
+    policy = os.environ.get('NBA_FRAME_CACHE_POLICY', 'lru').lower()
+    return SizedFrameCache(int(budget_mb * 1024 * 1024), policy=policy, spill_store=get_shot_store())
@@ -0,0 +1,213 @@
+"""
+Bulk ingest: pre-populates the local shot store for every active player over a
+season range, using the same fetch path as the dashboard (cache_utils.fetch_*).
+
+Progress is checkpointed to a JSON-lines file, one line per finished
+(kind, player_id, season) task, so an interrupted run resumes where it stopped.
+Only completed seasons are skipped on the checkpoint's word: in-season data
+changes, so those tasks always run and are refreshed once their store entry
+expires. Entries already fresh in the store are skipped without an API call.
+
+Usage:
+    python ingest.py --first-season 2019-20 --workers 4 --rate 1.5
+    python ingest.py --seasons 2024-25 --kinds shots --players "Nikola Jokić" "Luka Dončić"
+    python ingest.py --base-url http://127.0.0.1:8765/stats/{endpoint}   # local stand-in API
+    python ingest.py --source record --seasons 2024-25   # also save raw responses for replay
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from nba_api.stats.library.http import NBAStatsHTTP
+from streamlit.logger import set_log_level
+
+from cache_utils import (fetch_shot_frame, fetch_game_log_frame, get_player_registry,
+                         season_range, current_season, is_past_season, FIRST_SHOT_SEASON)
+from shot_schema import SHOT_SCHEMA_VERSION
+from shot_store import get_shot_store
+from data_source import make_data_source, set_data_source, DATA_SOURCES
+from upstream import get_rate_limiter
+from transport import get_latency_stats
+
+CHECKPOINT_FILE = 'ingest_checkpoint.jsonl'
+
+# kind -> (store kind, fetch function)
+INGEST_KINDS = {
+    'shots': ('shots', fetch_shot_frame),
+    'game_log': ('game_log', fetch_game_log_frame),
+}
+
+
+class Checkpoint:
+    """Append-only JSON-lines log of finished tasks."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.done = set()
+        if os.path.exists(path):
+            with open(path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # torn last line from a killed run
+                    if entry.get('status') in ('ok', 'cached'):
+                        self.done.add((entry['kind'], entry['player_id'], entry['season']))
+
+    def record(self, **entry):
+        with self.lock:
+            with open(self.path, 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+
+def upstream_calls():
+    """Upstream attempts made so far in this process, retries and failures included."""
+    return sum(summary['calls'] for summary in get_latency_stats().summary().values())
+
+
+class Progress:
+    """
+    Thread-safe counters for throughput reporting. Requests are the upstream
+    attempts the data source actually made (a task may make several, or none
+    when the store or an in-flight call already had its data).
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self.started = time.monotonic()
+        self.calls_before = upstream_calls()
+        self.lock = threading.Lock()
+        self.done = self.shots = self.cached = 0
+        self.failures = []
+
+    @property
+    def requests(self):
+        return upstream_calls() - self.calls_before
+
+    def add(self, status, kind, rows=0, error=None, task=None):
+        with self.lock:
+            self.done += 1
+            if status == 'ok':
+                if kind == 'shots':
+                    self.shots += rows
+            elif status == 'cached':
+                self.cached += 1
+            else:
+                self.failures.append((task, error))
+
+    def line(self):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        requests = self.requests
+        return (f"{self.done:,}/{self.total:,} tasks | {requests:,} requests, {requests / elapsed:.2f} req/s | "
+                f"{self.shots / elapsed:,.0f} shots/s | {self.cached:,} cached | {len(self.failures):,} failed | "
+                f"{elapsed:,.0f}s")
+
+
+def build_tasks(player_names, seasons, kinds, checkpoint):
+    registry = get_player_registry()
+    tasks, skipped = [], 0
+    for name in player_names:
+        player_id = registry.get_id(name)
+        if player_id is None:
+            print(f"Unknown player: {name}")
+            continue
+        for season in seasons:
+            for kind in kinds:
+                # A finished in-season task may be stale by now; run_task checks the store's TTL instead
+                if is_past_season(season) and (kind, player_id, season) in checkpoint.done:
+                    skipped += 1
+                    continue
+                tasks.append((kind, player_id, season))
+    return tasks, skipped
+
+
+def run_task(task, store):
+    kind, player_id, season = task
+    store_kind, fetch = INGEST_KINDS[kind]
+
+    # Fresh store entries need no API call (shots must also match the current schema)
+    meta = store.read_meta(store_kind, player_id, season)
+    if store.is_fresh(meta) and (kind != 'shots' or meta.get('schema') == SHOT_SCHEMA_VERSION):
+        return 'cached', meta.get('rows', 0)
+
+    # Rate limiting, retries and coalescing happen in the data source (upstream.py)
+    df = fetch(player_id, season)
+    return 'ok', len(df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', nargs='+', help="explicit seasons (overrides --first/--last-season)")
+    parser.add_argument('--first-season', default=FIRST_SHOT_SEASON)
+    parser.add_argument('--last-season', default=None, help="defaults to the current season")
+    parser.add_argument('--players', nargs='+', help="player names (default: every active player)")
+    parser.add_argument('--kinds', nargs='+', choices=sorted(INGEST_KINDS), default=['shots', 'game_log'])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--rate', type=float, default=1.0, help="max requests per second to stats.nba.com (0 = unlimited); shared by all workers")
+    parser.add_argument('--checkpoint', default=None, help=f"checkpoint file (default <store root>/{CHECKPOINT_FILE})")
+    parser.add_argument('--source', choices=DATA_SOURCES, default=None, help="data source (default $NBA_DATA_SOURCE or live)")
+    parser.add_argument('--base-url', default=None, help="stats API URL template, e.g. a local stand-in")
+    parser.add_argument('--report-every', type=float, default=10.0, help="seconds between progress lines")
+    args = parser.parse_args()
+
+    # st.cache_* functions warn about the missing Streamlit runtime when used headless
+    set_log_level('error')
+
+    if args.base_url:
+        NBAStatsHTTP.base_url = args.base_url
+    if args.source:
+        set_data_source(make_data_source(args.source))
+
+    store = get_shot_store()
+    os.makedirs(store.root, exist_ok=True)
+    checkpoint = Checkpoint(args.checkpoint or os.path.join(store.root, CHECKPOINT_FILE))
+
+    seasons = args.seasons or season_range(first=args.first_season, last=args.last_season or current_season())
+    player_names = args.players or get_player_registry().active_names()
+
+    tasks, skipped = build_tasks(player_names, seasons, args.kinds, checkpoint)
+    print(f"{len(tasks):,} tasks to run ({skipped:,} completed seasons already done per checkpoint), "
+          f"{args.workers} workers, {args.rate or 'unlimited'} req/s")
+
+    # Ingest runs alone, so it takes the whole process-wide budget with no burst
+    get_rate_limiter().configure(args.rate, burst=1)
+    progress = Progress(len(tasks))
+    last_report = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(run_task, task, store): task for task in tasks}
+        try:
+            for future in as_completed(futures):
+                kind, player_id, season = task = futures[future]
+                try:
+                    status, rows = future.result()
+                    progress.add(status, kind, rows)
+                    checkpoint.record(kind=kind, player_id=player_id, season=season, status=status, rows=rows)
+                except Exception as e:
+                    progress.add('failed', kind, error=str(e), task=task)
+                    checkpoint.record(kind=kind, player_id=player_id, season=season, status='failed', error=str(e))
+
+                if time.monotonic() - last_report >= args.report_every:
+                    print(progress.line(), flush=True)
+                    last_report = time.monotonic()
+        except KeyboardInterrupt:
+            print("Interrupted; finished tasks are checkpointed. Re-run the same command to resume.")
+            for future in futures:
+                future.cancel()
+            raise
+
+    print(progress.line())
+    for task, error in progress.failures[:20]:
+        print(f"FAILED {task}: {error}")
+    if len(progress.failures) > 20:
+        print(f"... and {len(progress.failures) - 20} more (see checkpoint file)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+Per-rerun instrumentation: stage wall times, cache hit/miss/stale results,
+upstream calls and frame sizes, collected into one Trace per script run.
+
+The active trace lives in a context variable, so anything called during the
+rerun (including fetches on the data_loader pool, which copies the context)
+records into it without passing it around. With no active trace every call is
+a no-op, which keeps the CLIs and benchmarks unaffected.
+
+Set NBA_TRACE_LOG to a file path to append each finished trace as one JSON line.
+"""
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+from frame_cache import get_frame_cache
+from transport import get_latency_stats
+
+TRACE_LOG_ENV = 'NBA_TRACE_LOG'
+
+_trace = contextvars.ContextVar('nba_trace', default=None)
+# Set by traced_cache around a st.cache_* call; the cached body flips it via note_miss()
+_miss_probe = contextvars.ContextVar('nba_miss_probe', default=None)
+
+
+class Trace:
+    """Events recorded during one rerun. Safe to append to from pool threads."""
+
+    def __init__(self, label=''):
+        self.label = label
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+        self.total_ms = None
+        self.cpu_ms = None
+        self.events = []
+        self._lock = threading.Lock()
+
+    def add(self, kind, **fields):
+        fields['kind'] = kind
+        fields['at_ms'] = round((time.perf_counter() - self._t0) * 1e3, 2)
+        fields['thread'] = threading.current_thread().name
+        with self._lock:
+            self.events.append(fields)
+
+    def finish(self):
+        self.total_ms = round((time.perf_counter() - self._t0) * 1e3, 2)
+        self.cpu_ms = round((time.process_time() - self._cpu0) * 1e3, 2)
+        return self
+
+    def of_kind(self, kind):
+        with self._lock:
+            return [e for e in self.events if e['kind'] == kind]
+
+    def summary(self):
+        cache = Counter(f"{e['layer']}:{e['result']}" for e in self.of_kind('cache'))
+        upstream = self.of_kind('upstream')
+        return {
+            'total_ms': self.total_ms,
+            'cpu_ms': self.cpu_ms,
+            'cache': dict(cache),
+            'upstream_calls': len(upstream),
+            'upstream_errors': sum(1 for e in upstream if e.get('error')),
+            'upstream_ms': round(sum(e['ms'] for e in upstream), 2),
+        }
+
+    def to_dict(self):
+        with self._lock:
+            events = list(self.events)
+        return {'label': self.label, 'started_at': self.started_at, 'summary': self.summary(), 'events': events}
+
+
+def start_trace(label=''):
+    """Starts a new trace for the current context (call once at the top of a rerun)."""
+    trace = Trace(label)
+    _trace.set(trace)
+    return trace
+
+
+def current_trace():
+    return _trace.get()
+
+
+def record(kind, **fields):
+    trace = _trace.get()
+    if trace is not None:
+        trace.add(kind, **fields)
+
+
+@contextmanager
+def stage(name, **fields):
+    """
+    Times the block as a named stage (wall ms, and process CPU ms, which also
+    counts pool threads working meanwhile). The yielded dict can be filled with extra fields.
+    """
+    t0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        yield fields
+    finally:
+        record('stage', name=name, ms=round((time.perf_counter() - t0) * 1e3, 2),
+               cpu_ms=round((time.process_time() - cpu0) * 1e3, 2), **fields)
+
+
+def frame_stats(df):
+    """Row count and shallow byte size of a frame (deep=False: no per-string scan)."""
+    if df is None:
+        return {'rows': 0, 'bytes': 0}
+    return {'rows': len(df), 'bytes': int(df.memory_usage(index=True, deep=False).sum())}
+
+
+def note_miss():
+    """Called at the top of a cached function body: the in-process cache missed."""
+    probe = _miss_probe.get()
+    if probe is not None:
+        probe['miss'] = True
+
+
+def traced_cache(name):
+    """
+    Wraps an st.cache_data/st.cache_resource function (applied outside it) and
+    records each call's wall time, including argument hashing, and whether
+    the in-process cache hit. The cached body must call note_miss().
+    """
+    def decorate(cached_fn):
+        @functools.wraps(cached_fn)
+        def wrapper(*args, **kwargs):
+            probe = {'miss': False}
+            token = _miss_probe.set(probe)
+            t0 = time.perf_counter()
+            try:
+                return cached_fn(*args, **kwargs)
+            finally:
+                _miss_probe.reset(token)
+                record('cache', layer='memory', name=name, result='miss' if probe['miss'] else 'hit',
+                       ms=round((time.perf_counter() - t0) * 1e3, 2))
+        return wrapper
+    return decorate
+
+
+def finish_trace(trace):
+    """Closes the trace and appends it to $NBA_TRACE_LOG, if set."""
+    trace.finish()
+    path = os.environ.get(TRACE_LOG_ENV)
+    if path:
+        line = json.dumps(trace.to_dict(), default=str)
+        with open(path, 'a') as f:
+            f.write(line + '\n')
+    return trace
+
+
+def render_debug_panel(trace):
+    """Sidebar view of a finished trace."""
+    summary = trace.summary()
+    with st.sidebar.expander("🔧 Debug: this rerun", expanded=True):
+        c1, c2, c3 = st.columns(3)
+        c1.metric("Wall", f"{summary['total_ms']:,.0f} ms")
+        c2.metric("CPU", f"{summary['cpu_ms']:,.0f} ms")
+        c3.metric("API calls", summary['upstream_calls'])
+
+        stages = trace.of_kind('stage')
+        if stages:
+            st.caption("Stages")
+            st.dataframe(pd.DataFrame(stages)[['name', 'ms', 'cpu_ms', 'at_ms']], hide_index=True, width='stretch')
+
+        caches = trace.of_kind('cache')
+        if caches:
+            st.caption("Cache lookups (" + ", ".join(f"{k} {v}" for k, v in sorted(summary['cache'].items())) + ")")
+            columns = [c for c in ['layer', 'name', 'result', 'ms', 'key'] if any(c in e for e in caches)]
+            st.dataframe(pd.DataFrame(caches).reindex(columns=columns), hide_index=True, width='stretch')
+
+        upstream = trace.of_kind('upstream')
+        if upstream:
+            st.caption("Upstream calls")
+            columns = [c for c in ['source', 'endpoint', 'attempt', 'ms', 'throttled_ms', 'rows', 'bytes', 'error']
+                       if any(c in e for e in upstream)]
+            st.dataframe(pd.DataFrame(upstream).reindex(columns=columns), hide_index=True, width='stretch')
+
+        refreshes = trace.of_kind('refresh')
+        if refreshes:
+            st.caption("Store refreshes")
+            columns = [c for c in ['name', 'key', 'mode', 'rows', 'added', 'since', 'windows',
+                                    'bytes_before', 'bytes_after']
+                       if any(c in e for e in refreshes)]
+            st.dataframe(pd.DataFrame(refreshes).reindex(columns=columns), hide_index=True, width='stretch')
+
+        frames = trace.of_kind('frame')
+        if frames:
+            st.caption("Frames")
+            st.dataframe(pd.DataFrame(frames)[['name', 'rows', 'bytes']], hide_index=True, width='stretch')
+
+        # Process-wide, so this covers calls made by every session since startup
+        latency = get_latency_stats().summary()
+        if latency:
+            st.caption("Upstream latency by endpoint (all sessions; percentiles are bucket upper bounds)")
+            st.dataframe(pd.DataFrame.from_dict(latency, orient='index').rename_axis('endpoint').reset_index(),
+                         hide_index=True, width='stretch')
+            labels, counts = get_latency_stats().buckets()
+            st.bar_chart(pd.DataFrame(counts, index=labels), stack=True, sort=False)
+
+        frame_cache = get_frame_cache().metrics()
+        st.caption(f"Frame cache ({frame_cache['policy'].upper()}, all sessions)")
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Memory", f"{frame_cache['bytes'] / 2**20:,.1f} / {frame_cache['budget_bytes'] / 2**20:,.0f} MB",
+                  f"{frame_cache['occupancy']:.0%}", delta_color='off')
+        c2.metric("Entries", frame_cache['entries'])
+        c3.metric("Hit rate", '—' if frame_cache['hit_rate'] is None else f"{frame_cache['hit_rate']:.0%}")
+        c4.metric("Evictions", frame_cache['evictions'],
+                  f"{frame_cache['spill_writes']} spilled, {frame_cache['spill_hits']} read back", delta_color='off')
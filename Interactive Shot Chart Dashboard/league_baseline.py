@@ -0,0 +1,234 @@
+"""
+League-average baselines for relative efficiency.
+
+Offline job: aggregates every league shot for a season into compact count
+arrays (zone x season and hex-bin x season) saved under the shot store root.
+The dashboard loads the arrays once and answers "player vs league" with
+lookups. Runs are incremental: only shots not yet counted are fetched (via the
+endpoint's date filter, one calendar month per request) and added to the
+existing counts.
+
+Usage:
+    python league_baseline.py --seasons 2024-25 2025-26
+    python league_baseline.py --seasons 2025-26 --full   # rebuild from scratch
+"""
+import argparse
+import json
+import os
+import tempfile
+from datetime import datetime
+
+import numpy as np
+
+from shot_chart_utils import ShotBinGrid
+from shot_schema import normalize_shot_frame, concat_shot_chunks, shot_keys
+from shot_store import get_shot_store
+from data_source import get_data_source, make_data_source, set_data_source, DATA_SOURCES
+
+ZONE_BASICS = ['Restricted Area', 'In The Paint (Non-RA)', 'Mid-Range', 'Left Corner 3',
+               'Right Corner 3', 'Above the Break 3', 'Backcourt']
+ZONE_AREAS = ['Center(C)', 'Left Side(L)', 'Right Side(R)', 'Left Side Center(LC)',
+              'Right Side Center(RC)', 'Back Court(BC)']
+# Fixed zone order shared by the arrays and calculate_zone_efficiency's ZONE_NAME
+ZONE_NAMES = [f'{basic} - {area}' for basic in ZONE_BASICS for area in ZONE_AREAS]
+ZONE_INDEX = {name: i for i, name in enumerate(ZONE_NAMES)}
+
+BASELINE_FILE = 'baseline.npz'
+
+
+def zone_indices(df):
+    """
+    Index into ZONE_NAMES for every shot (-1 for unknown zones). The lookup is
+    built over the category pairs, then fanned out through the codes, so no
+    per-shot strings are created.
+    """
+    basic = df['SHOT_ZONE_BASIC'].astype('category')
+    area = df['SHOT_ZONE_AREA'].astype('category')
+    # Trailing row/column of -1 catches missing values (code -1)
+    table = np.full((len(basic.cat.categories) + 1, len(area.cat.categories) + 1), -1, dtype=np.int64)
+    for i, b in enumerate(basic.cat.categories):
+        for j, a in enumerate(area.cat.categories):
+            table[i, j] = ZONE_INDEX.get(f'{b} - {a}', -1)
+    return table[basic.cat.codes.to_numpy(), area.cat.codes.to_numpy()]
+
+
+def baseline_dir(root=None):
+    return os.path.join(root or get_shot_store().root, 'league')
+
+
+class LeagueBaseline:
+    """
+    Precomputed league counts: zone_fga/zone_fgm are [zone, season],
+    bin_fga/bin_fgm/bin_pts are [hex bin, season] on ShotBinGrid's default grid.
+    `state` records, per season, the latest GAME_DATE counted and the shot keys
+    (shot_schema.shot_keys) counted on that date; it is saved in the same file as the counts so the two can never
+    disagree after an interrupted run.
+    """
+
+    def __init__(self, seasons, zone_fga, zone_fgm, bin_fga, bin_fgm, bin_pts, state=None):
+        self.seasons = list(seasons)
+        self.season_index = {s: i for i, s in enumerate(self.seasons)}
+        self.zone_fga = zone_fga
+        self.zone_fgm = zone_fgm
+        self.bin_fga = bin_fga
+        self.bin_fgm = bin_fgm
+        self.bin_pts = bin_pts
+        self.state = state or {}
+
+    @classmethod
+    def empty(cls, n_bins):
+        z = np.zeros((len(ZONE_NAMES), 0), dtype=np.int64)
+        b = np.zeros((n_bins, 0), dtype=np.int64)
+        return cls([], z, z.copy(), b, b.copy(), b.copy(), state={})
+
+    @classmethod
+    def load(cls, root=None):
+        """Loads the saved arrays, or returns None if the job has not run yet."""
+        path = os.path.join(baseline_dir(root), BASELINE_FILE)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return cls(data['seasons'].tolist(), data['zone_fga'], data['zone_fgm'],
+                       data['bin_fga'], data['bin_fgm'], data['bin_pts'],
+                       state=json.loads(str(data['state'])))
+
+    def save(self, root=None):
+        directory = baseline_dir(root)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as sink:
+            np.savez(sink, seasons=np.array(self.seasons), zone_fga=self.zone_fga, zone_fgm=self.zone_fgm,
+                     bin_fga=self.bin_fga, bin_fgm=self.bin_fgm, bin_pts=self.bin_pts,
+                     state=np.array(json.dumps(self.state)))
+        os.replace(tmp_path, os.path.join(directory, BASELINE_FILE))
+
+    def ensure_season(self, season):
+        """Column index for `season`, appending an empty column if it is new."""
+        if season not in self.season_index:
+            self.season_index[season] = len(self.seasons)
+            self.seasons.append(season)
+            for name in ('zone_fga', 'zone_fgm', 'bin_fga', 'bin_fgm', 'bin_pts'):
+                arr = getattr(self, name)
+                setattr(self, name, np.hstack([arr, np.zeros((arr.shape[0], 1), dtype=arr.dtype)]))
+        return self.season_index[season]
+
+    def has_season(self, season):
+        return season in self.season_index
+
+    def _columns(self, seasons):
+        # Column indices for one season or a list of seasons (unknown seasons skipped)
+        seasons = [seasons] if isinstance(seasons, str) else seasons
+        return [self.season_index[s] for s in seasons if s in self.season_index]
+
+    def zone_fg_pct(self, seasons):
+        """{ZONE_NAME: league FG%} pooled over the season(s) (zones with no attempts omitted)."""
+        cols = self._columns(seasons)
+        if not cols:
+            return {}
+        fga, fgm = self.zone_fga[:, cols].sum(axis=1), self.zone_fgm[:, cols].sum(axis=1)
+        return {ZONE_NAMES[i]: fgm[i] / fga[i] for i in np.flatnonzero(fga)}
+
+    def bin_fg_pct(self, seasons):
+        """League FG% per hex bin pooled over the season(s) (NaN where the league took no shots)."""
+        cols = self._columns(seasons)
+        if not cols:
+            return None
+        fga = self.bin_fga[:, cols].sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(fga > 0, self.bin_fgm[:, cols].sum(axis=1) / fga, np.nan)
+
+    def add_shots(self, season, df):
+        """Adds a normalized shot frame's counts to the season's columns."""
+        col = self.ensure_season(season)
+
+        zone = zone_indices(df)
+        known = zone >= 0
+        zone = zone[known]
+        made = df['SHOT_MADE_FLAG'].to_numpy() == 1
+        self.zone_fga[:, col] += np.bincount(zone, minlength=len(ZONE_NAMES))
+        self.zone_fgm[:, col] += np.bincount(zone, weights=made[known], minlength=len(ZONE_NAMES)).astype(np.int64)
+
+        bins = ShotBinGrid().update(df)
+        self.bin_fga[:, col] += bins.attempts
+        self.bin_fgm[:, col] += bins.makes
+        self.bin_pts[:, col] += bins.points
+
+
+def fetch_league_shots(season, date_from=None):
+    """
+    Every league FGA for the season, optionally from `date_from` (date) on,
+    requested one calendar month at a time (cache_utils.season_windows): a
+    whole league season in one response is slow and the likeliest to time out.
+    """
+    from cache_utils import season_windows  # cache_utils imports this module for LeagueBaseline
+
+    chunks = []
+    for first, last in season_windows(season, since=date_from):
+        chunk, _ = normalize_shot_frame(get_data_source().shot_chart(0, season, date_from=first, date_to=last))
+        chunks.append(chunk)
+    return concat_shot_chunks(chunks)
+
+
+def update_season(baseline, season):
+    """
+    Adds the shots taken since the last run. The last counted date is fetched
+    again (its games may have been incomplete), and shots already counted on
+    it are dropped by (GAME_ID, GAME_EVENT_ID), as append_shot_frame does.
+    Returns the number of new shots added.
+    """
+    season_state = baseline.state.setdefault(season, {'last_game_date': None, 'last_date_keys': []})
+    last_date = season_state['last_game_date']
+    date_from = datetime.strptime(last_date, '%Y-%m-%d').date() if last_date else None
+
+    df = fetch_league_shots(season, date_from)
+    if df.empty:
+        baseline.ensure_season(season)
+        return 0
+
+    keys = shot_keys(df)
+    counted = np.isin(keys, np.array(season_state.get('last_date_keys', []), dtype=np.int64))
+    # State saved before shot keys were tracked lists whole games instead
+    legacy_games = np.array(season_state.pop('game_ids', []), dtype=np.int64)
+    counted |= np.isin(keys // 10_000, legacy_games)
+    new = df[~counted]
+    if new.empty:
+        return 0
+
+    baseline.add_shots(season, new)
+    newest = new['GAME_DATE'].max()
+    # df holds every shot from the last counted date on, so these are all the newest date's shots
+    on_newest = (df['GAME_DATE'] == newest).to_numpy()
+    season_state['last_game_date'] = newest.strftime('%Y-%m-%d')
+    season_state['last_date_keys'] = np.unique(keys[on_newest]).tolist()
+    return len(new)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seasons', nargs='+', required=True, help="e.g. 2024-25 2025-26")
+    parser.add_argument('--full', action='store_true', help="discard saved counts for these seasons and rebuild")
+    parser.add_argument('--source', choices=DATA_SOURCES, default=None, help="data source (default $NBA_DATA_SOURCE or live)")
+    parser.add_argument('--root', default=None, help="store root (defaults to $NBA_SHOT_STORE_DIR)")
+    args = parser.parse_args()
+
+    if args.source:
+        set_data_source(make_data_source(args.source))
+    baseline = LeagueBaseline.load(args.root) or LeagueBaseline.empty(ShotBinGrid().grid.n_bins)
+
+    for season in args.seasons:
+        if args.full:
+            baseline.state.pop(season, None)
+            if baseline.has_season(season):
+                col = baseline.season_index[season]
+                for arr in (baseline.zone_fga, baseline.zone_fgm, baseline.bin_fga, baseline.bin_fgm, baseline.bin_pts):
+                    arr[:, col] = 0
+
+        added = update_season(baseline, season)
+        print(f"{season}: +{added:,} shots (through {baseline.state.get(season, {}).get('last_game_date')})")
+
+        # Save after every season so an interrupted run keeps finished work
+        baseline.save(args.root)
+
+
+if __name__ == '__main__':
+    main()
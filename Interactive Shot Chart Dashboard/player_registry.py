@@ -0,0 +1,151 @@
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from typing import NamedTuple
+
+
+def normalize_name(name):
+    """
+    Case- and accent-insensitive form of a player name ("Nikola Jokić" -> "nikola jokic").
+    """
+    decomposed = unicodedata.normalize('NFKD', name)
+    stripped = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(stripped.casefold().split())
+
+
+def name_initials(normalized):
+    """
+    Initials of a normalized name, hyphenated parts included
+    ("shai gilgeous-alexander" -> "sga"), or '' for one-word names.
+    """
+    parts = [part for part in re.split(r"[ \-]", normalized) if part]
+    return ''.join(part[0] for part in parts) if len(parts) > 1 else ''
+
+
+class PlayerRecord(NamedTuple):
+    id: int
+    full_name: str
+    first_name: str
+    last_name: str
+    is_active: bool
+
+
+class PlayerRegistry:
+    """
+    Indexed view over nba_api's static player list.
+
+    Player fields are stored column-wise (one array/list per field) and every
+    index maps to a row number, so lookups by name, normalized name or id are
+    dict hits instead of a scan over several thousand dicts.
+    """
+
+    __slots__ = ('_ids', '_full_names', '_first_names', '_last_names', '_active',
+                 '_row_by_id', '_row_by_name', '_row_by_normalized',
+                 '_prefix_keys', '_prefix_rows', '_rows_by_initials', '_active_names')
+
+    def __init__(self, player_dicts):
+        self._ids = array('q')
+        self._full_names = []
+        self._first_names = []
+        self._last_names = []
+        self._active = bytearray()
+
+        self._row_by_id = {}
+        self._row_by_name = {}
+        self._row_by_normalized = {}
+        self._rows_by_initials = {}
+
+        prefix_entries = []
+
+        for row, p in enumerate(player_dicts):
+            full_name = p['full_name']
+            self._ids.append(p['id'])
+            self._full_names.append(full_name)
+            self._first_names.append(p.get('first_name') or '')
+            self._last_names.append(p.get('last_name') or '')
+            self._active.append(1 if p.get('is_active') else 0)
+
+            # First occurrence wins, matching the old `player_info[0]` behaviour
+            self._row_by_id.setdefault(p['id'], row)
+            self._row_by_name.setdefault(full_name, row)
+
+            normalized = normalize_name(full_name)
+            self._row_by_normalized.setdefault(normalized, row)
+
+            # Prefix index: every word boundary in the name is a searchable start,
+            # so "jok", "nikola j" and "jokic" all hit Nikola Jokić
+            words = normalized.split(' ')
+            for i in range(len(words)):
+                prefix_entries.append((' '.join(words[i:]), row))
+
+            # Initials match whole queries only ("sga", "jjj"), so they don't flood prefix results
+            initials = name_initials(normalized)
+            if initials:
+                self._rows_by_initials.setdefault(initials, []).append(row)
+
+        prefix_entries.sort()
+        self._prefix_keys = [key for key, _ in prefix_entries]
+        self._prefix_rows = array('l', (row for _, row in prefix_entries))
+
+        self._active_names = tuple(sorted(
+            name for name, active in zip(self._full_names, self._active) if active
+        ))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def _record(self, row):
+        return PlayerRecord(
+            id=self._ids[row],
+            full_name=self._full_names[row],
+            first_name=self._first_names[row],
+            last_name=self._last_names[row],
+            is_active=bool(self._active[row]),
+        )
+
+    def _row_for_name(self, player_name):
+        if not player_name:
+            return None
+        row = self._row_by_name.get(player_name)
+        if row is None:
+            row = self._row_by_normalized.get(normalize_name(player_name))
+        return row
+
+    def get_id(self, player_name):
+        """Player ID for an exact or accent/case-insensitive name, or None."""
+        row = self._row_for_name(player_name)
+        return None if row is None else self._ids[row]
+
+    def get_by_name(self, player_name):
+        row = self._row_for_name(player_name)
+        return None if row is None else self._record(row)
+
+    def get_by_id(self, player_id):
+        row = self._row_by_id.get(player_id)
+        return None if row is None else self._record(row)
+
+    def active_names(self):
+        """Sorted full names of active players."""
+        return self._active_names
+
+    def search(self, query, active_only=True, limit=None):
+        """
+        Names whose first name, last name or full name starts with `query`, or
+        whose initials are exactly `query` (accent/case-insensitive), sorted alphabetically.
+        """
+        key = normalize_name(query)
+        if not key:
+            return list(self._active_names) if active_only else sorted(self._full_names)
+
+        start = bisect_left(self._prefix_keys, key)
+        rows = {row for row in self._rows_by_initials.get(key, ()) if not active_only or self._active[row]}
+        for i in range(start, len(self._prefix_keys)):
+            if not self._prefix_keys[i].startswith(key):
+                break
+            row = self._prefix_rows[i]
+            if not active_only or self._active[row]:
+                rows.add(row)
+
+        names = sorted(self._full_names[row] for row in rows)
+        return names[:limit] if limit is not None else names
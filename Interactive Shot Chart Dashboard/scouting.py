@@ -0,0 +1,208 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# Thresholds used by the Scouting Report tab
+MIN_ZONE_ATTEMPTS = 5     # zones need more than this many attempts to qualify
+MIN_SIDE_ATTEMPTS = 10    # per side, for the left/right split
+SIDE_BIAS_MARGIN = 0.05   # FG% gap that counts as a directional bias
+MIN_LAYER_ATTEMPTS = 5    # layers need more than this many attempts
+
+DEFENSIVE_LAYERS = ['Rim (Protect)', 'Mid-Range (Force)', 'Perimeter (Chase)', 'Other']
+
+
+@dataclass(frozen=True)
+class ScoutingReport:
+    """Everything the Scouting Report tab renders, computed in one pass."""
+    # Offensive audit
+    zone_stats: pd.DataFrame      # ZONE_NAME, FGA, FGM, FG_PCT for every zone
+    best_zones: pd.DataFrame      # top 3 qualified zones
+    worst_zones: pd.DataFrame     # bottom 3 qualified zones
+
+    # Directional splits
+    hand_bias: str
+    defensive_strategy: str
+    left_pct: float
+    right_pct: float
+
+    # Defensive layers
+    layer_stats: pd.DataFrame     # DEF_LAYER, FGA, FG_PCT, PPS (qualified layers only)
+    force_layer: object           # row of layer_stats with the lowest PPS, or None
+    deny_layer: object            # row of layer_stats with the highest PPS, or None
+
+    # Scoring consistency
+    games: int
+    avg_pts: float
+    std_dev_pts: float
+    cv: float
+    consistency_grade: str
+    consistency_description: str
+
+
+def shot_points(df):
+    """Points scored on each attempt (0, 2 or 3) as an int array."""
+    if 'SHOT_POINTS' in df.columns:
+        return df['SHOT_POINTS'].to_numpy()
+    made = df['SHOT_MADE_FLAG'].to_numpy() == 1
+    value = np.where((df['SHOT_TYPE'] == '3PT Field Goal').to_numpy(), 3, 2)
+    return value * made
+
+
+def zone_report(df, min_attempts=MIN_ZONE_ATTEMPTS, top_n=3):
+    """Per-zone FGA/FGM/FG% plus the best and worst qualified zones."""
+    zone_stats = df.groupby(['SHOT_ZONE_BASIC', 'SHOT_ZONE_AREA'], observed=True).agg(
+        FGA=('SHOT_MADE_FLAG', 'size'),
+        FGM=('SHOT_MADE_FLAG', 'sum'),
+        FG_PCT=('SHOT_MADE_FLAG', 'mean'),
+    ).reset_index()
+    zone_stats['ZONE_NAME'] = zone_stats['SHOT_ZONE_BASIC'].astype(str) + ' - ' + zone_stats['SHOT_ZONE_AREA'].astype(str)
+    zone_stats = zone_stats[['ZONE_NAME', 'FGA', 'FGM', 'FG_PCT']]
+
+    qualified = zone_stats[zone_stats['FGA'] > min_attempts]
+    # FG% decides, volume breaks ties in both directions
+    best = qualified.sort_values(by=['FG_PCT', 'FGA'], ascending=[False, False]).head(top_n)
+    worst = qualified.sort_values(by=['FG_PCT', 'FGA'], ascending=[True, False]).head(top_n)
+    return zone_stats, best, worst
+
+
+def side_splits(df, min_attempts=MIN_SIDE_ATTEMPTS, margin=SIDE_BIAS_MARGIN):
+    """
+    Left vs right FG% (LOC_X < 0 is the left side) and the resulting directive.
+    Returns (hand_bias, defensive_strategy, left_pct, right_pct).
+    """
+    loc_x = df['LOC_X'].to_numpy()
+    made = df['SHOT_MADE_FLAG'].to_numpy() == 1
+    left, right = loc_x < 0, loc_x > 0
+    left_n, right_n = int(left.sum()), int(right.sum())
+
+    if left_n < min_attempts or right_n < min_attempts:
+        return "INSUFFICIENT DATA", "NEED MORE SHOT VOLUME", 0.0, 0.0
+
+    left_pct = np.count_nonzero(made & left) / left_n
+    right_pct = np.count_nonzero(made & right) / right_n
+
+    if left_pct > right_pct + margin:
+        return "LEFT", "FORCE RIGHT", left_pct, right_pct
+    if right_pct > left_pct + margin:
+        return "RIGHT", "FORCE LEFT", left_pct, right_pct
+    return "BALANCED", "PLAY STRAIGHT UP", left_pct, right_pct
+
+
+def _layer_for_zone(zone):
+    if 'Restricted Area' in zone:
+        return 0
+    if 'Mid-Range' in zone or 'In The Paint (Non-RA)' in zone:
+        return 1
+    if 'Above the Break 3' in zone or 'Corner 3' in zone or 'Backcourt' in zone:
+        return 2
+    return 3
+
+
+def defensive_layer_codes(df):
+    """
+    Index into DEFENSIVE_LAYERS for every shot. The zone -> layer rule runs
+    once per distinct zone, then fans out to shots through the category codes.
+    """
+    zones = df['SHOT_ZONE_BASIC'].astype('category')
+    lookup = np.array([_layer_for_zone(z) for z in zones.cat.categories] + [3], dtype=np.int8)
+    # codes are -1 for missing zones, which picks the trailing 'Other' entry
+    return lookup[zones.cat.codes.to_numpy()]
+
+
+def layer_report(df, min_attempts=MIN_LAYER_ATTEMPTS):
+    """
+    FGA, FG% and points per shot by defensive layer, via bincount.
+    Returns (layer_stats, force_layer, deny_layer).
+    """
+    codes = defensive_layer_codes(df)
+    n_layers = len(DEFENSIVE_LAYERS)
+    fga = np.bincount(codes, minlength=n_layers)
+    fgm = np.bincount(codes, weights=df['SHOT_MADE_FLAG'].to_numpy() == 1, minlength=n_layers)
+    pts = np.bincount(codes, weights=shot_points(df), minlength=n_layers)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        layer_stats = pd.DataFrame({
+            'DEF_LAYER': DEFENSIVE_LAYERS,
+            'FGA': fga,
+            'FG_PCT': fgm / fga,
+            'PPS': np.where(fga > 0, pts / fga, 0.0),
+        })
+
+    layer_stats = layer_stats[(layer_stats['DEF_LAYER'] != 'Other') & (layer_stats['FGA'] > min_attempts)]
+    layer_stats = layer_stats.reset_index(drop=True)
+
+    if layer_stats.empty:
+        return layer_stats, None, None
+    force_layer = layer_stats.loc[layer_stats['PPS'].idxmin()]
+    deny_layer = layer_stats.loc[layer_stats['PPS'].idxmax()]
+    return layer_stats, force_layer, deny_layer
+
+
+def consistency_report(game_log):
+    """
+    Scoring mean, std and coefficient of variation over the game log.
+    Returns (games, avg_pts, std_dev_pts, cv, grade, description).
+    """
+    pts = game_log['PTS'].to_numpy(dtype=float) if 'PTS' in game_log.columns else np.empty(0)
+    games = len(pts)
+
+    if games <= 1:
+        return (games, 0.0, 0.0, 0.0, "Insufficient Games Played",
+                "Need more game data to assess scoring consistency patterns.")
+
+    avg_pts = float(pts.mean())
+    std_dev_pts = float(pts.std(ddof=1))
+
+    # Coefficient of Variation (CV) - Lower is more consistent
+    cv = std_dev_pts / avg_pts if avg_pts > 0 else 0.0
+
+    if cv < 0.2:
+        grade = "High Reliability (Consistent)"
+        description = "This player delivers predictable scoring output game-to-game. Defenses can't rely on off-nights, and offenses can count on steady production."
+    elif cv < 0.4:
+        grade = "Moderate Variance (Normal)"
+        description = "Standard NBA variability. The player has occasional hot and cold streaks, but performance stays within a reasonable range."
+    else:
+        grade = "High Variance (Volatile)"
+        description = "Boom-or-bust player. Expect significant swings between dominant performances and quiet nights. Game plan accordingly based on matchups and recent form."
+
+    return games, avg_pts, std_dev_pts, cv, grade, description
+
+
+def build_scouting_report(df_shots, game_log):
+    """
+    Computes the full scouting report for one player's shots and game log.
+    """
+    return assemble_scouting_report(zone_report(df_shots), side_splits(df_shots),
+                                    layer_report(df_shots), consistency_report(game_log))
+
+
+def assemble_scouting_report(zones, splits, layers, consistency):
+    """
+    Builds a ScoutingReport from the outputs of zone_report, side_splits,
+    layer_report and consistency_report (e.g. when each is cached separately).
+    """
+    zone_stats, best_zones, worst_zones = zones
+    hand_bias, defensive_strategy, left_pct, right_pct = splits
+    layer_stats, force_layer, deny_layer = layers
+    games, avg_pts, std_dev_pts, cv, grade, description = consistency
+
+    return ScoutingReport(
+        zone_stats=zone_stats,
+        best_zones=best_zones,
+        worst_zones=worst_zones,
+        hand_bias=hand_bias,
+        defensive_strategy=defensive_strategy,
+        left_pct=left_pct,
+        right_pct=right_pct,
+        layer_stats=layer_stats,
+        force_layer=force_layer,
+        deny_layer=deny_layer,
+        games=games,
+        avg_pts=avg_pts,
+        std_dev_pts=std_dev_pts,
+        cv=cv,
+        consistency_grade=grade,
+        consistency_description=description,
+    )
@@ -1,16 +1,18 @@
+import json
 import plotly.graph_objects as go
 import numpy as np
+import pandas as pd
+from functools import lru_cache
 
-def draw_half_court(title="NBA Shot Chart"):
+@lru_cache(maxsize=32)
+def _court_template(height=600, court_color='black', line_color='white'):
     """
-    Creates a Plotly figure with standard NBA half-court markings.
+    Builds the static half-court once per (height, colors) key, as the figure's
+    JSON (validated when it was built). A string, so the cached template can't be
+    modified through any caller; draw_half_court parses a fresh copy each time.
     """
     fig = go.Figure()
     
-    # Colors
-    court_color = 'black'
-    line_color = 'white'
-    
     # NBA API coordinates (10 units = 1 foot)
     corner_x = 220.0  # 22 ft
     arc_radius = 237.5 # 23.75 ft
@@ -41,14 +43,11 @@ def draw_half_court(title="NBA Shot Chart"):
     arc_x = arc_radius * np.cos(theta)
     arc_y_points = arc_radius * np.sin(theta)
 
-    fig.add_trace(go.Scatter(
-    x=arc_x, 
-    y=arc_y_points,
-    mode='lines',
-    line=dict(color=line_color, width=2),
-    showlegend=False,
-    hoverinfo='skip'
-    ))
+    # Drawn as a single SVG path shape so the figure's data list only ever
+    # holds the caller's traces
+    arc_path = 'M ' + ' L '.join(f'{x:.2f},{y:.2f}' for x, y in zip(arc_x, arc_y_points))
+    fig.add_shape(type="path", path=arc_path,
+                  line=dict(color=line_color, width=2))
 
 
 
@@ -102,7 +101,7 @@ def draw_half_court(title="NBA Shot Chart"):
 
     # Layout Configuration 
     fig.update_layout(
-        title={'text': title, 'y':0.95, 'x':0.5, 'xanchor': 'center', 'yanchor': 'top'},
+        title={'y':0.95, 'x':0.5, 'xanchor': 'center', 'yanchor': 'top'},
         plot_bgcolor=court_color,
         paper_bgcolor=court_color,
         font_color='white',
@@ -117,9 +116,19 @@ def draw_half_court(title="NBA Shot Chart"):
             scaleratio=1 
         ),
         margin=dict(l=10, r=10, t=50, b=10),
-        height=600
+        height=height
     )
     
+    return fig.to_json()
+
+def draw_half_court(title="NBA Shot Chart", height=600, court_color='black', line_color='white'):
+    """
+    Creates a Plotly figure with standard NBA half-court markings.
+    The court geometry comes from a cached template that was validated when
+    it was built, so the clone skips validation (~2.5 ms instead of ~20 ms).
+    """
+    fig = go.Figure(json.loads(_court_template(height, court_color, line_color)), _validate=False)
+    fig.update_layout(title_text=title)
     return fig
 
 def calculate_zone_efficiency(df):
@@ -127,10 +136,11 @@ def calculate_zone_efficiency(df):
     Calculates FG% for each zone using the existing NBA API columns.
     """
     if df.empty:
-        return df
+        # Same columns as a populated result, so callers (e.g. a filter with no matches) need no special case
+        return pd.DataFrame(columns=['ZONE_NAME', 'FGA', 'FGM', 'FG_PCT'])
 
     # Group by the primary zone descriptors
-    zone_stats = df.groupby(['SHOT_ZONE_BASIC', 'SHOT_ZONE_AREA']).agg(
+    zone_stats = df.groupby(['SHOT_ZONE_BASIC', 'SHOT_ZONE_AREA'], observed=True).agg(
         FGA=('SHOT_ATTEMPTED_FLAG', 'sum'),
         FGM=('SHOT_MADE_FLAG', 'sum')
     ).reset_index()
@@ -143,6 +153,260 @@ def calculate_zone_efficiency(df):
     )
     
     # Cleaner combined zone name for the table
-    zone_stats['ZONE_NAME'] = zone_stats['SHOT_ZONE_BASIC'] + ' - ' + zone_stats['SHOT_ZONE_AREA']
+    zone_stats['ZONE_NAME'] = zone_stats['SHOT_ZONE_BASIC'].astype(str) + ' - ' + zone_stats['SHOT_ZONE_AREA'].astype(str)
     
-    return zone_stats[['ZONE_NAME', 'FGA', 'FGM', 'FG_PCT']]
\ No newline at end of file
+    return zone_stats[['ZONE_NAME', 'FGA', 'FGM', 'FG_PCT']]
+
+# --- SHOT RENDERING (level of detail) ---
+
+# Above this many shots the SVG scatter gets sluggish in the browser -> WebGL
+SCATTERGL_THRESHOLD = 5_000
+# Above this many shots even WebGL payloads get too big to ship -> binned density
+# (~1.7 MB / ~0.6 s of JSON per rerun at 50k points; density stays ~180 KB at any volume)
+DENSITY_THRESHOLD = 50_000
+
+# Court extent in API units, used for server-side binning
+COURT_X_RANGE = (-250.0, 250.0)
+COURT_Y_RANGE = (-47.5, 422.5)
+
+# 0 = missed (red), 1 = made (green)
+MADE_MISSED_COLORSCALE = [[0, 'red'], [1, 'lightgreen']]
+
+SHOT_HOVERTEMPLATE = (
+    '<b>Result:</b> %{customdata[0]}<br>' +
+    '<b>Type:</b> %{customdata[1]}<br>' +
+    '<b>Distance:</b> %{customdata[2]} ft<br>' +
+    '<extra></extra>' # Removes the default trace name
+)
+
+def select_render_mode(n_shots):
+    """
+    Picks 'svg', 'webgl' or 'density' for a shot count.
+    Thresholds come from benchmarks/bench_render_modes.py.
+    """
+    if n_shots > DENSITY_THRESHOLD:
+        return 'density'
+    if n_shots > SCATTERGL_THRESHOLD:
+        return 'webgl'
+    return 'svg'
+
+def add_shot_layer(fig, df, mode=None):
+    """
+    Adds the shots in `df` to a court figure using the given render mode
+    (auto-selected from the shot count when None). Returns the mode used.
+    """
+    mode = mode or select_render_mode(len(df))
+
+    if mode == 'density':
+        add_density_layer(fig, df)
+        return mode
+
+    made = df['SHOT_MADE_FLAG'].to_numpy() == 1
+    # Numeric colors through a two-stop colorscale: plotly validates a per-point
+    # array of color strings one element at a time, which dominated build time
+    colors = made.astype(np.int8)
+    customdata = np.column_stack([
+        np.where(made, 'Made', 'Missed'),
+        df['ACTION_TYPE'].to_numpy(dtype=object),
+        df['SHOT_DISTANCE'].to_numpy(),
+    ])
+
+    if mode == 'webgl':
+        # No per-point outlines: they double the WebGL draw work for no visible gain at this density
+        fig.add_trace(go.Scattergl(
+            x=df['LOC_X'].to_numpy(),
+            y=df['LOC_Y'].to_numpy(),
+            mode='markers',
+            marker=dict(color=colors, colorscale=MADE_MISSED_COLORSCALE, cmin=0, cmax=1, size=5, opacity=0.6),
+            hovertemplate=SHOT_HOVERTEMPLATE,
+            customdata=customdata
+        ))
+    else:
+        fig.add_trace(go.Scatter(
+            x=df['LOC_X'].to_numpy(),
+            y=df['LOC_Y'].to_numpy(),
+            mode='markers',
+            marker=dict(
+                # Green for made, Red for missed
+                color=colors,
+                colorscale=MADE_MISSED_COLORSCALE,
+                cmin=0, cmax=1,
+                size=8,
+                opacity=0.7,
+                line=dict(width=1, color='rgba(0,0,0,0.5)')
+            ),
+            hovertemplate=SHOT_HOVERTEMPLATE,
+            customdata=customdata
+        ))
+    return mode
+
+def add_density_layer(fig, df, gridsize=40, min_attempts=1):
+    """
+    Server-side aggregation for very large shot sets: one hexagon per bin
+    instead of one marker per shot.
+    """
+    grid = ShotBinGrid(gridsize=gridsize)
+    grid.update(df)
+    add_hexbin_layer(fig, grid, min_attempts=min_attempts)
+
+
+# --- HEXBIN DENSITY ENGINE ---
+
+class HexGrid:
+    """
+    Hexagonal lattice over the court in API units. Hexagon centres sit on two
+    interleaved rectangular lattices; each shot goes to the nearer of its two
+    candidate centres, so binning is a handful of array ops with no Python loop.
+    """
+
+    def __init__(self, gridsize=40, x_range=COURT_X_RANGE, y_range=COURT_Y_RANGE):
+        self.gridsize = gridsize
+        self.xmin, self.xmax = x_range
+        self.ymin, self.ymax = y_range
+        self.nx = gridsize
+        # Regular hexagons: row spacing is sqrt(3) times the column spacing
+        self.ny = max(1, int(round(self.nx * (self.ymax - self.ymin) / (self.xmax - self.xmin) / np.sqrt(3))))
+        self.sx = (self.xmax - self.xmin) / self.nx
+        self.sy = (self.ymax - self.ymin) / self.ny
+        self.n_lattice1 = (self.nx + 1) * (self.ny + 1)
+        self.n_bins = self.n_lattice1 + self.nx * self.ny
+
+    def bin_index(self, x, y):
+        """Bin index for each (x, y); -1 for points outside the grid extent."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        ix = (x - self.xmin) / self.sx
+        iy = (y - self.ymin) / self.sy
+
+        ix1, iy1 = np.rint(ix), np.rint(iy)
+        ix2, iy2 = np.floor(ix), np.floor(iy)
+        aspect = (self.sy / self.sx) ** 2
+        d1 = (ix - ix1) ** 2 + aspect * (iy - iy1) ** 2
+        d2 = (ix - ix2 - 0.5) ** 2 + aspect * (iy - iy2 - 0.5) ** 2
+        on_lattice1 = d1 < d2
+
+        ix1 = np.clip(ix1, 0, self.nx).astype(np.int64)
+        iy1 = np.clip(iy1, 0, self.ny).astype(np.int64)
+        ix2 = np.clip(ix2, 0, self.nx - 1).astype(np.int64)
+        iy2 = np.clip(iy2, 0, self.ny - 1).astype(np.int64)
+
+        index = np.where(on_lattice1,
+                         ix1 * (self.ny + 1) + iy1,
+                         self.n_lattice1 + ix2 * self.ny + iy2)
+
+        inside = (x >= self.xmin) & (x <= self.xmax) & (y >= self.ymin) & (y <= self.ymax)
+        return np.where(inside, index, -1)
+
+    def centers(self):
+        """(x, y) arrays of every bin centre, in bin-index order."""
+        i1, j1 = np.meshgrid(np.arange(self.nx + 1), np.arange(self.ny + 1), indexing='ij')
+        i2, j2 = np.meshgrid(np.arange(self.nx), np.arange(self.ny), indexing='ij')
+        cx = np.concatenate([self.xmin + i1.ravel() * self.sx, self.xmin + (i2.ravel() + 0.5) * self.sx])
+        cy = np.concatenate([self.ymin + j1.ravel() * self.sy, self.ymin + (j2.ravel() + 0.5) * self.sy])
+        return cx, cy
+
+
+class ShotBinGrid:
+    """
+    Per-bin attempts, makes and points on a HexGrid. Counts only ever grow,
+    so appending new shots is `update(new_shots)` rather than a full re-bin.
+    """
+
+    def __init__(self, gridsize=40, grid=None):
+        self.grid = grid or HexGrid(gridsize)
+        self.attempts = np.zeros(self.grid.n_bins, dtype=np.int64)
+        self.makes = np.zeros(self.grid.n_bins, dtype=np.int64)
+        self.points = np.zeros(self.grid.n_bins, dtype=np.int64)
+
+    def update_arrays(self, loc_x, loc_y, made, points):
+        index = self.grid.bin_index(loc_x, loc_y)
+        keep = index >= 0
+        index = index[keep]
+        n = self.grid.n_bins
+        self.attempts += np.bincount(index, minlength=n)
+        self.makes += np.bincount(index, weights=np.asarray(made)[keep], minlength=n).astype(np.int64)
+        self.points += np.bincount(index, weights=np.asarray(points)[keep], minlength=n).astype(np.int64)
+        return self
+
+    def update(self, df):
+        """Adds a shot frame (LOC_X, LOC_Y, SHOT_MADE_FLAG, SHOT_TYPE/SHOT_POINTS) to the counts."""
+        made = df['SHOT_MADE_FLAG'].to_numpy() == 1
+        if 'SHOT_POINTS' in df.columns:
+            points = df['SHOT_POINTS'].to_numpy()
+        else:
+            points = np.where((df['SHOT_TYPE'] == '3PT Field Goal').to_numpy(), 3, 2) * made
+        return self.update_arrays(df['LOC_X'].to_numpy(), df['LOC_Y'].to_numpy(), made, points)
+
+    def merge(self, other):
+        self.attempts += other.attempts
+        self.makes += other.makes
+        self.points += other.points
+        return self
+
+    @property
+    def fg_pct(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.attempts > 0, self.makes / self.attempts, np.nan)
+
+    @property
+    def pps(self):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(self.attempts > 0, self.points / self.attempts, np.nan)
+
+    def to_frame(self, min_attempts=1):
+        """Non-empty bins as a frame: BIN, X, Y, FGA, FGM, FG_PCT, PPS."""
+        cx, cy = self.grid.centers()
+        keep = np.flatnonzero(self.attempts >= max(min_attempts, 1))
+        return pd.DataFrame({
+            'BIN': keep,
+            'X': cx[keep],
+            'Y': cy[keep],
+            'FGA': self.attempts[keep],
+            'FGM': self.makes[keep],
+            'FG_PCT': self.fg_pct[keep],
+            'PPS': self.pps[keep],
+        })
+
+
+def add_hexbin_layer(fig, bins, color_by='fg_pct', min_attempts=1, max_marker_size=18, league_fg_pct=None):
+    """
+    Draws a ShotBinGrid on a court figure: hexagon size encodes shot volume,
+    color encodes FG% (color_by='fg_pct'), points per shot (color_by='pps') or
+    FG% above/below the league in each bin (color_by='vs_league', which needs
+    `league_fg_pct` aligned to the same grid).
+    """
+    frame = bins.to_frame(min_attempts=min_attempts)
+    if frame.empty:
+        return fig
+
+    sizes = max_marker_size * np.sqrt(frame['FGA'].to_numpy() / frame['FGA'].max())
+    if color_by == 'pps':
+        color, cmin, cmax, title, fmt = frame['PPS'], 0, 1.5, 'PPS', '.2f'
+    elif color_by == 'vs_league' and league_fg_pct is not None:
+        delta = frame['FG_PCT'].to_numpy() - league_fg_pct[frame['BIN'].to_numpy()]
+        color, cmin, cmax, title, fmt = delta, -0.15, 0.15, 'vs League', '+.0%'
+    else:
+        color, cmin, cmax, title, fmt = frame['FG_PCT'], 0, 1.0, 'FG%', '.0%'
+
+    fig.add_trace(go.Scatter(
+        x=frame['X'],
+        y=frame['Y'],
+        mode='markers',
+        marker=dict(
+            symbol='hexagon',
+            size=np.maximum(sizes, 3),
+            color=color,
+            colorscale='RdYlGn',
+            cmin=cmin, cmax=cmax,
+            colorbar=dict(title=title, tickformat=fmt),
+            line=dict(width=0)
+        ),
+        customdata=np.column_stack([frame['FGA'], frame['FGM'], frame['FG_PCT'], frame['PPS']]),
+        hovertemplate=
+            '<b>Attempts:</b> %{customdata[0]}<br>' +
+            '<b>Makes:</b> %{customdata[1]}<br>' +
+            '<b>FG%:</b> %{customdata[2]:.1%}<br>' +
+            '<b>PPS:</b> %{customdata[3]:.2f}<br>' +
+            '<extra></extra>'
+    ))
+    return fig
@@ -0,0 +1,158 @@
+"""
+Shot filters evaluated on precomputed bitset indexes.
+
+ShotFilterIndex is built once per shot frame version. It stores one packed
+bitset (np.packbits, 1 bit per shot) per value of each filterable dimension,
+so a filter combination is a few byte-wise ORs within a dimension and ANDs
+across dimensions, instead of re-evaluating pandas comparisons on the frame
+every rerun.
+"""
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+from nba_api.stats.static import teams
+
+PERIOD_LABELS = ['1st', '2nd', '3rd', '4th', 'OT']
+# Minutes remaining in the period (MINUTES_REMAINING), 0..11
+CLOCK_MINUTES = 12
+# (label, low ft inclusive, high ft exclusive)
+DISTANCE_BANDS = [
+    ('0-3 ft', 0, 4),
+    ('4-9 ft', 4, 10),
+    ('10-15 ft', 10, 16),
+    ('16-23 ft', 16, 24),
+    ('24-29 ft', 24, 30),
+    ('30+ ft', 30, None),
+]
+VENUES = ['Home', 'Away']
+
+
+class ShotFilter(NamedTuple):
+    """A filter selection. Empty tuples / None mean "no restriction" on that dimension."""
+    periods: tuple = ()
+    minutes_remaining: tuple = None   # (low, high): MINUTES_REMAINING in [low, high], inclusive
+    action_types: tuple = ()
+    distance_bands: tuple = ()
+    venue: str = None                 # 'Home' or 'Away'
+    opponents: tuple = ()
+    date_range: tuple = None          # (first, last) dates, inclusive
+
+    def is_empty(self):
+        return (not self.periods and self.minutes_remaining is None and not self.action_types
+                and not self.distance_bands and self.venue is None and not self.opponents
+                and self.date_range is None)
+
+
+def _codes_to_bitsets(codes, labels):
+    # {label: packed bitset of shots whose code is that label's index}; empty labels omitted
+    bitsets = {}
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    for i, label in enumerate(labels):
+        if counts[i]:
+            bitsets[label] = np.packbits(codes == i)
+    return bitsets
+
+
+def team_abbreviations(df):
+    """
+    Shooting team's abbreviation for every shot, as it appears in HTM/VTM.
+    The static team list gives current abbreviations; for historical ones
+    (e.g. NJN for today's BKN) the code the team's games have in common is used.
+    """
+    team_ids = df['TEAM_ID'].to_numpy()
+    htm, vtm = df['HTM'].astype(str).to_numpy(), df['VTM'].astype(str).to_numpy()
+    out = np.empty(len(df), dtype=object)
+    for team_id in np.unique(team_ids):
+        rows = team_ids == team_id
+        team = teams.find_team_name_by_id(int(team_id))
+        candidate = team['abbreviation'] if team else None
+        if candidate is None or not ((htm[rows] == candidate) | (vtm[rows] == candidate)).any():
+            candidate = pd.Series(np.concatenate([htm[rows], vtm[rows]])).mode().iloc[0]
+        out[rows] = candidate
+    return out
+
+
+class ShotFilterIndex:
+    """
+    Packed bitsets for period, clock minute, action type, distance band,
+    venue and opponent, plus game days for date ranges.
+    """
+
+    def __init__(self, df):
+        self.n = len(df)
+        self.bitsets = {}
+
+        period = df['PERIOD'].to_numpy()
+        self.bitsets['period'] = _codes_to_bitsets(np.minimum(period, 5).astype(np.int64) - 1, PERIOD_LABELS)
+
+        minutes = df['MINUTES_REMAINING'].to_numpy().astype(np.int64)
+        self.bitsets['minute'] = _codes_to_bitsets(np.clip(minutes, 0, CLOCK_MINUTES - 1), list(range(CLOCK_MINUTES)))
+
+        actions = df['ACTION_TYPE'].astype('category')
+        self.bitsets['action_type'] = _codes_to_bitsets(actions.cat.codes.to_numpy().astype(np.int64),
+                                                        list(actions.cat.categories))
+
+        distance = df['SHOT_DISTANCE'].to_numpy()
+        edges = [low for _, low, _ in DISTANCE_BANDS[1:]]
+        self.bitsets['distance_band'] = _codes_to_bitsets(np.searchsorted(edges, distance, side='right'),
+                                                          [label for label, _, _ in DISTANCE_BANDS])
+
+        team = team_abbreviations(df)
+        htm = df['HTM'].astype(str).to_numpy()
+        vtm = df['VTM'].astype(str).to_numpy()
+        home = htm == team
+        self.bitsets['venue'] = {'Home': np.packbits(home), 'Away': np.packbits(~home)}
+
+        opponent = pd.Categorical(np.where(home, vtm, htm))
+        self.bitsets['opponent'] = _codes_to_bitsets(opponent.codes.astype(np.int64), list(opponent.categories))
+
+        self.game_days = df['GAME_DATE'].to_numpy().astype('datetime64[D]')
+        self.first_date = pd.Timestamp(self.game_days.min()).date() if self.n else None
+        self.last_date = pd.Timestamp(self.game_days.max()).date() if self.n else None
+
+    def options(self, dimension):
+        """Values of a dimension that have at least one shot, in display order."""
+        return list(self.bitsets[dimension])
+
+    def _any_of(self, dimension, values):
+        # OR of the selected values' bitsets (values with no shots contribute nothing)
+        selected = [self.bitsets[dimension][v] for v in values if v in self.bitsets[dimension]]
+        if not selected:
+            return np.zeros((self.n + 7) // 8, dtype=np.uint8)
+        return np.bitwise_or.reduce(selected)
+
+    def mask(self, selection):
+        """Boolean mask over the indexed frame's rows for a ShotFilter."""
+        bits = np.full((self.n + 7) // 8, 0xFF, dtype=np.uint8)
+        if selection.periods:
+            bits &= self._any_of('period', selection.periods)
+        if selection.minutes_remaining is not None:
+            low, high = selection.minutes_remaining
+            bits &= self._any_of('minute', range(int(low), int(high) + 1))
+        if selection.action_types:
+            bits &= self._any_of('action_type', selection.action_types)
+        if selection.distance_bands:
+            bits &= self._any_of('distance_band', selection.distance_bands)
+        if selection.venue is not None:
+            bits &= self.bitsets['venue'][selection.venue]
+        if selection.opponents:
+            bits &= self._any_of('opponent', selection.opponents)
+
+        mask = np.unpackbits(bits, count=self.n).view(bool)
+        if selection.date_range is not None:
+            first, last = (np.datetime64(d, 'D') for d in selection.date_range)
+            mask &= (self.game_days >= first) & (self.game_days <= last)
+        return mask
+
+    def apply(self, df, selection):
+        """
+        Rows of `df` (the indexed frame) matching the selection. The result is
+        stamped with the selection so derived results cache per filter.
+        """
+        if selection.is_empty():
+            return df
+        out = df[self.mask(selection)]
+        key, version = df.attrs.get('data_key'), df.attrs.get('data_version')
+        out.attrs = {'data_key': (key, 'filter', selection), 'data_version': version} if key is not None else {}
+        return out
@@ -0,0 +1,169 @@
+import numpy as np
+import pandas as pd
+
+# pandas >= 3 always copies on write; 2.x only does when the application opts in
+PANDAS_COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3
+
+# Bump when SHOT_SCHEMA/derived columns change so stored frames are refetched
+SHOT_SCHEMA_VERSION = 1
+
+# Compact schema for ShotChartDetail frames. Repeated strings become
+# categoricals, small integers are downcast, and columns the dashboard never
+# reads (GRID_TYPE, ...) are dropped. Order here is the output column order.
+SHOT_SCHEMA = {
+    'GAME_ID': 'category',
+    'GAME_EVENT_ID': 'int16',
+    'PLAYER_ID': 'int32',
+    'PLAYER_NAME': 'category',
+    'TEAM_ID': 'int32',
+    'TEAM_NAME': 'category',
+    'PERIOD': 'int8',
+    'MINUTES_REMAINING': 'int8',
+    'SECONDS_REMAINING': 'int8',
+    'EVENT_TYPE': 'category',
+    'ACTION_TYPE': 'category',
+    'SHOT_TYPE': 'category',
+    'SHOT_ZONE_BASIC': 'category',
+    'SHOT_ZONE_AREA': 'category',
+    'SHOT_ZONE_RANGE': 'category',
+    'SHOT_DISTANCE': 'int16',
+    'LOC_X': 'int16',
+    'LOC_Y': 'int16',
+    'SHOT_ATTEMPTED_FLAG': 'int8',
+    'SHOT_MADE_FLAG': 'int8',
+    'GAME_DATE': 'datetime64[ns]',
+    'HTM': 'category',
+    'VTM': 'category',
+}
+
+# Columns derived during normalization
+SHOT_RESULT_CATEGORIES = ['Made', 'Missed']
+DERIVED_COLUMNS = {
+    'SHOT_RESULT': 'category',
+    'SHOT_VALUE': 'int8',   # 2 or 3
+    'SHOT_POINTS': 'int8',  # points scored on the attempt (0, 2 or 3)
+}
+
+
+def isolated_copy(obj):
+    """
+    Copy of a cached DataFrame/Series that writes can't leak through in either
+    direction: shallow under copy-on-write, deep otherwise (pandas 2.x default).
+    """
+    if PANDAS_COPY_ON_WRITE or pd.options.mode.copy_on_write is True:
+        return obj.copy(deep=False)
+    return obj.copy()
+
+
+def frame_nbytes(df):
+    """Deep in-memory size of a frame in bytes."""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+def normalize_shot_frame(df):
+    """
+    Converts a raw ShotChartDetail frame to the compact SHOT_SCHEMA and adds the
+    derived columns in vectorized form.
+
+    Returns (normalized_df, stats) where stats holds bytes_before, bytes_after
+    and bytes_saved.
+    """
+    bytes_before = frame_nbytes(df)
+
+    columns = {}
+    for col, dtype in SHOT_SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if col == 'GAME_DATE':
+            columns[col] = pd.to_datetime(df[col], format='%Y%m%d')
+        else:
+            columns[col] = df[col].astype(dtype)
+    out = pd.DataFrame(columns, index=pd.RangeIndex(len(df)))
+
+    made = out['SHOT_MADE_FLAG'].to_numpy()
+    is_three = (out['SHOT_TYPE'] == '3PT Field Goal').to_numpy()
+
+    # codes: 0 -> 'Made', 1 -> 'Missed'
+    out['SHOT_RESULT'] = pd.Categorical.from_codes((made != 1).astype('int8'), SHOT_RESULT_CATEGORIES)
+    out['SHOT_VALUE'] = np.where(is_three, 3, 2).astype('int8')
+    out['SHOT_POINTS'] = (out['SHOT_VALUE'].to_numpy() * (made == 1)).astype('int8')
+
+    bytes_after = frame_nbytes(out)
+    stats = {
+        'bytes_before': bytes_before,
+        'bytes_after': bytes_after,
+        'bytes_saved': bytes_before - bytes_after,
+    }
+    return out, stats
+
+
+def concat_shot_frames(frames_by_season):
+    """
+    Concatenates per-season shot frames into one compact frame with an ordered
+    (chronological) SEASON categorical. Categorical columns are re-encoded
+    over the union of their categories so the result stays compact instead of
+    falling back to object dtype.
+    """
+    frames = [df for df in frames_by_season.values() if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    # 'YYYY-YY' strings sort chronologically
+    seasons = sorted(frames_by_season)
+    season_codes = np.concatenate([
+        np.full(len(df), seasons.index(season), dtype=np.int16)
+        for season, df in frames_by_season.items() if not df.empty
+    ])
+
+    out = _restore_categoricals(pd.concat(frames, ignore_index=True))
+    out['SEASON'] = pd.Categorical.from_codes(season_codes, categories=seasons, ordered=True)
+    return out
+
+
+def concat_shot_chunks(chunks):
+    """
+    Concatenates normalized shot frames of the same season (e.g. date-window
+    chunks) in one pass, keeping categorical columns categorical.
+    """
+    chunks = [df for df in chunks if not df.empty]
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+    return _restore_categoricals(pd.concat(chunks, ignore_index=True))
+
+
+def _restore_categoricals(out):
+    # pd.concat falls back to object dtype when category sets differ
+    for col, dtype in {**SHOT_SCHEMA, **DERIVED_COLUMNS}.items():
+        if dtype == 'category' and col in out.columns and out[col].dtype != 'category':
+            out[col] = out[col].astype('category')
+    return out
+
+
+def shot_keys(df):
+    """Unique int64 key per shot: GAME_ID * 10_000 + GAME_EVENT_ID."""
+    game = df['GAME_ID']
+    if isinstance(game.dtype, pd.CategoricalDtype):
+        # Parse each distinct GAME_ID once, then broadcast through the codes
+        game_ids = pd.to_numeric(game.cat.categories).to_numpy(dtype=np.int64)[game.cat.codes.to_numpy()]
+    else:
+        game_ids = pd.to_numeric(game).to_numpy(dtype=np.int64)
+    return game_ids * 10_000 + df['GAME_EVENT_ID'].to_numpy(dtype=np.int64)
+
+
+def append_shot_frame(df, new):
+    """
+    Appends the shots in `new` that `df` does not already hold (by GAME_ID,
+    GAME_EVENT_ID). Existing rows keep their positions, so anything derived
+    from `df` can be brought up to date from the tail alone.
+    Returns (combined_df, rows_added).
+    """
+    if new.empty:
+        return df, 0
+    if df.empty:
+        return new.reset_index(drop=True), len(new)
+    fresh = new[~np.isin(shot_keys(new), shot_keys(df))]
+    if fresh.empty:
+        return df, 0
+    return _restore_categoricals(pd.concat([df, fresh], ignore_index=True)), len(fresh)
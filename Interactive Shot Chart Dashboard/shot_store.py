@@ -0,0 +1,134 @@
+import itertools
+import json
+import os
+import tempfile
+import time
+from functools import lru_cache
+
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+
+# Key under which our entry metadata lives in the Arrow schema metadata
+_META_KEY = b'shot_store'
+
+DEFAULT_STORE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'nba_shot_chart')
+
+# mkstemp creates 0600 files; entries are made readable by other processes and users
+# (octal, e.g. NBA_SHOT_STORE_MODE=640 to limit the store to a group)
+ENTRY_MODE = int(os.environ.get('NBA_SHOT_STORE_MODE') or '644', 8)
+
+_version_counter = itertools.count()
+
+
+def new_version():
+    """
+    Version token for a new write, unique across concurrent writers without a
+    lock: write time in ns, the writer's pid and a per-process counter. Versions
+    are only ever compared for equality (derived caches key on them).
+    """
+    return f"{time.time_ns():x}-{os.getpid():x}-{next(_version_counter):x}"
+
+
+class ShotStore:
+    """
+    On-disk frame store shared by every process on the box.
+
+    Each entry is a single Feather (Arrow IPC) file under `<root>/<kind>/`,
+    e.g. `shots/203999_2024-25.feather`. The entry's metadata (write time,
+    TTL, version) is embedded in the Arrow schema, so one `os.replace` swaps
+    data and metadata together and readers never see a half-written entry.
+    Files are memory-mapped on read, so reloading a season is a local read
+    rather than an API round trip.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or os.environ.get('NBA_SHOT_STORE_DIR', DEFAULT_STORE_DIR)
+
+    def path(self, kind, *key):
+        name = '_'.join(str(k) for k in key) + '.feather'
+        return os.path.join(self.root, kind, name)
+
+    def read_meta(self, kind, *key):
+        """Entry metadata without loading the frame, or None if absent/unreadable."""
+        try:
+            with pa.memory_map(self.path(kind, *key), 'r') as source:
+                schema = ipc.open_file(source).schema
+        except (FileNotFoundError, pa.ArrowInvalid, OSError):
+            return None
+        raw = (schema.metadata or {}).get(_META_KEY)
+        return json.loads(raw) if raw else None
+
+    def is_fresh(self, meta, now=None):
+        if meta is None:
+            return False
+        ttl = meta.get('ttl')
+        if ttl is None:
+            return True
+        now = time.time() if now is None else now
+        return now - meta['written_at'] < ttl
+
+    def read(self, kind, *key, allow_stale=False):
+        """
+        Returns (frame, meta) for a fresh entry, or None.
+        With allow_stale=True expired entries are returned too (callers check meta).
+        """
+        path = self.path(kind, *key)
+        try:
+            table = feather.read_table(path, memory_map=True)
+        except (FileNotFoundError, pa.ArrowInvalid, OSError):
+            return None
+
+        raw = (table.schema.metadata or {}).get(_META_KEY)
+        meta = json.loads(raw) if raw else None
+        if meta is None or (not allow_stale and not self.is_fresh(meta)):
+            return None
+        return table.to_pandas(), meta
+
+    def write(self, kind, *key, frame, ttl=None, **extra):
+        """
+        Atomically writes `frame` for `key`. `ttl` is in seconds (None = never expires).
+        Each write gets a new version unless `version=` is passed to keep one.
+        Returns the stored metadata.
+        """
+        meta = {
+            'written_at': time.time(),
+            'ttl': ttl,
+            'rows': int(len(frame)),
+            'version': new_version(),
+            **extra,
+        }
+
+        table = pa.Table.from_pandas(frame.reset_index(drop=True), preserve_index=False)
+        schema_meta = dict(table.schema.metadata or {})
+        schema_meta[_META_KEY] = json.dumps(meta).encode()
+        table = table.replace_schema_metadata(schema_meta)
+
+        path = self.path(kind, *key)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+
+        # Write next to the target and rename over it: atomic on POSIX and Windows
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            os.chmod(tmp_path, ENTRY_MODE)
+            with os.fdopen(fd, 'wb') as sink:
+                feather.write_feather(table, sink)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return meta
+
+    def delete(self, kind, *key):
+        try:
+            os.remove(self.path(kind, *key))
+        except FileNotFoundError:
+            pass
+
+
+@lru_cache(maxsize=None)
+def get_shot_store(root=None):
+    """Process-wide store instance (root defaults to $NBA_SHOT_STORE_DIR)."""
+    return ShotStore(root)
@@ -0,0 +1,278 @@
+"""
+Synthetic NBA data with realistic shapes, for offline benchmarking and the
+fake/replay data sources. Locations are drawn from a per-zone mixture and
+every zone/area/range/distance/shot-type label is then derived from the
+location with the API's court geometry, so frames are internally consistent.
+Everything is vectorized; 10^7 shots take a few seconds.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from shot_schema import normalize_shot_frame, SHOT_RESULT_CATEGORIES
+
+# (share of attempts, FG%) per location family, roughly league-average
+SHOT_MIX = {
+    'rim':       (0.30, 0.66),
+    'paint':     (0.15, 0.44),
+    'midrange':  (0.12, 0.42),
+    'corner3':   (0.10, 0.39),
+    'above3':    (0.32, 0.36),
+    'backcourt': (0.01, 0.03),
+}
+
+ZONE_BASIC = ['Restricted Area', 'In The Paint (Non-RA)', 'Mid-Range', 'Left Corner 3',
+              'Right Corner 3', 'Above the Break 3', 'Backcourt']
+ZONE_AREA = ['Center(C)', 'Left Side Center(LC)', 'Right Side Center(RC)', 'Left Side(L)',
+             'Right Side(R)', 'Back Court(BC)']
+ZONE_RANGE = ['Less Than 8 ft.', '8-16 ft.', '16-24 ft.', '24+ ft.', 'Back Court Shot']
+SHOT_TYPES = ['2PT Field Goal', '3PT Field Goal']
+
+# Action types per family, with weights
+ACTIONS = {
+    'rim': (['Layup Shot', 'Driving Layup Shot', 'Dunk Shot', 'Cutting Layup Shot', 'Tip Layup Shot'],
+            [0.30, 0.30, 0.20, 0.12, 0.08]),
+    'paint': (['Driving Floating Jump Shot', 'Turnaround Hook Shot', 'Floating Jump shot', 'Jump Shot'],
+              [0.35, 0.25, 0.20, 0.20]),
+    'jumper': (['Jump Shot', 'Pullup Jump shot', 'Step Back Jump shot', 'Running Jump Shot'],
+               [0.60, 0.22, 0.12, 0.06]),
+}
+ACTION_TYPES = sorted({a for names, _ in ACTIONS.values() for a in names})
+
+TEAMS = ['ATL', 'BOS', 'BKN', 'CHA', 'CHI', 'CLE', 'DAL', 'DEN', 'DET', 'GSW', 'HOU', 'IND', 'LAC', 'LAL', 'MEM',
+         'MIA', 'MIL', 'MIN', 'NOP', 'NYK', 'OKC', 'ORL', 'PHI', 'PHX', 'POR', 'SAC', 'SAS', 'TOR', 'UTA', 'WAS']
+
+
+def _sample_locations(family, n, rng):
+    if family == 'rim':
+        r = np.abs(rng.normal(0, 18, n)).clip(0, 39)
+        theta = rng.uniform(-0.15 * np.pi, 1.15 * np.pi, n)
+    elif family == 'paint':
+        return rng.uniform(-79, 79, n), rng.uniform(-40, 140, n)
+    elif family == 'midrange':
+        r = rng.uniform(90, 230, n)
+        theta = rng.uniform(0.0, np.pi, n)
+    elif family == 'corner3':
+        side = rng.choice([-1, 1], n)
+        return side * rng.uniform(221, 245, n), rng.uniform(-45, 90, n)
+    elif family == 'above3':
+        r = rng.gamma(4.0, 6.0, n) + 238
+        theta = rng.uniform(0.13 * np.pi, 0.87 * np.pi, n)
+    else:  # backcourt heaves
+        return rng.uniform(-240, 240, n), rng.uniform(430, 840, n)
+    return r * np.cos(theta), r * np.sin(theta)
+
+
+def label_locations(loc_x, loc_y):
+    """
+    Zone labels from court geometry (API units, hoop at the origin).
+    Returns integer codes into ZONE_BASIC, ZONE_AREA, ZONE_RANGE and SHOT_TYPES,
+    plus SHOT_DISTANCE in feet.
+    """
+    dist = np.hypot(loc_x, loc_y)
+    distance_ft = np.floor(dist / 10).astype(np.int16)
+
+    backcourt = loc_y >= 422.5
+    corner3 = (np.abs(loc_x) >= 220) & (loc_y <= 92.5) & ~backcourt
+    above3 = (dist >= 237.5) & ~corner3 & ~backcourt
+    restricted = (dist <= 40) & ~backcourt
+    paint = (np.abs(loc_x) < 80) & (loc_y < 142.5) & ~restricted
+
+    basic = np.select(
+        [backcourt, corner3 & (loc_x < 0), corner3, above3, restricted, paint],
+        [6, 3, 4, 5, 0, 1],
+        default=2,
+    ).astype(np.int8)
+
+    angle = np.degrees(np.arctan2(loc_x, np.maximum(loc_y, 0.0)))  # 0 = straight on, < 0 = left
+    area = np.select(
+        [backcourt, restricted, np.abs(angle) <= 22.5, (angle < 0) & (angle >= -67.5), (angle > 0) & (angle <= 67.5), angle < 0],
+        [5, 0, 0, 1, 2, 3],
+        default=4,
+    ).astype(np.int8)
+
+    zone_range = np.select(
+        [backcourt, distance_ft < 8, distance_ft < 16, distance_ft < 24],
+        [4, 0, 1, 2],
+        default=3,
+    ).astype(np.int8)
+
+    shot_type = (corner3 | above3 | backcourt).astype(np.int8)
+    return basic, area, zone_range, shot_type, distance_ft
+
+
+def synthetic_shots(n, seed=0, player_id=1, player_name='Synthetic Player', team_id=1610612743,
+                    team='DEN', season='2024-25', games=82, compact=True, roster=None):
+    """
+    `n` synthetic shot attempts. With compact=True the frame already follows
+    SHOT_SCHEMA (categoricals, downcast ints) and includes the derived columns;
+    with compact=False it looks like a raw ShotChartDetail result.
+    `roster` ([(player_id, player_name), ...]) spreads the shots over several
+    players with a realistic usage skew, as in a team request.
+    """
+    rng = np.random.default_rng(seed)
+
+    families = list(SHOT_MIX)
+    shares = np.array([SHOT_MIX[f][0] for f in families])
+    family_idx = rng.choice(len(families), size=n, p=shares / shares.sum())
+
+    loc_x = np.empty(n)
+    loc_y = np.empty(n)
+    made = np.empty(n, dtype=np.int8)
+    action = np.empty(n, dtype=np.int16)
+    for i, family in enumerate(families):
+        mask = family_idx == i
+        k = int(mask.sum())
+        if not k:
+            continue
+        loc_x[mask], loc_y[mask] = _sample_locations(family, k, rng)
+        made[mask] = rng.random(k) < SHOT_MIX[family][1]
+        kind = family if family in ('rim', 'paint') else 'jumper'
+        names, weights = ACTIONS[kind]
+        picks = rng.choice(len(names), size=k, p=weights)
+        action[mask] = np.array([ACTION_TYPES.index(a) for a in names])[picks]
+
+    loc_x = np.rint(loc_x).astype(np.int16)
+    loc_y = np.rint(loc_y).astype(np.int16)
+    basic, area, zone_range, shot_type, distance_ft = label_locations(loc_x, loc_y)
+
+    # Schedule: `games` games ~every 2.2 days from late October, shots spread evenly
+    start_year = int(season[:4])
+    game_no = np.sort(rng.integers(0, games, n))
+    game_dates = np.array([np.datetime64(date(start_year, 10, 22) + timedelta(days=int(g * 2.2))) for g in range(games)])
+    game_ids = [f"002{str(start_year)[-2:]}{g + 1:05d}" for g in range(games)]
+    opponents = rng.choice([t for t in TEAMS if t != team], size=games)
+    home = rng.random(games) < 0.5
+    htm = np.where(home, team, opponents)
+    vtm = np.where(home, opponents, team)
+
+    if roster:
+        # Usage falls off geometrically down the rotation
+        usage = 0.8 ** np.arange(len(roster))
+        player_codes = rng.choice(len(roster), size=n, p=usage / usage.sum()).astype(np.int8)
+        player_ids = np.array([pid for pid, _ in roster], dtype=np.int32)[player_codes]
+        player_names = [name for _, name in roster]
+    else:
+        player_codes = np.zeros(n, dtype=np.int8)
+        player_ids = np.full(n, player_id, dtype=np.int32)
+        player_names = [player_name]
+
+    period = rng.choice([1, 2, 3, 4, 5], size=n, p=[0.255, 0.25, 0.255, 0.235, 0.005]).astype(np.int8)
+    minutes = rng.integers(0, 12, n).astype(np.int8)
+    seconds = rng.integers(0, 60, n).astype(np.int8)
+
+    frame = pd.DataFrame({
+        'GAME_ID': pd.Categorical.from_codes(game_no, game_ids),
+        'GAME_EVENT_ID': (np.arange(n) % 700 + 1).astype(np.int16),
+        'PLAYER_ID': player_ids,
+        'PLAYER_NAME': pd.Categorical.from_codes(player_codes, player_names),
+        'TEAM_ID': np.full(n, team_id, dtype=np.int32),
+        'TEAM_NAME': pd.Categorical.from_codes(np.zeros(n, dtype=np.int8), [team]),
+        'PERIOD': period,
+        'MINUTES_REMAINING': minutes,
+        'SECONDS_REMAINING': seconds,
+        'EVENT_TYPE': pd.Categorical.from_codes((made == 0).astype(np.int8), ['Made Shot', 'Missed Shot']),
+        'ACTION_TYPE': pd.Categorical.from_codes(action, ACTION_TYPES),
+        'SHOT_TYPE': pd.Categorical.from_codes(shot_type, SHOT_TYPES),
+        'SHOT_ZONE_BASIC': pd.Categorical.from_codes(basic, ZONE_BASIC),
+        'SHOT_ZONE_AREA': pd.Categorical.from_codes(area, ZONE_AREA),
+        'SHOT_ZONE_RANGE': pd.Categorical.from_codes(zone_range, ZONE_RANGE),
+        'SHOT_DISTANCE': distance_ft,
+        'LOC_X': loc_x,
+        'LOC_Y': loc_y,
+        'SHOT_ATTEMPTED_FLAG': np.ones(n, dtype=np.int8),
+        'SHOT_MADE_FLAG': made,
+        'GAME_DATE': game_dates[game_no],
+        'HTM': pd.Categorical(htm[game_no], categories=TEAMS),
+        'VTM': pd.Categorical(vtm[game_no], categories=TEAMS),
+    })
+
+    if not compact:
+        raw = frame.copy()
+        for col in raw.columns:
+            if isinstance(raw[col].dtype, pd.CategoricalDtype):
+                raw[col] = raw[col].astype(str)
+        raw['GAME_DATE'] = raw['GAME_DATE'].dt.strftime('%Y%m%d')
+        raw.insert(0, 'GRID_TYPE', 'Shot Chart Detail')
+        return raw
+
+    value = np.where(shot_type == 1, 3, 2).astype(np.int8)
+    frame['SHOT_RESULT'] = pd.Categorical.from_codes((made != 1).astype(np.int8), SHOT_RESULT_CATEGORIES)
+    frame['SHOT_VALUE'] = value
+    frame['SHOT_POINTS'] = (value * made).astype(np.int8)
+    return frame
+
+
+def synthetic_game_log(player_id=1, season='2024-25', games=70, seed=0, scoring=22.0):
+    """A PlayerGameLog-shaped frame (most recent game first, like the API)."""
+    rng = np.random.default_rng(seed)
+    start_year = int(season[:4])
+    dates = [date(start_year, 10, 22) + timedelta(days=int(g * 2.3)) for g in range(games)]
+    opponents = rng.choice(TEAMS[1:], size=games)
+    home = rng.random(games) < 0.5
+
+    fga = rng.poisson(scoring / 1.15, games).clip(1)
+    fgm = rng.binomial(fga, 0.47)
+    fg3a = rng.binomial(fga, 0.38)
+    fg3m = np.minimum(rng.binomial(fg3a, 0.36), fgm)
+    fta = rng.poisson(scoring / 4.5, games)
+    ftm = rng.binomial(fta, 0.8)
+    pts = 2 * fgm + fg3m + ftm
+    oreb = rng.poisson(1.2, games)
+    dreb = rng.poisson(5.0, games)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log = pd.DataFrame({
+            'SEASON_ID': f"2{start_year}",
+            'Player_ID': player_id,
+            'Game_ID': [f"002{str(start_year)[-2:]}{g + 1:05d}" for g in range(games)],
+            'GAME_DATE': [d.strftime('%b %d, %Y').upper() for d in dates],
+            'MATCHUP': [f"DEN vs. {o}" if h else f"DEN @ {o}" for o, h in zip(opponents, home)],
+            'WL': rng.choice(['W', 'L'], games),
+            'MIN': rng.integers(24, 40, games),
+            'FGM': fgm, 'FGA': fga, 'FG_PCT': np.round(fgm / fga, 3),
+            'FG3M': fg3m, 'FG3A': fg3a, 'FG3_PCT': np.round(np.where(fg3a > 0, fg3m / fg3a, 0), 3),
+            'FTM': ftm, 'FTA': fta, 'FT_PCT': np.round(np.where(fta > 0, ftm / fta, 0), 3),
+            'OREB': oreb, 'DREB': dreb, 'REB': oreb + dreb,
+            'AST': rng.poisson(5.0, games), 'STL': rng.poisson(1.1, games), 'BLK': rng.poisson(0.7, games),
+            'TOV': rng.poisson(2.5, games), 'PF': rng.poisson(2.2, games),
+            'PTS': pts, 'PLUS_MINUS': rng.integers(-20, 21, games),
+            'VIDEO_AVAILABLE': 1,
+        })
+    return log.iloc[::-1].reset_index(drop=True)
+
+
+def synthetic_career(player_id=1, last_season='2024-25', seasons=6, seed=0):
+    """A PlayerCareerStats (PerGame) SeasonTotalsRegularSeason-shaped frame."""
+    rng = np.random.default_rng(seed)
+    last = int(last_season[:4])
+    years = list(range(last - seasons + 1, last + 1))
+    n = len(years)
+    return pd.DataFrame({
+        'PLAYER_ID': player_id,
+        'SEASON_ID': [f"{y}-{str(y + 1)[-2:]}" for y in years],
+        'LEAGUE_ID': '00',
+        'TEAM_ID': 1610612743,
+        'TEAM_ABBREVIATION': 'DEN',
+        'PLAYER_AGE': np.arange(22, 22 + n),
+        'GP': rng.integers(55, 82, n), 'GS': rng.integers(40, 82, n),
+        'MIN': np.round(rng.uniform(28, 36, n), 1),
+        'FGM': np.round(rng.uniform(6, 10, n), 1), 'FGA': np.round(rng.uniform(13, 19, n), 1),
+        'FG_PCT': np.round(rng.uniform(0.44, 0.55, n), 3),
+        'FG3M': np.round(rng.uniform(1, 3, n), 1), 'FG3A': np.round(rng.uniform(3, 8, n), 1),
+        'FG3_PCT': np.round(rng.uniform(0.32, 0.40, n), 3),
+        'FTM': np.round(rng.uniform(2, 6, n), 1), 'FTA': np.round(rng.uniform(3, 7, n), 1),
+        'FT_PCT': np.round(rng.uniform(0.72, 0.88, n), 3),
+        'OREB': np.round(rng.uniform(0.5, 2.5, n), 1), 'DREB': np.round(rng.uniform(3, 8, n), 1),
+        'REB': np.round(rng.uniform(4, 10, n), 1), 'AST': np.round(rng.uniform(2, 8, n), 1),
+        'STL': np.round(rng.uniform(0.5, 1.5, n), 1), 'BLK': np.round(rng.uniform(0.2, 1.2, n), 1),
+        'TOV': np.round(rng.uniform(1.5, 3.5, n), 1), 'PF': np.round(rng.uniform(1.5, 3, n), 1),
+        'PTS': np.round(rng.uniform(15, 28, n), 1),
+    })
+
+
+def normalized_synthetic_shots(n, seed=0, **kwargs):
+    """Raw synthetic frame run through normalize_shot_frame (exercises the real transform)."""
+    df, _ = normalize_shot_frame(synthetic_shots(n, seed=seed, compact=False, **kwargs))
+    return df
@@ -0,0 +1,174 @@
+"""
+Team (and player group) shot aggregates built as the season streams in.
+
+A team season is fetched in date windows; each chunk is folded into count
+arrays the moment it arrives (one bincount per statistic over
+player x zone and player x hex bin), so the team chart and the per-player
+breakdown never need the chunks concatenated or re-scanned. Any group of
+the team's players (a lineup, the starters, the bench) is a column sum
+over the same arrays.
+"""
+import numpy as np
+import pandas as pd
+
+from comparison import ZoneMatrix
+from league_baseline import ZONE_NAMES, zone_indices
+from shot_chart_utils import HexGrid, ShotBinGrid
+
+# Players shown in the team zone x player matrix
+TEAM_MATRIX_PLAYERS = 6
+
+
+class TeamAggregate:
+    """
+    Counts for one team season, with one column per player in order of first
+    appearance. zone_fga/zone_fgm are [zone, player] over ZONE_NAMES;
+    bin_fga/bin_fgm/bin_pts are [player, hex bin] on a HexGrid.
+    """
+
+    def __init__(self, gridsize=40, grid=None):
+        self.grid = grid or HexGrid(gridsize)
+        self.player_ids = []
+        self.player_names = []
+        self._column = {}
+        self.zone_fga = np.zeros((len(ZONE_NAMES), 0), dtype=np.int64)
+        self.zone_fgm = np.zeros((len(ZONE_NAMES), 0), dtype=np.int64)
+        self.bin_fga = np.zeros((0, self.grid.n_bins), dtype=np.int64)
+        self.bin_fgm = np.zeros((0, self.grid.n_bins), dtype=np.int64)
+        self.bin_pts = np.zeros((0, self.grid.n_bins), dtype=np.int64)
+        # Per player: FGA, FGM, 3PA, 3PM, points
+        self.totals = np.zeros((0, 5), dtype=np.int64)
+        self.games = set()
+        self.rows = 0
+
+    @classmethod
+    def from_frame(cls, df, chunk_rows=None, **kwargs):
+        """Aggregate of a whole frame (in chunks of `chunk_rows` to bound temporaries)."""
+        agg = cls(**kwargs)
+        step = chunk_rows or max(len(df), 1)
+        for start in range(0, len(df), step):
+            agg.add(df.iloc[start:start + step])
+        return agg
+
+    def copy(self):
+        out = TeamAggregate(grid=self.grid)
+        out.player_ids, out.player_names = list(self.player_ids), list(self.player_names)
+        out._column = dict(self._column)
+        for name in ('zone_fga', 'zone_fgm', 'bin_fga', 'bin_fgm', 'bin_pts', 'totals'):
+            setattr(out, name, getattr(self, name).copy())
+        out.games, out.rows = set(self.games), self.rows
+        return out
+
+    def _columns_for(self, df):
+        # Column per shot; new players widen the arrays (a handful of times per season)
+        ids = df['PLAYER_ID'].to_numpy()
+        unique, inverse = np.unique(ids, return_inverse=True)
+        names = df.groupby('PLAYER_ID', observed=True)['PLAYER_NAME'].first()
+        new = [int(p) for p in unique if int(p) not in self._column]
+        if new:
+            for player_id in new:
+                self._column[player_id] = len(self.player_ids)
+                self.player_ids.append(player_id)
+                self.player_names.append(str(names.get(player_id, player_id)))
+            grow = len(new)
+            self.zone_fga = np.pad(self.zone_fga, ((0, 0), (0, grow)))
+            self.zone_fgm = np.pad(self.zone_fgm, ((0, 0), (0, grow)))
+            self.bin_fga = np.pad(self.bin_fga, ((0, grow), (0, 0)))
+            self.bin_fgm = np.pad(self.bin_fgm, ((0, grow), (0, 0)))
+            self.bin_pts = np.pad(self.bin_pts, ((0, grow), (0, 0)))
+            self.totals = np.pad(self.totals, ((0, grow), (0, 0)))
+        lookup = np.array([self._column[int(p)] for p in unique], dtype=np.int64)
+        return lookup[inverse]
+
+    def add(self, df):
+        """Folds a chunk of normalized shots into the counts (in place) and returns self."""
+        if df.empty:
+            return self
+        column = self._columns_for(df)
+        n_players = len(self.player_ids)
+        made = (df['SHOT_MADE_FLAG'].to_numpy() == 1)
+        points = df['SHOT_POINTS'].to_numpy().astype(np.int64)
+        three = df['SHOT_VALUE'].to_numpy() == 3
+
+        zone = zone_indices(df)
+        known = zone >= 0
+        flat = zone[known] * n_players + column[known]
+        size = len(ZONE_NAMES) * n_players
+        self.zone_fga += np.bincount(flat, minlength=size).reshape(len(ZONE_NAMES), n_players)
+        self.zone_fgm += np.bincount(flat, weights=made[known], minlength=size).astype(np.int64).reshape(
+            len(ZONE_NAMES), n_players)
+
+        index = self.grid.bin_index(df['LOC_X'].to_numpy(), df['LOC_Y'].to_numpy())
+        inside = index >= 0
+        flat = column[inside] * self.grid.n_bins + index[inside]
+        size = n_players * self.grid.n_bins
+        self.bin_fga += np.bincount(flat, minlength=size).reshape(n_players, -1)
+        self.bin_fgm += np.bincount(flat, weights=made[inside], minlength=size).astype(np.int64).reshape(n_players, -1)
+        self.bin_pts += np.bincount(flat, weights=points[inside], minlength=size).astype(np.int64).reshape(n_players, -1)
+
+        for k, values in enumerate((None, made, three, three & made, points)):
+            self.totals[:, k] += np.bincount(column, weights=values, minlength=n_players).astype(np.int64)
+
+        self.games.update(df['GAME_ID'].unique().tolist())
+        self.rows += len(df)
+        return self
+
+    def _select(self, player_ids):
+        # Column indices for a player group (None = whole team)
+        if player_ids is None:
+            return np.arange(len(self.player_ids))
+        return np.array([self._column[p] for p in player_ids if p in self._column], dtype=np.int64)
+
+    def bins(self, player_ids=None):
+        """ShotBinGrid for the team, or for a group of its players."""
+        columns = self._select(player_ids)
+        out = ShotBinGrid(grid=self.grid)
+        out.attempts = self.bin_fga[columns].sum(axis=0)
+        out.makes = self.bin_fgm[columns].sum(axis=0)
+        out.points = self.bin_pts[columns].sum(axis=0)
+        return out
+
+    def zone_frame(self, player_ids=None):
+        """ZONE_NAME, FGA, FGM, FG_PCT for the team or a player group (attempted zones only)."""
+        columns = self._select(player_ids)
+        fga, fgm = self.zone_fga[:, columns].sum(axis=1), self.zone_fgm[:, columns].sum(axis=1)
+        keep = np.flatnonzero(fga)
+        return pd.DataFrame({
+            'ZONE_NAME': [ZONE_NAMES[i] for i in keep],
+            'FGA': fga[keep],
+            'FGM': fgm[keep],
+            'FG_PCT': fgm[keep] / fga[keep],
+        })
+
+    def player_frame(self):
+        """Per-player breakdown, highest volume first."""
+        fga, fgm, fg3a, fg3m, pts = self.totals.T
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out = pd.DataFrame({
+                'PLAYER_ID': self.player_ids,
+                'PLAYER_NAME': self.player_names,
+                'FGA': fga,
+                'FGM': fgm,
+                'FG_PCT': np.where(fga > 0, fgm / fga, np.nan),
+                '3PA': fg3a,
+                '3PM': fg3m,
+                '3P_PCT': np.where(fg3a > 0, fg3m / fg3a, np.nan),
+                'PTS': pts,
+                'PPS': np.where(fga > 0, pts / fga, np.nan),
+                'SHARE': fga / max(self.rows, 1),
+            })
+        return out.sort_values('FGA', ascending=False, kind='stable').reset_index(drop=True)
+
+    def top_players(self, n=TEAM_MATRIX_PLAYERS):
+        """IDs of the n highest-volume shooters."""
+        order = np.argsort(-self.totals[:, 0], kind='stable')[:n]
+        return [self.player_ids[i] for i in order]
+
+    def zone_matrix(self, player_ids=None):
+        """comparison.ZoneMatrix over the given players (default: the top shooters)."""
+        player_ids = player_ids if player_ids is not None else self.top_players()
+        columns = self._select(player_ids)
+        fga, fgm = self.zone_fga[:, columns], self.zone_fgm[:, columns]
+        rows = np.flatnonzero(fga.sum(axis=1))
+        return ZoneMatrix([ZONE_NAMES[i] for i in rows], [self.player_names[j] for j in columns],
+                          fga[rows], fgm[rows])
@@ -0,0 +1,27 @@
+import os
+import sys
+
+import pytest
+
+# The dashboard modules are imported as top-level modules, as streamlit runs them
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def offline(tmp_path, monkeypatch):
+    """Synthetic data source and an empty shot store / frame tier under tmp_path."""
+    from shot_store import get_shot_store
+    from frame_cache import get_frame_cache
+    from derived_cache import get_derived_cache
+    from data_source import SyntheticSource, set_data_source
+
+    monkeypatch.setenv('NBA_SHOT_STORE_DIR', str(tmp_path / 'store'))
+    for cached in (get_shot_store, get_frame_cache):
+        cached.cache_clear()
+    get_derived_cache().clear()
+    source = SyntheticSource()
+    previous = set_data_source(source)
+    yield source
+    set_data_source(previous)
+    for cached in (get_shot_store, get_frame_cache):
+        cached.cache_clear()
@@ -0,0 +1,31 @@
+import pytest
+
+from batch_scouting import _init_worker, roster_form
+from synthetic import synthetic_game_log
+from upstream import get_rate_limiter
+
+
+@pytest.fixture
+def fresh_limiter(monkeypatch):
+    monkeypatch.setenv('NBA_API_RATE', '2')
+    monkeypatch.setenv('NBA_API_BURST', '6')
+    get_rate_limiter.cache_clear()
+    yield get_rate_limiter()
+    get_rate_limiter.cache_clear()
+
+
+def test_workers_split_the_rate_limit(fresh_limiter):
+    _init_worker(None, 'error', 4)
+    assert fresh_limiter.rate == 0.5 and fresh_limiter.capacity == 1
+
+
+def test_unlimited_stays_unlimited(fresh_limiter):
+    fresh_limiter.configure(0, burst=3)
+    _init_worker(None, 'error', 4)
+    assert fresh_limiter.rate == 0 and fresh_limiter.capacity == 3
+
+
+def test_roster_form_keeps_the_roster_order():
+    players = [(2544, 'LeBron James'), (203999, 'Nikola Jokić'), (1, 'No Log')]
+    logs = {name: synthetic_game_log(pid, '2023-24', seed=pid) for pid, name in reversed(players[:2])}
+    assert list(roster_form(players, logs)['PLAYER']) == ['LeBron James', 'Nikola Jokić']
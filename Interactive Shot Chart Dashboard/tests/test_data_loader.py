@@ -0,0 +1,51 @@
+import pandas as pd
+
+from cache_utils import get_shot_data
+from data_loader import load_player_data, load_players_shots
+from shot_schema import SHOT_SCHEMA
+
+PLAYER = 'LeBron James'
+
+
+def test_single_season_is_the_normalized_cached_frame(offline):
+    data = load_player_data(PLAYER, '2023-24')
+    assert data.errors == {}
+    assert not data.shots.empty and not data.game_log.empty and not data.career.empty
+    assert data.team_id == data.shots['TEAM_ID'].iloc[0]
+    for col in ('ACTION_TYPE', 'SHOT_ZONE_BASIC', 'PLAYER_NAME'):
+        assert data.shots[col].dtype == SHOT_SCHEMA[col]
+    assert data.shots.attrs['data_key'] == ('shots', 2544, '2023-24')
+
+    again, _ = get_shot_data(PLAYER, '2023-24')
+    pd.testing.assert_frame_equal(again, data.shots)
+    assert again.attrs['data_version'] == data.shots.attrs['data_version']
+
+
+def test_season_range_merges_per_season_frames(offline):
+    seasons = ['2023-24', '2022-23', '2021-22']
+    data = load_player_data(PLAYER, seasons)
+    singles = {season: get_shot_data(PLAYER, season)[0] for season in seasons}
+
+    assert len(data.shots) == sum(len(df) for df in singles.values())
+    assert list(data.shots['SEASON'].cat.categories) == sorted(seasons)
+    for season, df in singles.items():
+        assert (data.shots['SEASON'] == season).sum() == len(df)
+    assert set(data.game_log['SEASON']) == set(seasons)
+    # Versioned from the per-season stamps, so derived results cache on the merged frame too
+    assert data.shots.attrs.get('data_key') is not None
+
+
+def test_failures_are_isolated_per_call(offline, monkeypatch):
+    def broken(endpoint, params):
+        raise KeyError('resultSets')
+
+    monkeypatch.setattr(offline, '_fetch', broken)
+    data = load_player_data(PLAYER, '2023-24')
+    assert data.shots.empty and data.team_id is None
+
+
+def test_several_players_load_concurrently(offline):
+    frames, errors = load_players_shots([PLAYER, 'Stephen Curry', 'Not A Player'], '2023-24')
+    assert errors == {}
+    assert not frames[PLAYER].empty and not frames['Stephen Curry'].empty
+    assert frames['Not A Player'].empty
@@ -0,0 +1,60 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from data_source import (InjectedError, MissingRecording, RecordingSource, ReplaySource, SyntheticSource,
+                         make_data_source)
+
+
+def test_replay_serves_what_was_recorded(tmp_path):
+    recorder = RecordingSource(SyntheticSource(seed=1), str(tmp_path))
+    shots = recorder.shot_chart(2544, '2023-24', date_from=date(2023, 11, 1), date_to=date(2023, 11, 30))
+    log = recorder.game_log(2544, '2023-24')
+
+    replay = ReplaySource(str(tmp_path))
+    pd.testing.assert_frame_equal(
+        replay.shot_chart(2544, '2023-24', date_from=date(2023, 11, 1), date_to=date(2023, 11, 30)), shots,
+        check_dtype=False)
+    pd.testing.assert_frame_equal(replay.game_log(2544, '2023-24'), log, check_dtype=False)
+
+
+def test_replay_of_an_unrecorded_request(tmp_path, monkeypatch):
+    monkeypatch.setenv('NBA_API_RETRIES', '0')
+    with pytest.raises(MissingRecording):
+        ReplaySource(str(tmp_path)).career_stats(2544)
+
+    fallback = ReplaySource(str(tmp_path), fallback=SyntheticSource(seed=1))
+    pd.testing.assert_frame_equal(fallback.career_stats(2544), SyntheticSource(seed=1).career_stats(2544))
+
+
+def test_synthetic_is_deterministic_and_date_windows_slice_one_season():
+    source = SyntheticSource(seed=3, today=date(2025, 6, 30))
+    season = source.shot_chart(2544, '2024-25')
+    pd.testing.assert_frame_equal(season, SyntheticSource(seed=3, today=date(2025, 6, 30)).shot_chart(2544, '2024-25'))
+
+    windows = [(date(2024, 10, 1), date(2024, 12, 31)), (date(2025, 1, 1), None)]
+    parts = [source.shot_chart(2544, '2024-25', date_from=first, date_to=last) for first, last in windows]
+    assert sum(len(p) for p in parts) == len(season)
+    assert (pd.to_datetime(parts[0]['GAME_DATE'], format='%Y%m%d') <= '2024-12-31').all()
+
+
+def test_synthetic_games_after_today_have_not_happened():
+    early = SyntheticSource(today=date(2024, 12, 1)).game_log(2544, '2024-25')
+    later = SyntheticSource(today=date(2025, 3, 1)).game_log(2544, '2024-25')
+    assert 0 < len(early) < len(later)
+
+
+def test_injected_errors_surface_after_retries(monkeypatch):
+    monkeypatch.setenv('NBA_API_RETRIES', '1')
+    monkeypatch.setenv('NBA_API_BACKOFF_MS', '0')
+    source = SyntheticSource(error_rate=1.0, seed=0)
+    with pytest.raises(InjectedError):
+        source.career_stats(2544)
+
+
+def test_make_data_source(tmp_path):
+    assert isinstance(make_data_source('synthetic'), SyntheticSource)
+    assert isinstance(make_data_source('replay', directory=str(tmp_path)), ReplaySource)
+    with pytest.raises(ValueError):
+        make_data_source('carrier-pigeon')
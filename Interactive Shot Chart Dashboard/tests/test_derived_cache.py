@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from derived_cache import DerivedCache
+from form import form_report
+from synthetic import normalized_synthetic_shots, synthetic_game_log
+from team_aggregate import TeamAggregate
+from shot_chart_utils import calculate_zone_efficiency
+
+
+def versioned(df, key='k', version='v1'):
+    df.attrs.update(data_key=('shots', key), data_version=version)
+    return df
+
+
+def test_mutating_a_returned_frame_does_not_change_the_next_hit():
+    cache = DerivedCache()
+    shots = versioned(normalized_synthetic_shots(2_000))
+    first = cache.get('zones', calculate_zone_efficiency, shots)
+    expected = first.copy(deep=True)
+
+    first.iloc[0, 0] = first.iloc[1, 0]
+    first['extra'] = 1
+
+    again = cache.get('zones', calculate_zone_efficiency, shots)
+    assert cache.hits == 1
+    assert again.equals(expected)
+
+
+def test_mutating_a_returned_aggregate_does_not_change_the_next_hit():
+    cache = DerivedCache()
+    shots = versioned(normalized_synthetic_shots(2_000))
+    first = cache.get('team_aggregate', TeamAggregate.from_frame, shots)
+    players, games, rows = list(first.player_ids), set(first.games), first.rows
+
+    first.player_ids.append(-1)
+    first._column[-1] = 99
+    first.games.add('bogus')
+    first.rows += 1
+    with pytest.raises(ValueError):
+        first.totals[0, 0] += 1
+
+    again = cache.get('team_aggregate', TeamAggregate.from_frame, shots)
+    assert again is not first
+    assert again.player_ids == players
+    assert -1 not in again._column
+    assert again.games == games
+    assert again.rows == rows
+
+
+def test_mutating_a_returned_dataclass_does_not_change_the_next_hit():
+    cache = DerivedCache()
+    log = versioned(synthetic_game_log(games=20), key='log')
+    first = cache.get('form', lambda g: form_report({'player': g}), log)
+    first.players.append('someone else')
+    with pytest.raises(ValueError):
+        first.pts[0, 0] = 1e6
+
+    again = cache.get('form', lambda g: form_report({'player': g}), log)
+    assert again.players == ['player']
+    assert np.nanmax(again.pts) < 1e6
+
+
+def test_update_builds_from_the_cached_result_without_modifying_it():
+    cache = DerivedCache()
+    shots = normalized_synthetic_shots(2_000)
+    head = versioned(shots.iloc[:1_500].copy(), version=1_500)
+    cache.get('team_aggregate', TeamAggregate.from_frame, head)
+
+    grown = versioned(shots.copy(), version=2_000)
+    grown.attrs['appended_from'] = 1_500
+    updated = cache.get('team_aggregate', TeamAggregate.from_frame, grown,
+                        update=lambda agg, tail: agg.copy().add(tail))
+    assert cache.updates == 1
+    assert updated.rows == 2_000
+    np.testing.assert_array_equal(updated.totals, TeamAggregate.from_frame(shots).totals)
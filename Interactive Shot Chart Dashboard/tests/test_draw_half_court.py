@@ -0,0 +1,30 @@
+import json
+
+from shot_chart_utils import draw_half_court, _court_template
+
+
+def test_clone_matches_a_fresh_build():
+    built = json.loads(_court_template.__wrapped__())
+    clone = draw_half_court(title="A").to_plotly_json()
+    assert clone['layout']['shapes'] == built['layout']['shapes']
+    assert clone['layout']['xaxis'] == built['layout']['xaxis']
+    assert clone['layout']['title']['text'] == "A"
+
+
+def test_mutated_clone_does_not_change_the_next_clone():
+    fig = draw_half_court(title="A")
+    fig.layout.shapes[0].line.color = 'red'
+    fig.layout.shapes = fig.layout.shapes[1:]
+    fig.add_scatter(x=[0], y=[0])
+
+    clone = draw_half_court(title="B")
+    assert clone.layout.title.text == "B"
+    assert clone.layout.shapes[0].line.color == 'white'
+    assert len(clone.layout.shapes) == len(json.loads(_court_template())['layout']['shapes'])
+    assert len(clone.data) == 0
+
+
+def test_cached_template_is_immutable():
+    assert isinstance(_court_template(), str)
+    assert 'title' not in json.loads(_court_template())['layout'] or \
+        'text' not in json.loads(_court_template())['layout']['title']
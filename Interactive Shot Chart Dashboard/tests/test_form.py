@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from form import ewma, form_report, game_log_matrix, rolling_sums, run_lengths
+from synthetic import synthetic_game_log
+
+
+def logs():
+    # Different lengths, so the shorter logs are padded
+    return {'a': synthetic_game_log(player_id=1, games=30, seed=1),
+            'b': synthetic_game_log(player_id=2, games=12, seed=2),
+            'c': synthetic_game_log(player_id=3, games=1, seed=3)}
+
+
+def pts_series(log):
+    return log.assign(day=pd.to_datetime(log['GAME_DATE'], format='%b %d, %Y')) \
+        .sort_values('day', kind='stable')['PTS'].astype(float).reset_index(drop=True)
+
+
+def test_rolling_sums_match_pandas():
+    players, _, valid, stats = game_log_matrix(logs())
+    sums = rolling_sums(stats['PTS'], (1, 5, 20))
+    for i, name in enumerate(players):
+        series = pts_series(logs()[name])
+        for k, w in enumerate((1, 5, 20)):
+            expected = series.rolling(w, min_periods=1).sum().to_numpy()
+            np.testing.assert_allclose(sums[k, i, :len(series)], expected)
+
+
+def test_rolling_means_need_a_full_window():
+    report = form_report(logs(), windows=(5,))
+    for i, name in enumerate(report.players):
+        expected = pts_series(logs()[name]).rolling(5).mean().to_numpy()
+        n = int(report.games[i])
+        np.testing.assert_allclose(report.rolling_pts[0, i, :n], expected)
+        assert np.isnan(report.rolling_pts[0, i, n:]).all()
+
+
+def test_ewma_matches_pandas_and_ignores_padding():
+    report = form_report(logs(), spans=(3, 10))
+    for i, name in enumerate(report.players):
+        series = pts_series(logs()[name])
+        n = int(report.games[i])
+        for k, span in enumerate((3, 10)):
+            np.testing.assert_allclose(report.ewma_pts[k, i, :n], series.ewm(span=span).mean().to_numpy())
+        assert np.isnan(report.ewma_pts[:, i, n:]).all()
+
+
+def test_ewma_of_no_games():
+    assert ewma(np.zeros((0, 0)), np.zeros((0, 0), bool), (5, 10)).shape == (2, 0, 0)
+    assert ewma(np.zeros((2, 0)), np.zeros((2, 0), bool), (5,)).shape == (1, 2, 0)
+
+
+def test_run_lengths_edge_cases():
+    assert run_lengths(np.zeros((0, 0), bool)).shape == (0, 0)
+    assert run_lengths(np.zeros((3, 0), bool)).shape == (3, 0)
+    np.testing.assert_array_equal(run_lengths(np.ones((2, 4), bool)), [[1, 2, 3, 4]] * 2)
+    np.testing.assert_array_equal(run_lengths(np.array([[True], [False]])), [[1], [0]])
+    np.testing.assert_array_equal(run_lengths(np.array([[True, False, True, True, False, True]])),
+                                  [[1, 0, 1, 2, 0, 1]])
+
+
+def test_single_game_and_empty_reports():
+    report = form_report({'c': logs()['c'], 'none': pd.DataFrame()})
+    assert report.players == ['c'] and report.games.tolist() == [1]
+    assert report.longest_hot.tolist() == [0] and report.current_streak.tolist() == [0]
+    assert np.isnan(report.rolling_pts).all()
+
+    empty = form_report({})
+    assert empty.players == [] and empty.summary_frame().empty
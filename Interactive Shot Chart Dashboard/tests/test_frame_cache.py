@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+
+from frame_cache import SizedFrameCache
+from shot_schema import frame_nbytes
+from shot_store import ShotStore
+
+
+def frame(n, tag=0):
+    df = pd.DataFrame({'a': np.arange(n, dtype='int64') + tag,
+                       'SEASON': pd.Categorical(['2023-24'] * n, categories=['2023-24', '2024-25'], ordered=True)})
+    df.attrs = {'data_key': (('shots', 1, '2023-24'), ('shots', 1, '2024-25')), 'data_version': ('v1', 2)}
+    return df
+
+
+def sized_cache(tmp_path, entries, policy='lru'):
+    return SizedFrameCache(int(frame_nbytes(frame(1000)) * (entries + 0.5)), policy=policy,
+                           spill_store=ShotStore(str(tmp_path)))
+
+
+def test_lru_evicts_least_recently_used(tmp_path):
+    cache = sized_cache(tmp_path, 2)
+    cache.put(('x', 'a'), frame(1000), persisted=True)
+    cache.put(('x', 'b'), frame(1000), persisted=True)
+    cache.get(('x', 'a'))
+    cache.put(('x', 'c'), frame(1000), persisted=True)
+    assert cache.get(('x', 'b')) is None
+    assert cache.get(('x', 'a')) is not None
+    assert cache.bytes <= cache.budget_bytes
+    assert cache.metrics()['spill_writes'] == 0
+
+
+def test_lfu_never_evicts_the_new_entry(tmp_path):
+    cache = sized_cache(tmp_path, 2, policy='lfu')
+    cache.put(('x', 'a'), frame(1000))
+    cache.put(('x', 'b'), frame(1000))
+    cache.get(('x', 'a'))
+    cache.put(('x', 'c'), frame(1000))
+    assert sorted(k[1] for k in cache._entries) == ['a', 'c']
+
+
+def test_spilled_frames_round_trip_with_attrs(tmp_path):
+    cache = sized_cache(tmp_path, 1)
+    original = frame(1000, tag=7)
+    cache.put(('merged_shots', 'abc'), original)
+    cache.put(('merged_shots', 'def'), frame(1000))
+    assert cache.metrics()['spill_writes'] == 1
+
+    back = cache.get(('merged_shots', 'abc'))
+    assert cache.metrics()['spill_hits'] == 1
+    pd.testing.assert_frame_equal(back, original)
+    assert back.attrs == original.attrs
+    assert isinstance(back.attrs['data_key'][0], tuple)
+
+
+def test_hits_are_isolated_from_the_cached_frame(tmp_path):
+    cache = sized_cache(tmp_path, 2)
+    cache.put(('x', 'a'), frame(10))
+    hit = cache.get(('x', 'a'))
+    hit.loc[0, 'a'] = -1
+    hit.attrs['data_version'] = 'changed'
+    again = cache.get(('x', 'a'))
+    assert again.loc[0, 'a'] == 0
+    assert again.attrs['data_version'] == ('v1', 2)
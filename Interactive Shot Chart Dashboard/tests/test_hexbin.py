@@ -0,0 +1,60 @@
+import numpy as np
+
+from shot_chart_utils import HexGrid, ShotBinGrid
+from synthetic import normalized_synthetic_shots
+
+
+def test_each_point_goes_to_its_nearest_centre():
+    grid = HexGrid(20)
+    rng = np.random.default_rng(0)
+    x = rng.uniform(grid.xmin, grid.xmax, 2_000)
+    y = rng.uniform(grid.ymin, grid.ymax, 2_000)
+    cx, cy = grid.centers()
+
+    nearest = np.argmin((x[:, None] - cx[None, :]) ** 2 + (y[:, None] - cy[None, :]) ** 2, axis=1)
+    np.testing.assert_array_equal(grid.bin_index(x, y), nearest)
+
+
+def test_points_off_the_grid_are_dropped():
+    grid = HexGrid(20)
+    index = grid.bin_index([grid.xmin - 1, 0, grid.xmax + 1], [0, grid.ymax + 1, 0])
+    assert (index == -1).all()
+
+    bins = ShotBinGrid(grid=grid).update_arrays(np.array([0, 10_000]), np.array([0, 0]),
+                                                np.array([True, True]), np.array([2, 2]))
+    assert bins.attempts.sum() == 1
+
+
+def on_grid(shots, grid):
+    return shots[(grid.bin_index(shots['LOC_X'], shots['LOC_Y']) >= 0)]
+
+
+def test_counts_match_the_frame_and_chunks_add_up():
+    shots = normalized_synthetic_shots(10_000, seed=5)
+    whole = ShotBinGrid().update(shots)
+    inside = on_grid(shots, whole.grid)   # backcourt heaves fall off the half court
+    assert 0 < len(shots) - len(inside) < 500
+    assert whole.attempts.sum() == len(inside)
+    assert whole.makes.sum() == (inside['SHOT_MADE_FLAG'] == 1).sum()
+    assert whole.points.sum() == inside['SHOT_POINTS'].sum()
+
+    first = ShotBinGrid().update(shots.iloc[:3_000])
+    second = ShotBinGrid(grid=first.grid).update(shots.iloc[3_000:])
+    merged = ShotBinGrid(grid=first.grid).merge(first).merge(second)
+    for name in ('attempts', 'makes', 'points'):
+        np.testing.assert_array_equal(getattr(merged, name), getattr(whole, name))
+
+    # Without SHOT_POINTS the points come from SHOT_TYPE and the made flag
+    raw_points = ShotBinGrid().update(shots.drop(columns='SHOT_POINTS'))
+    np.testing.assert_array_equal(raw_points.points, whole.points)
+
+
+def test_frame_of_non_empty_bins():
+    shots = normalized_synthetic_shots(2_000, seed=6)
+    bins = ShotBinGrid().update(shots)
+    frame = bins.to_frame()
+    assert frame['FGA'].sum() == len(on_grid(shots, bins.grid))
+    assert (frame['FGA'] > 0).all()
+    np.testing.assert_allclose(frame['FG_PCT'], frame['FGM'] / frame['FGA'])
+    assert len(bins.to_frame(min_attempts=5)) <= len(frame)
+    assert np.isnan(bins.fg_pct[bins.attempts == 0]).all()
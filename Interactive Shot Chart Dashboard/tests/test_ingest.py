@@ -0,0 +1,122 @@
+import json
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+from nba_api.stats.library.http import NBAStatsHTTP
+
+import ingest
+from data_source import SyntheticSource
+from shot_store import get_shot_store
+from upstream import get_rate_limiter
+
+PLAYERS = ['LeBron James', 'Nikola Jokić']
+SEASONS = ['2022-23', '2023-24']
+
+# stats.nba.com query parameters -> the DataSource parameters the synthetic source reads
+QUERY_PARAMS = {
+    'shotchartdetail': {'PlayerID': 'player_id', 'TeamID': 'team_id', 'Season': 'season_nullable',
+                        'ContextMeasure': 'context_measure_simple', 'DateFrom': 'date_from_nullable',
+                        'DateTo': 'date_to_nullable'},
+    'playergamelog': {'PlayerID': 'player_id', 'Season': 'season', 'SeasonTypeAllStar': 'season_type_all_star',
+                      'DateFrom': 'date_from_nullable'},
+}
+RESULT_SETS = {'shotchartdetail': ['Shot_Chart_Detail', 'LeagueAverages'], 'playergamelog': ['PlayerGameLog']}
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves synthetic frames in the stats API's resultSets shape."""
+    protocol_version = 'HTTP/1.1'
+    source = SyntheticSource(seed=0)
+    calls = []
+    failing = False
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        endpoint = url.path.rstrip('/').rsplit('/', 1)[-1].lower()
+        names = QUERY_PARAMS[endpoint]
+        params = {names[k]: v for k, v in parse_qsl(url.query) if k in names and v}
+        for key in ('player_id', 'team_id'):
+            if key in params:
+                params[key] = int(params[key])
+        StandInHandler.calls.append(endpoint)
+        if self.failing:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        df = self.source._fetch(endpoint, params)
+        first, *rest = RESULT_SETS[endpoint]
+        result_sets = [{'name': first, 'headers': list(df.columns), 'rowSet': json.loads(df.to_json(orient='values'))}]
+        result_sets += [{'name': name, 'headers': [], 'rowSet': []} for name in rest]
+        body = json.dumps({'resultSets': result_sets}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stand_in(offline, monkeypatch):
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    StandInHandler.calls = []
+    StandInHandler.failing = False
+    monkeypatch.setattr(NBAStatsHTTP, 'base_url', NBAStatsHTTP.base_url)
+    monkeypatch.setenv('NBA_API_RETRIES', '0')
+    yield f'http://127.0.0.1:{httpd.server_port}/stats/{{endpoint}}'
+    httpd.shutdown()
+    httpd.server_close()
+    # main() reconfigures the process-wide limiter; rebuild it from the environment
+    get_rate_limiter.cache_clear()
+
+
+def run_ingest(base_url, monkeypatch, capsys, *extra):
+    monkeypatch.setattr(sys, 'argv', ['ingest.py', '--source', 'live', '--base-url', base_url, '--rate', '0',
+                                      '--workers', '2', '--seasons', *SEASONS, '--players', *PLAYERS, *extra])
+    ingest.main()
+    out = capsys.readouterr().out
+    return out, int(re.search(r'\| ([\d,]+) requests,', out).group(1).replace(',', ''))
+
+
+def test_ingest_fills_the_store_from_the_api(stand_in, monkeypatch, capsys):
+    out, requests = run_ingest(stand_in, monkeypatch, capsys)
+
+    tasks = len(PLAYERS) * len(SEASONS) * len(ingest.INGEST_KINDS)
+    assert f'{tasks}/{tasks} tasks' in out and '0 failed' in out
+    # req/s counts the calls that reached the API, not tasks
+    assert requests == len(StandInHandler.calls) == tasks
+    assert sorted(set(StandInHandler.calls)) == ['playergamelog', 'shotchartdetail']
+
+    store = get_shot_store()
+    for season in SEASONS:
+        meta = store.read_meta('shots', 2544, season)
+        assert store.is_fresh(meta) and meta['rows'] > 0
+
+
+def test_resume_skips_checkpointed_past_seasons(stand_in, monkeypatch, capsys):
+    run_ingest(stand_in, monkeypatch, capsys)
+    StandInHandler.calls = []
+
+    out, requests = run_ingest(stand_in, monkeypatch, capsys)
+    assert '0 tasks to run (8 completed seasons already done per checkpoint)' in out
+    assert requests == 0 and StandInHandler.calls == []
+
+
+def test_failed_tasks_are_retried_on_resume(stand_in, monkeypatch, capsys):
+    StandInHandler.failing = True
+    out, requests = run_ingest(stand_in, monkeypatch, capsys, '--kinds', 'game_log')
+    assert '4 failed' in out and requests == 4
+
+    StandInHandler.failing = False
+    out, requests = run_ingest(stand_in, monkeypatch, capsys, '--kinds', 'game_log')
+    assert '4 tasks to run (0 completed' in out and '0 failed' in out and requests == 4
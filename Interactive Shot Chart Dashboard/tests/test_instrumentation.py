@@ -0,0 +1,81 @@
+import contextvars
+import json
+import threading
+from functools import lru_cache
+
+import pytest
+
+import instrumentation
+from instrumentation import (current_trace, finish_trace, note_miss, record, stage, start_trace, traced_cache,
+                             TRACE_LOG_ENV)
+
+
+@pytest.fixture(autouse=True)
+def no_trace():
+    # start_trace() sets the context variable for the rest of the thread; don't leak it between tests
+    token = instrumentation._trace.set(None)
+    yield
+    instrumentation._trace.reset(token)
+
+
+def test_without_a_trace_everything_is_a_no_op():
+    assert current_trace() is None
+    record('cache', layer='memory', name='x', result='hit')
+    with stage('nothing') as fields:
+        fields['rows'] = 1
+
+
+def test_stages_record_wall_and_cpu_time_even_on_errors():
+    trace = start_trace('player')
+    with stage('load', source='synthetic') as fields:
+        fields['rows'] = 10
+    with pytest.raises(ValueError):
+        with stage('broken'):
+            raise ValueError
+
+    load, broken = trace.of_kind('stage')
+    assert load['name'] == 'load' and load['source'] == 'synthetic' and load['rows'] == 10
+    assert load['ms'] >= 0 and load['cpu_ms'] >= 0
+    assert broken['name'] == 'broken'
+
+
+def test_events_from_pool_threads_land_in_the_rerun_trace():
+    trace = start_trace()
+    context = contextvars.copy_context()
+    threads = [threading.Thread(target=context.copy().run, args=(record, 'upstream'),
+                                kwargs=dict(endpoint='shotchartdetail', ms=5.0)) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(trace.of_kind('upstream')) == 4
+    assert trace.summary()['upstream_calls'] == 4
+    assert trace.summary()['upstream_ms'] == 20.0
+
+
+def test_traced_cache_tells_hits_from_misses():
+    @traced_cache('square')
+    @lru_cache(maxsize=None)
+    def square(x):
+        note_miss()
+        return x * x
+
+    trace = start_trace()
+    assert [square(3), square(3), square(4)] == [9, 9, 16]
+    assert [e['result'] for e in trace.of_kind('cache')] == ['miss', 'hit', 'miss']
+    assert trace.summary()['cache'] == {'memory:miss': 2, 'memory:hit': 1}
+
+
+def test_finished_traces_are_appended_to_the_log(tmp_path, monkeypatch):
+    path = tmp_path / 'trace.jsonl'
+    monkeypatch.setenv(TRACE_LOG_ENV, str(path))
+    for label in ('first', 'second'):
+        trace = start_trace(label)
+        with stage('render'):
+            pass
+        finish_trace(trace)
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line['label'] for line in lines] == ['first', 'second']
+    assert lines[0]['summary']['total_ms'] is not None
+    assert lines[0]['events'][0]['name'] == 'render'
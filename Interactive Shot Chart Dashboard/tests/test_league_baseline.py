@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+
+import league_baseline
+from league_baseline import LeagueBaseline, update_season
+from shot_chart_utils import ShotBinGrid
+from synthetic import normalized_synthetic_shots
+
+
+def test_refetching_the_last_date_counts_each_shot_once(monkeypatch):
+    shots = normalized_synthetic_shots(5_000, games=10).sort_values(['GAME_DATE', 'GAME_EVENT_ID'])
+    shots = shots.reset_index(drop=True)
+    dates = shots['GAME_DATE'].drop_duplicates().sort_values().tolist()
+    cut = dates[4]
+    # First run sees only part of the games on `cut` (e.g. run while they were in progress)
+    on_cut = np.flatnonzero((shots['GAME_DATE'] == cut).to_numpy())
+    first_run = pd.concat([shots[(shots['GAME_DATE'] < cut).to_numpy()], shots.iloc[on_cut[:len(on_cut) // 2]]])
+
+    responses = iter([first_run, shots[(shots['GAME_DATE'] >= cut).to_numpy()]])
+    requested = []
+
+    def fetch(season, date_from=None):
+        requested.append(date_from)
+        return next(responses)
+
+    monkeypatch.setattr(league_baseline, 'fetch_league_shots', fetch)
+    baseline = LeagueBaseline.empty(ShotBinGrid().grid.n_bins)
+    added = update_season(baseline, '2024-25') + update_season(baseline, '2024-25')
+
+    assert requested == [None, cut.date()]
+    assert added == len(shots)
+    assert baseline.bin_fga[:, 0].sum() == ShotBinGrid().update(shots).attempts.sum()
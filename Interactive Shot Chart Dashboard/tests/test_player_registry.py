@@ -0,0 +1,23 @@
+from player_registry import PlayerRegistry, name_initials
+
+PLAYERS = [
+    {'id': 1, 'full_name': 'Shai Gilgeous-Alexander', 'first_name': 'Shai', 'last_name': 'Gilgeous-Alexander', 'is_active': True},
+    {'id': 2, 'full_name': 'Nikola Jokić', 'first_name': 'Nikola', 'last_name': 'Jokić', 'is_active': True},
+    {'id': 3, 'full_name': 'Luka Dončić', 'first_name': 'Luka', 'last_name': 'Dončić', 'is_active': True},
+    {'id': 4, 'full_name': 'Scott Gable Adams', 'first_name': 'Scott', 'last_name': 'Adams', 'is_active': False},
+]
+
+
+def test_placeholder_examples_match():
+    registry = PlayerRegistry(PLAYERS)
+    assert registry.search('jokic') == ['Nikola Jokić']
+    assert registry.search('luka') == ['Luka Dončić']
+    assert registry.search('sga') == ['Shai Gilgeous-Alexander']
+    assert registry.search('SGA', active_only=False) == ['Scott Gable Adams', 'Shai Gilgeous-Alexander']
+
+
+def test_initials_match_whole_queries_only():
+    registry = PlayerRegistry(PLAYERS)
+    assert registry.search('sg') == []
+    assert name_initials('nikola jokic') == 'nj'
+    assert name_initials('nene') == ''
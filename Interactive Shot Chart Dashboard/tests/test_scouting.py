@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from scouting import (DEFENSIVE_LAYERS, build_scouting_report, consistency_report, layer_report, side_splits,
+                      zone_report)
+from synthetic import normalized_synthetic_shots, synthetic_game_log
+
+
+@pytest.fixture(scope='module')
+def shots():
+    return normalized_synthetic_shots(3_000, seed=4)
+
+
+def test_zone_report_matches_a_row_by_row_count(shots):
+    zone_stats, best, worst = zone_report(shots)
+    names = shots['SHOT_ZONE_BASIC'].astype(str) + ' - ' + shots['SHOT_ZONE_AREA'].astype(str)
+    expected = shots.groupby(names)['SHOT_MADE_FLAG'].agg(['size', 'sum'])
+
+    by_name = zone_stats.set_index('ZONE_NAME')
+    assert by_name['FGA'].sum() == len(shots)
+    for name, row in expected.iterrows():
+        assert by_name.loc[name, 'FGA'] == row['size']
+        assert by_name.loc[name, 'FGM'] == row['sum']
+
+    qualified = zone_stats[zone_stats['FGA'] > 5]
+    assert best['FG_PCT'].iloc[0] == qualified['FG_PCT'].max()
+    assert worst['FG_PCT'].iloc[0] == qualified['FG_PCT'].min()
+    assert best['FG_PCT'].is_monotonic_decreasing and worst['FG_PCT'].is_monotonic_increasing
+
+
+def test_side_splits():
+    frame = pd.DataFrame({'LOC_X': [-10] * 20 + [10] * 20,
+                          'SHOT_MADE_FLAG': [1] * 15 + [0] * 5 + [1] * 8 + [0] * 12})
+    assert side_splits(frame) == ("LEFT", "FORCE RIGHT", 0.75, 0.4)
+    assert side_splits(frame.assign(LOC_X=-frame['LOC_X']))[:2] == ("RIGHT", "FORCE LEFT")
+    assert side_splits(frame.iloc[15:25])[0] == "INSUFFICIENT DATA"
+
+
+def test_layer_report_matches_per_shot_points(shots):
+    layer_stats, force, deny = layer_report(shots, min_attempts=0)
+    points = np.where(shots['SHOT_MADE_FLAG'] == 1, np.where(shots['SHOT_TYPE'] == '3PT Field Goal', 3, 2), 0)
+    rim = (shots['SHOT_ZONE_BASIC'] == 'Restricted Area').to_numpy()
+
+    row = layer_stats.set_index('DEF_LAYER').loc['Rim (Protect)']
+    assert row['FGA'] == rim.sum()
+    assert row['PPS'] == pytest.approx(points[rim].mean())
+    assert set(layer_stats['DEF_LAYER']) <= set(DEFENSIVE_LAYERS[:-1])
+    assert force['PPS'] == layer_stats['PPS'].min() and deny['PPS'] == layer_stats['PPS'].max()
+
+
+def test_layer_report_without_qualified_layers(shots):
+    layer_stats, force, deny = layer_report(shots.iloc[:3])
+    assert layer_stats.empty and force is None and deny is None
+
+
+def test_consistency_report():
+    log = synthetic_game_log(games=40, seed=2)
+    games, avg, std, cv, grade, _ = consistency_report(log)
+    assert games == 40
+    assert avg == pytest.approx(log['PTS'].mean())
+    assert std == pytest.approx(log['PTS'].std())
+    assert cv == pytest.approx(std / avg)
+    assert grade
+
+    assert consistency_report(log.iloc[:1])[0:4] == (1, 0.0, 0.0, 0.0)
+    assert consistency_report(pd.DataFrame())[0] == 0
+
+
+def test_build_scouting_report(shots):
+    report = build_scouting_report(shots, synthetic_game_log(games=30))
+    assert report.zone_stats['FGA'].sum() == len(shots)
+    assert report.games == 30
+    assert report.defensive_strategy in {"FORCE RIGHT", "FORCE LEFT", "PLAY STRAIGHT UP"}
@@ -0,0 +1,47 @@
+from datetime import date
+
+from cache_utils import season_windows, latest_played_season
+
+
+def covered(windows, day):
+    return any(first <= day and (last is None or day <= last) for first, last in windows)
+
+
+def test_windows_are_contiguous_and_end_open():
+    windows = season_windows('2023-24', today=date(2025, 1, 1))
+    assert windows[0] == (date(2023, 10, 1), date(2023, 10, 31))
+    assert windows[-1] == (date(2024, 4, 1), None)
+    for (_, last), (first, _) in zip(windows, windows[1:]):
+        assert (first - last).days == 1
+
+
+def test_2019_20_bubble_games_are_covered():
+    windows = season_windows('2019-20', today=date(2021, 1, 1))
+    # Regular season resumed in the bubble on Jul 30, 2020 and ended Aug 14, 2020
+    assert covered(windows, date(2020, 7, 30))
+    assert covered(windows, date(2020, 8, 14))
+
+
+def test_2020_21_may_games_are_covered():
+    windows = season_windows('2020-21', today=date(2022, 1, 1))
+    # Delayed start (Dec 22, 2020), regular season ended May 16, 2021
+    assert covered(windows, date(2020, 12, 22))
+    assert covered(windows, date(2021, 5, 16))
+
+
+def test_incremental_refresh_after_april():
+    # A refresh from a game held in May still requests the rest of the season
+    assert season_windows('2020-21', since=date(2021, 5, 5), today=date(2021, 5, 20)) == [(date(2021, 5, 5), None)]
+
+
+def test_in_season_windows_stop_at_today():
+    windows = season_windows('2024-25', today=date(2024, 11, 15))
+    assert windows == [(date(2024, 10, 1), date(2024, 10, 31)), (date(2024, 11, 1), None)]
+
+
+def test_default_season_waits_for_opening_night():
+    assert latest_played_season(date(2026, 10, 16)) == '2025-26'
+    assert latest_played_season(date(2026, 11, 2)) == '2026-27'
+    assert latest_played_season(date(2027, 3, 1)) == '2026-27'
+    assert latest_played_season(date(2020, 12, 1)) == '2019-20'
+    assert latest_played_season(date(2020, 12, 23)) == '2020-21'
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from shot_filters import DISTANCE_BANDS, PERIOD_LABELS, ShotFilter, ShotFilterIndex, team_abbreviations
+from synthetic import normalized_synthetic_shots
+
+
+def test_minute_range_includes_both_ends():
+    shots = normalized_synthetic_shots(5_000)
+    index = ShotFilterIndex(shots)
+    minutes = shots['MINUTES_REMAINING'].to_numpy()
+
+    single = index.mask(ShotFilter(minutes_remaining=(5, 5)))
+    assert single.any()
+    np.testing.assert_array_equal(single, minutes == 5)
+
+    np.testing.assert_array_equal(index.mask(ShotFilter(minutes_remaining=(0, 11))), np.ones(len(shots), bool))
+    np.testing.assert_array_equal(index.mask(ShotFilter(minutes_remaining=(2, 4))), (minutes >= 2) & (minutes <= 4))
+
+
+def pandas_mask(df, selection):
+    # The same selection evaluated with plain pandas comparisons on the frame
+    mask = pd.Series(True, index=df.index)
+    if selection.periods:
+        labels = df['PERIOD'].clip(upper=5).map(lambda p: PERIOD_LABELS[p - 1])
+        mask &= labels.isin(selection.periods)
+    if selection.action_types:
+        mask &= df['ACTION_TYPE'].isin(selection.action_types)
+    if selection.distance_bands:
+        distance = df['SHOT_DISTANCE']
+        mask &= np.logical_or.reduce([(distance >= low) & (distance < (high if high is not None else np.inf))
+                                      for label, low, high in DISTANCE_BANDS if label in selection.distance_bands])
+    home = df['HTM'].astype(str) == team_abbreviations(df)
+    if selection.venue is not None:
+        mask &= home if selection.venue == 'Home' else ~home
+    if selection.opponents:
+        opponent = pd.Series(np.where(home, df['VTM'].astype(str), df['HTM'].astype(str)), index=df.index)
+        mask &= opponent.isin(selection.opponents)
+    if selection.date_range is not None:
+        days = df['GAME_DATE'].dt.date
+        mask &= (days >= selection.date_range[0]) & (days <= selection.date_range[1])
+    return mask.to_numpy()
+
+
+def test_bitsets_match_pandas_comparisons():
+    shots = normalized_synthetic_shots(8_000, seed=2)
+    index = ShotFilterIndex(shots)
+    actions = index.options('action_type')[:3]
+    opponent = index.options('opponent')[0]
+    mid = index.first_date + (index.last_date - index.first_date) / 2
+    selections = [
+        ShotFilter(periods=('1st', 'OT')),
+        ShotFilter(action_types=tuple(actions)),
+        ShotFilter(distance_bands=('0-3 ft', '24-29 ft', '30+ ft')),
+        ShotFilter(venue='Away'),
+        ShotFilter(opponents=(opponent,)),
+        ShotFilter(date_range=(index.first_date, mid)),
+        ShotFilter(periods=('4th',), distance_bands=('16-23 ft', '24-29 ft'), venue='Home',
+                   date_range=(mid, index.last_date)),
+    ]
+    for selection in selections:
+        mask = index.mask(selection)
+        assert mask.any(), selection
+        np.testing.assert_array_equal(mask, pandas_mask(shots, selection))
+
+    assert index.apply(shots, ShotFilter()) is shots
+    assert not index.mask(ShotFilter(action_types=('No Such Shot',))).any()
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from shot_schema import (SHOT_SCHEMA, DERIVED_COLUMNS, normalize_shot_frame, concat_shot_frames, append_shot_frame,
+                         shot_keys)
+from shot_store import ShotStore
+from synthetic import synthetic_shots
+
+
+def raw(n=2_000, seed=0, **kwargs):
+    return synthetic_shots(n, seed=seed, compact=False, **kwargs)
+
+
+def test_normalize_applies_the_compact_schema():
+    source = raw()
+    df, stats = normalize_shot_frame(source)
+
+    assert list(df.columns) == [c for c in SHOT_SCHEMA if c in source.columns] + list(DERIVED_COLUMNS)
+    for col, dtype in {**SHOT_SCHEMA, **DERIVED_COLUMNS}.items():
+        if col == 'GAME_DATE':
+            assert df[col].dtype.kind == 'M'   # ns on pandas 2, us on pandas 3
+        elif col in df.columns:
+            assert str(df[col].dtype) == dtype, col
+    assert stats['bytes_after'] < stats['bytes_before']
+    assert stats['bytes_saved'] == stats['bytes_before'] - stats['bytes_after']
+
+
+def test_normalize_keeps_values_and_derives_results():
+    source = raw()
+    df, _ = normalize_shot_frame(source)
+
+    np.testing.assert_array_equal(df['LOC_X'], source['LOC_X'])
+    assert (df['GAME_ID'].astype(str) == source['GAME_ID'].astype(str)).all()
+    assert (df['GAME_DATE'].dt.strftime('%Y%m%d') == source['GAME_DATE']).all()
+    made = source['SHOT_MADE_FLAG'].to_numpy() == 1
+    three = (source['SHOT_TYPE'] == '3PT Field Goal').to_numpy()
+    np.testing.assert_array_equal(df['SHOT_RESULT'] == 'Made', made)
+    np.testing.assert_array_equal(df['SHOT_POINTS'], np.where(made, np.where(three, 3, 2), 0))
+
+
+def test_normalized_frames_round_trip_through_the_store(tmp_path):
+    df, _ = normalize_shot_frame(raw())
+    store = ShotStore(str(tmp_path))
+    store.write('shots', 1, '2024-25', frame=df)
+    back, _ = store.read('shots', 1, '2024-25')
+    pd.testing.assert_frame_equal(back, df)
+
+
+def test_concat_keeps_categoricals_and_adds_seasons():
+    first, _ = normalize_shot_frame(raw(500, seed=1, season='2023-24'))
+    second, _ = normalize_shot_frame(raw(700, seed=2, season='2024-25'))
+    merged = concat_shot_frames({'2024-25': second, '2023-24': first, '2022-23': pd.DataFrame()})
+
+    assert len(merged) == 1_200
+    assert merged['ACTION_TYPE'].dtype == 'category'
+    assert list(merged['SEASON'].cat.categories) == ['2022-23', '2023-24', '2024-25']
+    assert merged['SEASON'].cat.ordered
+    assert (merged['SEASON'].iloc[:700] == '2024-25').all()
+
+
+def test_append_adds_only_new_shots_at_the_end():
+    df, _ = normalize_shot_frame(raw(1_000))
+    head, tail = df.iloc[:600].reset_index(drop=True), df.iloc[400:]
+
+    combined, added = append_shot_frame(head, tail)
+    assert added == 400
+    assert len(combined) == 1_000
+    pd.testing.assert_frame_equal(combined.iloc[:600], head, check_categorical=False)
+    assert len(np.unique(shot_keys(combined))) == 1_000
+    assert combined['ACTION_TYPE'].dtype == 'category'
+
+    again, added = append_shot_frame(combined, tail)
+    assert added == 0 and again is combined
+    assert append_shot_frame(head, df.iloc[:0]) == (head, 0)
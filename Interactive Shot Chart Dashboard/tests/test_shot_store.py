@@ -0,0 +1,39 @@
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+import shot_store
+from shot_store import ShotStore
+
+
+def test_round_trip_with_metadata(tmp_path):
+    store = ShotStore(str(tmp_path))
+    frame = pd.DataFrame({'a': [1, 2, 3]})
+    meta = store.write('shots', 1, '2024-25', frame=frame, ttl=60, schema=2)
+    df, read_meta = store.read('shots', 1, '2024-25')
+    pd.testing.assert_frame_equal(df, frame)
+    assert read_meta == meta and read_meta['schema'] == 2
+
+
+def test_entries_are_readable_by_others(tmp_path):
+    store = ShotStore(str(tmp_path))
+    store.write('shots', 1, frame=pd.DataFrame({'a': [1]}))
+    mode = stat.S_IMODE(os.stat(store.path('shots', 1)).st_mode)
+    assert mode == shot_store.ENTRY_MODE
+    assert mode & stat.S_IROTH
+
+
+def test_concurrent_writers_get_distinct_versions(tmp_path):
+    store = ShotStore(str(tmp_path))
+    with ThreadPoolExecutor(8) as pool:
+        metas = list(pool.map(lambda i: store.write('shots', 1, frame=pd.DataFrame({'a': [i]})), range(100)))
+    assert len({m['version'] for m in metas}) == 100
+
+
+def test_version_can_be_kept(tmp_path):
+    store = ShotStore(str(tmp_path))
+    first = store.write('shots', 1, frame=pd.DataFrame({'a': [1]}))
+    again = store.write('shots', 1, frame=pd.DataFrame({'a': [1]}), version=first['version'])
+    assert again['version'] == first['version']
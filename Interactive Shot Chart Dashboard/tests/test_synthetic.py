@@ -0,0 +1,36 @@
+import numpy as np
+
+from synthetic import label_locations, synthetic_shots, ZONE_BASIC, ZONE_AREA, ZONE_RANGE, SHOT_TYPES
+
+THREE_POINT_ZONES = {'Left Corner 3', 'Right Corner 3', 'Above the Break 3', 'Backcourt'}
+
+
+def test_labels_follow_court_geometry():
+    x = np.array([0.0, 10.0, 60.0, -230.0, 230.0, 0.0, 150.0, -150.0, 0.0])
+    y = np.array([0.0, 20.0, 100.0, 20.0, 20.0, 260.0, 120.0, 120.0, 500.0])
+    basic, area, zone_range, shot_type, distance = label_locations(x, y)
+
+    assert [ZONE_BASIC[b] for b in basic] == [
+        'Restricted Area', 'Restricted Area', 'In The Paint (Non-RA)', 'Left Corner 3', 'Right Corner 3',
+        'Above the Break 3', 'Mid-Range', 'Mid-Range', 'Backcourt']
+    assert [ZONE_AREA[a] for a in area[[3, 4, 5, 8]]] == ['Left Side(L)', 'Right Side(R)', 'Center(C)',
+                                                          'Back Court(BC)']
+    assert [SHOT_TYPES[t] for t in shot_type] == ['2PT Field Goal'] * 3 + ['3PT Field Goal'] * 3 + \
+        ['2PT Field Goal'] * 2 + ['3PT Field Goal']
+    np.testing.assert_array_equal(distance, np.floor(np.hypot(x, y) / 10))
+    assert ZONE_RANGE[zone_range[0]] == 'Less Than 8 ft.' and ZONE_RANGE[zone_range[-1]] == 'Back Court Shot'
+
+
+def test_synthetic_frames_are_internally_consistent():
+    df = synthetic_shots(50_000, seed=3, compact=False)
+    basic, area = df['SHOT_ZONE_BASIC'].astype(str), df['SHOT_ZONE_AREA'].astype(str)
+    zone_range, shot_type = df['SHOT_ZONE_RANGE'].astype(str), df['SHOT_TYPE'].astype(str)
+
+    assert ((shot_type == '3PT Field Goal') == basic.isin(THREE_POINT_ZONES)).all()
+    assert ((area == 'Back Court(BC)') == (basic == 'Backcourt')).all()
+    assert ((zone_range == 'Back Court Shot') == (basic == 'Backcourt')).all()
+    assert (area[basic == 'Restricted Area'] == 'Center(C)').all()
+    assert (zone_range[basic == 'Restricted Area'] == 'Less Than 8 ft.').all()
+    assert (df['SHOT_DISTANCE'] == np.floor(np.hypot(df['LOC_X'], df['LOC_Y']) / 10)).all()
+    assert (df['SHOT_MADE_FLAG'] == (df['EVENT_TYPE'] == 'Made Shot')).all()
+    assert set(basic) <= set(ZONE_BASIC)
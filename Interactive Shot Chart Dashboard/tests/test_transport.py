@@ -0,0 +1,97 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import transport
+from transport import LatencyHistogram, LatencyStats, build_session, endpoint_timeout, request_headers
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = LatencyHistogram()
+    for ms in [5] * 50 + [80] * 40 + [900] * 9 + [40_000]:
+        histogram.add(ms, error=ms > 10_000)
+
+    summary = histogram.summary()
+    assert summary['calls'] == 100 and summary['errors'] == 1
+    assert summary['p50_ms'] == 10         # upper bound of the bucket holding the median
+    assert summary['p90_ms'] == 100
+    assert summary['p99_ms'] == 1000
+    assert summary['max_ms'] == 40_000
+    assert histogram.quantile(1.0) == 40_000
+    assert LatencyHistogram().quantile(0.5) is None
+
+
+def test_quantiles_are_capped_at_the_largest_latency():
+    histogram = LatencyHistogram()
+    histogram.add(30)
+    assert histogram.quantile(0.5) == 30
+
+
+def test_stats_are_kept_per_endpoint():
+    stats = LatencyStats()
+    stats.observe('shotchartdetail', 120)
+    stats.observe('shotchartdetail', 80, error=True)
+    stats.observe_wire('shotchartdetail', 2048)
+    stats.observe('playergamelog', 30)
+
+    summary = stats.summary()
+    assert list(summary) == ['playergamelog', 'shotchartdetail']
+    assert summary['shotchartdetail']['calls'] == 2 and summary['shotchartdetail']['wire_kb'] == 2.0
+    labels, counts = stats.buckets()
+    assert len(labels) == len(counts['playergamelog'])
+    stats.reset()
+    assert stats.summary() == {}
+
+
+def test_timeouts_per_endpoint_and_overrides(monkeypatch):
+    assert endpoint_timeout('shotchartdetail') == (transport.CONNECT_TIMEOUT, 30.0)
+    assert endpoint_timeout('unknown')[1] == transport.DEFAULT_READ_TIMEOUT
+    monkeypatch.setenv('NBA_API_TIMEOUTS', 'shotchartdetail=45, playergamelog=5')
+    assert endpoint_timeout('shotchartdetail')[1] == 45.0
+    assert endpoint_timeout('playergamelog')[1] == 5.0
+
+
+def test_accept_encoding_matches_the_available_decoders(monkeypatch):
+    monkeypatch.setattr(transport, '_brotli_available', lambda: False)
+    assert request_headers()['Accept-Encoding'] == 'gzip, deflate'
+    monkeypatch.setattr(transport, '_brotli_available', lambda: True)
+    assert 'br' in request_headers()['Accept-Encoding']
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # keep-alive
+    connections = set()
+
+    def do_GET(self):
+        StubHandler.connections.add(self.client_address)
+        body = b'{"resultSets": []}'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_port}/stats/playergamelog'
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_session_reuses_connections_and_records_wire_bytes(server, monkeypatch):
+    stats = LatencyStats()
+    monkeypatch.setattr(transport, 'get_latency_stats', lambda: stats)
+    StubHandler.connections = set()
+    session = build_session()
+    for _ in range(5):
+        assert session.get(server, timeout=5).json() == {'resultSets': []}
+
+    assert len(StubHandler.connections) == 1
+    assert stats.summary()['playergamelog']['wire_kb'] == round(5 * 18 / 1024, 1)
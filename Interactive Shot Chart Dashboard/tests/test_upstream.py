@@ -0,0 +1,129 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from transport import build_session
+from upstream import SingleFlight, with_retries, is_transient
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return 'frame'
+
+    def caller():
+        results.append(flight.do(('src', 'shotchartdetail', '{}'), fetch))
+
+    threads = [threading.Thread(target=caller) for _ in range(8)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    deadline = time.monotonic() + 5
+    while flight._calls[('src', 'shotchartdetail', '{}')].waiters < 7 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for t in threads:
+        t.join(5)
+
+    assert len(calls) == 1
+    assert sorted(results) == [('frame', False)] + [('frame', True)] * 7
+    assert flight.in_flight() == 0
+
+
+def test_waiters_get_the_leaders_error_and_the_next_call_runs_again():
+    flight = SingleFlight()
+
+    def fail():
+        raise ConnectionError('reset')
+
+    with pytest.raises(ConnectionError):
+        flight.do('k', fail)
+    assert flight.do('k', lambda: 1) == (1, False)
+
+
+def flaky(failures, error):
+    attempts = []
+
+    def fn():
+        attempts.append(1)
+        if len(attempts) <= failures:
+            raise error
+        return 'ok'
+    return fn, attempts
+
+
+def test_transient_errors_are_retried(monkeypatch):
+    monkeypatch.setenv('NBA_API_BACKOFF_MS', '0')
+    fn, attempts = flaky(2, ConnectionError('reset'))
+    retried = []
+    assert with_retries(fn, retries=3, on_retry=lambda *a: retried.append(a[0])) == 'ok'
+    assert len(attempts) == 3
+    assert retried == [1, 2]
+
+
+def test_retries_give_up_with_the_last_error(monkeypatch):
+    monkeypatch.setenv('NBA_API_BACKOFF_MS', '0')
+    fn, attempts = flaky(10, TimeoutError('slow'))
+    with pytest.raises(TimeoutError):
+        with_retries(fn, retries=2)
+    assert len(attempts) == 3
+
+
+def test_other_errors_fail_on_the_first_attempt():
+    fn, attempts = flaky(1, KeyError('resultSets'))
+    with pytest.raises(KeyError):
+        with_retries(fn, retries=3)
+    assert len(attempts) == 1
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    statuses = []
+
+    def do_GET(self):
+        status = self.statuses.pop(0) if self.statuses else 200
+        body = b'{"resultSets": []}'
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StatusHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/stats/shotchartdetail'
+    server.shutdown()
+    server.server_close()
+
+
+def test_throttled_and_server_error_responses_are_retried(stub_server, monkeypatch):
+    monkeypatch.setenv('NBA_API_BACKOFF_MS', '0')
+    StatusHandler.statuses = [429, 503]
+    session = build_session()
+    response = with_retries(lambda: session.get(stub_server, timeout=5), retries=3)
+    assert response.status_code == 200
+    assert StatusHandler.statuses == []
+
+
+def test_client_errors_are_not_retried(stub_server):
+    StatusHandler.statuses = [404, 404]
+    session = build_session()
+    with pytest.raises(requests.HTTPError) as raised:
+        with_retries(lambda: session.get(stub_server, timeout=5), retries=3)
+    assert not is_transient(raised.value)
+    assert StatusHandler.statuses == [404]
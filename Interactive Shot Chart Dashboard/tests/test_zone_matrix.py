@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from comparison import zone_efficiency_matrix
+from league_baseline import ZONE_INDEX
+from shot_chart_utils import ShotBinGrid, calculate_zone_efficiency
+from synthetic import normalized_synthetic_shots
+from team_aggregate import TeamAggregate
+
+ROSTER = [(100 + k, f'Player {k}') for k in range(8)]
+
+
+@pytest.fixture(scope='module')
+def players():
+    return {f'Player {k}': normalized_synthetic_shots(400 + 150 * k, seed=k, player_id=100 + k,
+                                                      player_name=f'Player {k}')
+            for k in range(3)}
+
+
+@pytest.fixture(scope='module')
+def team():
+    return normalized_synthetic_shots(6_000, seed=9, roster=ROSTER)
+
+
+def assert_matches_zone_efficiency(matrix, frames):
+    for j, name in enumerate(matrix.players):
+        expected = calculate_zone_efficiency(frames[name]).set_index('ZONE_NAME')
+        fga = pd.Series(matrix.fga[:, j], index=matrix.zones)
+        fgm = pd.Series(matrix.fgm[:, j], index=matrix.zones)
+        assert (fga[fga > 0].sort_index() == expected['FGA'].sort_index()).all()
+        assert (fgm[fga > 0].sort_index() == expected['FGM'].sort_index()).all()
+
+
+def test_matrix_columns_match_per_player_zone_efficiency(players):
+    matrix = zone_efficiency_matrix({**players, 'Nobody': pd.DataFrame()})
+    assert matrix.players == list(players)
+    assert_matches_zone_efficiency(matrix, players)
+    assert matrix.fga.sum() == sum(len(df) for df in players.values())
+
+    order = [ZONE_INDEX.get(zone, len(ZONE_INDEX)) for zone in matrix.zones]
+    assert order == sorted(order)
+    assert np.nan_to_num(matrix.delta[:, 0]).max() == 0
+
+
+def test_matrix_display_frame(players):
+    frame = zone_efficiency_matrix(players).to_frame()
+    assert list(frame.columns[:3]) == ['ZONE_NAME', 'Player 0 FGA', 'Player 0 FG%']
+    assert 'Player 0 Δ' not in frame.columns and 'Player 1 Δ' in frame.columns
+    assert zone_efficiency_matrix({}).to_frame().empty
+
+
+def test_team_aggregate_matches_per_player_frames(team):
+    agg = TeamAggregate.from_frame(team, chunk_rows=1_000)
+    by_player = {name: df for name, df in team.groupby('PLAYER_NAME', observed=True)}
+
+    assert agg.rows == len(team)
+    assert agg.games == set(team['GAME_ID'].unique())
+    table = agg.player_frame().set_index('PLAYER_NAME')
+    for name, df in by_player.items():
+        assert table.loc[name, 'FGA'] == len(df)
+        assert table.loc[name, 'PTS'] == df['SHOT_POINTS'].sum()
+        assert table.loc[name, '3PA'] == (df['SHOT_VALUE'] == 3).sum()
+
+    top = agg.top_players(3)
+    matrix = agg.zone_matrix(top)
+    assert_matches_zone_efficiency(matrix, by_player)
+
+
+def test_team_aggregate_groups_and_chunks(team):
+    whole = TeamAggregate.from_frame(team)
+    chunked = TeamAggregate.from_frame(team, chunk_rows=777)
+    np.testing.assert_array_equal(whole.totals[np.argsort(whole.player_ids)],
+                                  chunked.totals[np.argsort(chunked.player_ids)])
+
+    group = whole.player_ids[:2]
+    subset = team[team['PLAYER_ID'].isin(group)]
+    np.testing.assert_array_equal(whole.bins(group).attempts, ShotBinGrid().update(subset).attempts)
+    zone = whole.zone_frame(group).set_index('ZONE_NAME')
+    expected = calculate_zone_efficiency(subset).set_index('ZONE_NAME')
+    assert (zone['FGA'].sort_index() == expected['FGA'].sort_index()).all()
+
+    extended = whole.copy().add(team.iloc[:10])
+    assert extended.rows == whole.rows + 10 and whole.rows == len(team)
@@ -0,0 +1,202 @@
+"""
+HTTP transport for the stats API and per-endpoint latency histograms.
+
+nba_api sends every request through NBAStatsHTTP's class-level
+requests.Session. install_transport() replaces it with one configured for
+this app:
+
+- keep-alive connection pool sized for the fetch pool and ingest workers
+  (urllib3 retries off: upstream.py owns retries and backoff)
+- gzip/deflate transfer encoding via request_headers() (brotli only when a
+  decoder is installed, since requests can't decode `br` without one)
+- a response hook that records wire (compressed) bytes per endpoint
+- a response hook that raises requests.HTTPError for 4xx/5xx responses, so
+  throttling and server errors reach upstream.with_retries as errors instead
+  of as unparseable bodies
+
+Timeouts are per endpoint, as (connect, read) seconds, and can be overridden with
+NBA_API_TIMEOUTS, e.g. "shotchartdetail=45,playergamelog=10" (read seconds).
+
+Latency histograms are process-wide, so they cover every session, and they
+are fed by DataSource for every attempt against any source.
+"""
+import bisect
+import os
+import threading
+from functools import lru_cache
+from urllib.parse import urlparse
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from nba_api.stats.library.http import NBAStatsHTTP, STATS_HEADERS
+
+POOL_CONNECTIONS = 4    # distinct hosts kept
+POOL_MAXSIZE = 16       # open connections per host (fetch pool + a few ingest workers)
+CONNECT_TIMEOUT = 3.05
+# Read timeouts (seconds): a league/team ShotChartDetail is a large, slow query
+READ_TIMEOUTS = {
+    'shotchartdetail': 30.0,
+    'commonplayerinfo': 10.0,
+    'playercareerstats': 15.0,
+    'playergamelog': 15.0,
+}
+DEFAULT_READ_TIMEOUT = 20.0
+
+# Histogram bucket upper bounds (ms), roughly logarithmic; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000]
+
+
+@lru_cache(maxsize=None)
+def _brotli_available():
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return False
+    return True
+
+
+def _timeout_overrides():
+    overrides = {}
+    for item in filter(None, os.environ.get('NBA_API_TIMEOUTS', '').split(',')):
+        endpoint, _, seconds = item.partition('=')
+        overrides[endpoint.strip().lower()] = float(seconds)
+    return overrides
+
+
+def endpoint_timeout(endpoint):
+    """(connect, read) timeout in seconds for an endpoint."""
+    read = _timeout_overrides().get(endpoint, READ_TIMEOUTS.get(endpoint, DEFAULT_READ_TIMEOUT))
+    return CONNECT_TIMEOUT, read
+
+
+class LatencyHistogram:
+    """Counts of call latencies in LATENCY_BUCKETS_MS buckets, plus totals."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.total = 0
+        self.errors = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+        self.wire_bytes = 0
+
+    def add(self, ms, error=False):
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, ms)] += 1
+        self.total += 1
+        self.errors += bool(error)
+        self.sum_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-quantile, capped at the largest latency seen."""
+        if not self.total:
+            return None
+        rank = np.searchsorted(np.cumsum(self.counts), q * self.total)
+        bound = LATENCY_BUCKETS_MS[rank] if rank < len(LATENCY_BUCKETS_MS) else self.max_ms
+        return round(min(bound, self.max_ms), 1)
+
+    def summary(self):
+        return {
+            'calls': self.total,
+            'errors': self.errors,
+            'mean_ms': round(self.sum_ms / self.total, 1) if self.total else None,
+            'p50_ms': self.quantile(0.5),
+            'p90_ms': self.quantile(0.9),
+            'p99_ms': self.quantile(0.99),
+            'max_ms': round(self.max_ms, 1),
+            'wire_kb': round(self.wire_bytes / 1024, 1),
+        }
+
+
+class LatencyStats:
+    """Per-endpoint histograms, shared by every thread and session."""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def _get(self, endpoint):
+        histogram = self._histograms.get(endpoint)
+        if histogram is None:
+            histogram = self._histograms.setdefault(endpoint, LatencyHistogram())
+        return histogram
+
+    def observe(self, endpoint, ms, error=False):
+        with self._lock:
+            self._get(endpoint).add(ms, error)
+
+    def observe_wire(self, endpoint, nbytes):
+        with self._lock:
+            self._get(endpoint).wire_bytes += nbytes
+
+    def summary(self):
+        """{endpoint: summary dict}"""
+        with self._lock:
+            return {endpoint: h.summary() for endpoint, h in sorted(self._histograms.items())}
+
+    def buckets(self):
+        """{endpoint: counts} with bucket labels, for charts."""
+        labels = [f'≤{b:,} ms' for b in LATENCY_BUCKETS_MS] + [f'>{LATENCY_BUCKETS_MS[-1]:,} ms']
+        with self._lock:
+            return labels, {endpoint: list(h.counts) for endpoint, h in sorted(self._histograms.items())}
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+@lru_cache(maxsize=None)
+def get_latency_stats():
+    return LatencyStats()
+
+
+def _record_wire_bytes(response, *args, **kwargs):
+    # Compressed size as sent; falls back to the decoded size when the server doesn't say
+    endpoint = urlparse(response.url).path.rstrip('/').rsplit('/', 1)[-1].lower()
+    nbytes = response.headers.get('Content-Length')
+    get_latency_stats().observe_wire(endpoint, int(nbytes) if nbytes else len(response.content))
+    return response
+
+
+def _raise_for_status(response, *args, **kwargs):
+    # nba_api never checks the status itself; upstream.is_transient decides what to retry
+    response.raise_for_status()
+    return response
+
+
+def request_headers():
+    """
+    nba_api's stats headers with an Accept-Encoding this process can decode.
+    Passed with every request: nba_api sends its own headers per call, which
+    would override anything set on the session.
+    """
+    return {**STATS_HEADERS, 'Accept-Encoding': 'gzip, deflate, br' if _brotli_available() else 'gzip, deflate'}
+
+
+def build_session(pool_maxsize=POOL_MAXSIZE):
+    """requests.Session with a keep-alive pool, compressed transfer, the wire-size and status hooks."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.hooks['response'].append(_record_wire_bytes)
+    session.hooks['response'].append(_raise_for_status)
+    return session
+
+
+_install_lock = threading.Lock()
+_installed = None
+
+
+def install_transport(pool_maxsize=POOL_MAXSIZE):
+    """Makes nba_api use the pooled session (once per process). Returns the session."""
+    global _installed
+    with _install_lock:
+        if _installed is None:
+            _installed = build_session(pool_maxsize)
+            NBAStatsHTTP.set_session(_installed)
+        return _installed
@@ -0,0 +1,181 @@
+"""
+Shared upstream-call layer used by every DataSource.fetch:
+
+    SingleFlight   identical concurrent requests (same source, endpoint and
+                   params) collapse into one call; every waiter gets its result
+                   (or its exception)
+    RateLimiter    one process-wide token bucket for throttled (network) sources,
+                   so sessions, the fetch pool and ingest workers share one budget
+    with_retries   transient failures (is_transient) are retried with full-jitter
+                   exponential backoff; anything else fails on the first attempt
+
+Tuned with environment variables:
+
+    NBA_API_RATE         max requests per second to stats.nba.com (default 2, 0 = unlimited)
+    NBA_API_BURST        requests allowed back to back before the rate applies (default 4)
+    NBA_API_RETRIES      retries after the first attempt (default 3)
+    NBA_API_BACKOFF_MS   base backoff; attempt n waits up to base * 2**n (default 500)
+"""
+import json
+import os
+import random
+import threading
+import time
+from functools import lru_cache
+
+import requests
+
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 4
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_MS = 500.0
+MAX_BACKOFF_MS = 8000.0
+
+# Errors worth another attempt: network trouble, timeouts, HTTP errors (raised by the transport's
+# status hook; is_transient drops the 4xx ones) and the truncated JSON bodies the stats API sends
+# when overloaded. InjectedError is a ConnectionError, so fault injection exercises the same path.
+TRANSIENT_ERRORS = (ConnectionError, TimeoutError, requests.RequestException, json.JSONDecodeError)
+# 4xx statuses that are still worth retrying: request timeout and throttling
+RETRYABLE_CLIENT_STATUSES = {408, 429}
+
+
+def _env_number(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+class RateLimiter:
+    """Token bucket shared by all threads: at most `rate` acquisitions per second (0 = unlimited)."""
+
+    def __init__(self, rate, burst=1):
+        self.lock = threading.Lock()
+        self.configure(rate, burst)
+
+    def configure(self, rate, burst=None):
+        with self.lock:
+            self.rate = rate
+            self.capacity = max(burst if burst is not None else getattr(self, 'capacity', 1), 1)
+            self.tokens = self.capacity
+            self.updated = time.monotonic()
+
+    def acquire(self):
+        """Blocks until a token is available. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self.lock:
+                if self.rate <= 0:
+                    return waited
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+@lru_cache(maxsize=None)
+def get_rate_limiter():
+    """The process-wide limiter for throttled sources, configured from the environment."""
+    return RateLimiter(_env_number('NBA_API_RATE', DEFAULT_RATE), int(_env_number('NBA_API_BURST', DEFAULT_BURST)))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    do(key, fn): the first caller for a key runs fn; callers arriving while it
+    runs block and share its outcome. Nothing is kept once the call finishes,
+    so this deduplicates concurrent work only (caching is the stores' job).
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Returns (result, shared): shared is True for callers that waited on another's call."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+
+@lru_cache(maxsize=None)
+def get_single_flight():
+    """Process-wide request coalescer shared by every source and session."""
+    return SingleFlight()
+
+
+def request_key(source, endpoint, params):
+    """Canonical identity of an upstream request."""
+    return source, endpoint, json.dumps(params, sort_keys=True, default=str)
+
+
+def backoff_delay(attempt, base_ms=None, rng=random):
+    """Full jitter: uniform in [0, min(MAX_BACKOFF_MS, base * 2**attempt)] seconds/1000."""
+    base_ms = _env_number('NBA_API_BACKOFF_MS', DEFAULT_BACKOFF_MS) if base_ms is None else base_ms
+    return rng.uniform(0, min(MAX_BACKOFF_MS, base_ms * 2 ** attempt)) / 1000
+
+
+def is_transient(error, transient=TRANSIENT_ERRORS):
+    """Whether another attempt could succeed: a transient error type, unless it is a plain 4xx response."""
+    if not isinstance(error, transient):
+        return False
+    response = getattr(error, 'response', None)
+    if isinstance(error, requests.HTTPError) and response is not None:
+        return response.status_code >= 500 or response.status_code in RETRYABLE_CLIENT_STATUSES
+    return True
+
+
+def with_retries(fn, retries=None, on_retry=None, transient=TRANSIENT_ERRORS):
+    """
+    Calls fn() until it succeeds, retrying transient errors up to `retries`
+    times with jittered exponential backoff. on_retry(attempt, error, delay)
+    is called before each wait. The last error is re-raised.
+    """
+    retries = int(_env_number('NBA_API_RETRIES', DEFAULT_RETRIES)) if retries is None else retries
+    attempt = 0
+    while True:
+        try:
+            return fn()
+        except transient as e:
+            if attempt >= retries or not is_transient(e, transient):
+                raise
+            delay = backoff_delay(attempt)
+            if on_retry is not None:
+                on_retry(attempt + 1, e, delay)
+            time.sleep(delay)
+            attempt += 1